@@ -0,0 +1,5 @@
+"""Headless benchmarks for the gamelib hot paths.
+
+Run `python -m benchmarks.run --output results.json` and compare two runs
+with `python -m benchmarks.compare baseline.json results.json`.
+"""
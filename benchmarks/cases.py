@@ -0,0 +1,252 @@
+import csv
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Callable
+
+import esper
+import pygame
+
+from gamelib.ecs.collision import ColliderComponent, CollisionProcessor
+from gamelib.ecs.broadphase import BruteForceBroadPhase, SpatialHashBroadPhase
+from gamelib.ecs.custom import CustomProcessComponent
+from gamelib.ecs.geometry import MoveProcessor, PositionComponent, VelocityComponent
+from gamelib.ecs.rendering import RenderSurfaceComponent, RenderSurfaceProcessor
+from gamelib.ecs.utils import get_components_with_subclasses
+from gamelib.sprite.spritesheet_grid import SpriteSheetGrid
+from gamelib.tiles.dense import DenseTileMap
+from gamelib.tiles.tiles import TileMap
+
+WORLD_SIZE = 4096
+
+# Generated CSVs and sprite sheets, removed when the interpreter exits
+_SCRATCH = tempfile.TemporaryDirectory(prefix="gamelib-bench-")
+
+# Owner of every image a case loads through default_asset_cache
+ASSET_OWNER = "benchmarks"
+
+# A case's setup builds the world for `size` entities/tiles and returns the
+# callable that gets timed; the runner clears esper's database and
+# processors and unloads ASSET_OWNER after it.
+T_Setup = Callable[[int], Callable[[], object]]
+
+
+@dataclass
+class BenchmarkCase:
+    name: str
+    setup: T_Setup
+    max_size: int
+
+
+CASES: dict[str, BenchmarkCase] = {}
+
+
+def benchmark(name: str, max_size: int = 100_000):
+    """Register a setup function as a benchmark case.
+
+    Sizes above `max_size` are skipped, for cases whose cost grows too fast
+    to be worth running at the largest sizes (e.g. brute force collision).
+    """
+
+    def register(setup: T_Setup) -> T_Setup:
+        CASES[name] = BenchmarkCase(name, setup, max_size)
+        return setup
+
+    return register
+
+
+def _scatter(index: int) -> tuple[int, int]:
+    # Deterministic spread over the world so runs are comparable
+    return (index * 7919) % WORLD_SIZE, (index * 104729) % WORLD_SIZE
+
+
+def _process_world(*processors: esper.Processor, dt: float = 1 / 60):
+    """Register `processors` with esper and time whole `esper.process` calls.
+
+    esper.process clears dead entities first, which is what games pay every
+    frame; calling a processor's process directly skips that.
+    """
+    for processor in processors:
+        esper.add_processor(processor)
+    return lambda: esper.process(dt)
+
+
+def _create_colliders(size: int) -> None:
+    for i in range(size):
+        esper.create_entity(
+            PositionComponent(*_scatter(i)),
+            VelocityComponent((1, 0)),
+            ColliderComponent(8, 8),
+        )
+
+
+@benchmark("collision_brute_force", max_size=3_000)
+def collision_brute_force(size: int):
+    _create_colliders(size)
+    processor = CollisionProcessor(broad_phase=BruteForceBroadPhase())
+    return lambda: processor.process(0)
+
+
+@benchmark("collision_spatial_hash")
+def collision_spatial_hash(size: int):
+    _create_colliders(size)
+    processor = CollisionProcessor(broad_phase=SpatialHashBroadPhase(32))
+    move = MoveProcessor()
+
+    def frame():
+        # Move first so the grid has work to do, as in a real frame
+        move.process(0)
+        processor.process(0)
+
+    return frame
+
+
+@benchmark("collision_spatial_hash_process")
+def collision_spatial_hash_process(size: int):
+    _create_colliders(size)
+    return _process_world(
+        CollisionProcessor(broad_phase=SpatialHashBroadPhase(32)),
+        MoveProcessor(),
+    )
+
+
+@benchmark("move_processor")
+def move_processor(size: int):
+    for i in range(size):
+        esper.create_entity(PositionComponent(*_scatter(i)), VelocityComponent((1, 2)))
+    processor = MoveProcessor(use_dt=True)
+    return lambda: processor.process(1 / 60)
+
+
+@benchmark("move_processor_process")
+def move_processor_process(size: int):
+    for i in range(size):
+        esper.create_entity(PositionComponent(*_scatter(i)), VelocityComponent((1, 2)))
+    return _process_world(MoveProcessor(use_dt=True))
+
+
+@benchmark("render_surface_blit")
+def render_surface_blit(size: int):
+    screen = pygame.Surface((1280, 720))
+    sprite = pygame.Surface((16, 16))
+    sprite.fill((255, 0, 0))
+    for i in range(size):
+        x, y = _scatter(i)
+        esper.create_entity(
+            PositionComponent(x % 1280, y % 720), RenderSurfaceComponent(sprite)
+        )
+    processor = RenderSurfaceProcessor(screen)
+    return lambda: processor.process(0)
+
+
+@benchmark("render_surface_blit_process")
+def render_surface_blit_process(size: int):
+    screen = pygame.Surface((1280, 720))
+    sprite = pygame.Surface((16, 16))
+    sprite.fill((255, 0, 0))
+    for i in range(size):
+        x, y = _scatter(i)
+        esper.create_entity(
+            PositionComponent(x % 1280, y % 720), RenderSurfaceComponent(sprite)
+        )
+    return _process_world(RenderSurfaceProcessor(screen))
+
+
+class _Spinner(CustomProcessComponent):
+    def process(self) -> None:
+        pass
+
+
+class _SpinnerProcessor(esper.Processor):
+    """Replaces one spinner per frame, like a short-lived projectile."""
+
+    def __init__(self, entities: list[int]):
+        super().__init__()
+        self.entities = entities
+        self.found = 0
+
+    def process(self, dt: float) -> None:
+        esper.delete_entity(self.entities.pop(0))
+        self.entities.append(esper.create_entity(PositionComponent(0, 0), _Spinner()))
+        self.found = sum(
+            1 for _ in get_components_with_subclasses(CustomProcessComponent)
+        )
+
+
+@benchmark("components_with_subclasses")
+def components_with_subclasses(size: int):
+    for i in range(size):
+        esper.create_entity(PositionComponent(*_scatter(i)), _Spinner())
+    return lambda: sum(
+        1 for _ in get_components_with_subclasses(CustomProcessComponent)
+    )
+
+
+@benchmark("components_with_subclasses_process")
+def components_with_subclasses_process(size: int):
+    """Query through esper.process while one entity is replaced per frame."""
+    entities = [
+        esper.create_entity(PositionComponent(*_scatter(i)), _Spinner())
+        for i in range(size)
+    ]
+    return _process_world(_SpinnerProcessor(entities))
+
+
+def _write_csv(size: int) -> str:
+    width = max(1, int(size**0.5))
+    height = -(-size // width)
+    path = os.path.join(_SCRATCH.name, f"map_{size}.csv")
+    with open(path, "w", newline="") as fh:
+        writer = csv.writer(fh)
+        for y in range(height):
+            writer.writerow([(x * y) % 4 for x in range(width)])
+    return path
+
+
+@benchmark("tilemap_from_csv")
+def tilemap_from_csv(size: int):
+    path = _write_csv(size)
+    return lambda: TileMap.from_csv(path, ignore_values={0})
+
+
+@benchmark("dense_tilemap_from_csv")
+def dense_tilemap_from_csv(size: int):
+    path = _write_csv(size)
+    return lambda: DenseTileMap.from_csv(path, ignore_values={0})
+
+
+@benchmark("tilemap_generate_surface", max_size=10_000)
+def tilemap_generate_surface(size: int):
+    tile = pygame.Surface((16, 16), pygame.SRCALPHA)
+    tilemap = TileMap.from_csv(_write_csv(size), mapper={1: tile, 2: tile, 3: tile})
+    return tilemap.generate_surface
+
+
+def _write_sheet(size: int) -> str:
+    cols = max(1, int(size**0.5))
+    rows = -(-size // cols)
+    sheet = pygame.Surface((cols * 8, rows * 8), pygame.SRCALPHA)
+    sheet.fill((0, 128, 255, 200))
+    path = os.path.join(_SCRATCH.name, f"sheet_{size}.png")
+    pygame.image.save(sheet, path)
+    return path
+
+
+@benchmark("spritesheet_slice")
+def spritesheet_slice(size: int):
+    path = _write_sheet(size)
+    return lambda: SpriteSheetGrid(path, 8, 8, owner=ASSET_OWNER)
+
+
+@benchmark("spritesheet_lazy_get")
+def spritesheet_lazy_get(size: int):
+    """Load a sheet lazily and use 16 of its cells."""
+    path = _write_sheet(size)
+    cells = range(0, size, max(1, size // 16))
+
+    def run():
+        sheet = SpriteSheetGrid(path, 8, 8, lazy=True, owner=ASSET_OWNER)
+        for index in cells:
+            sheet.get_by_index(index)
+
+    return run
@@ -0,0 +1,53 @@
+"""Compare two benchmark result files and flag regressions.
+
+Usage:
+    python -m benchmarks.compare baseline.json results.json --threshold 0.15
+
+Exits with status 1 when any case/size got slower than the threshold.
+"""
+
+import argparse
+import json
+import sys
+
+
+def load(path: str) -> dict[tuple[str, int], dict]:
+    with open(path) as fh:
+        report = json.load(fh)
+    return {(r["case"], r["size"]): r for r in report["results"]}
+
+
+def compare(baseline: dict, current: dict, threshold: float, metric: str):
+    """Yield (case, size, old, new, ratio, regressed) for shared entries."""
+    for key in sorted(baseline.keys() & current.keys()):
+        old = baseline[key][metric]
+        new = current[key][metric]
+        ratio = new / old if old else float("inf")
+        yield key[0], key[1], old, new, ratio, ratio > 1 + threshold
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument(
+        "--threshold", type=float, default=0.15, help="allowed slowdown (0.15 = 15%%)"
+    )
+    parser.add_argument("--metric", default="median_s", choices=["min_s", "median_s"])
+    args = parser.parse_args(argv)
+
+    regressions = 0
+    for case, size, old, new, ratio, regressed in compare(
+        load(args.baseline), load(args.current), args.threshold, args.metric
+    ):
+        regressions += regressed
+        flag = "REGRESSION" if regressed else ""
+        print(
+            f"{case:<30}{size:>8}{old * 1000:12.3f}{new * 1000:12.3f} ms"
+            f"{ratio:8.2f}x  {flag}"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
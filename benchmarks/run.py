@@ -0,0 +1,103 @@
+"""Run the benchmark cases headlessly and write the results as JSON.
+
+Usage:
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --cases move_processor --sizes 1000 100000
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+# Must be set before pygame initializes its video/audio subsystems
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import esper  # noqa: E402
+import pygame  # noqa: E402
+
+from benchmarks.cases import ASSET_OWNER, CASES  # noqa: E402
+from gamelib.mgmt.assets import default_asset_cache  # noqa: E402
+
+DEFAULT_SIZES = [100, 1_000, 10_000, 100_000]
+
+
+def time_case(name: str, size: int, repeats: int, budget_s: float) -> dict:
+    """Time one case at one size; stops early once `budget_s` is spent."""
+    esper.clear_database()
+    esper._processors.clear()
+    run = CASES[name].setup(size)
+    run()  # warm-up: fills esper caches, builds grids, etc.
+
+    samples = []
+    started = time.perf_counter()
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - start)
+        if time.perf_counter() - started > budget_s:
+            break
+    esper.clear_database()
+    esper._processors.clear()
+    default_asset_cache.unload(ASSET_OWNER)
+    return {
+        "case": name,
+        "size": size,
+        "repeats": len(samples),
+        "min_s": min(samples),
+        "median_s": statistics.median(samples),
+        "mean_s": statistics.fmean(samples),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", nargs="*", choices=sorted(CASES))
+    parser.add_argument("--sizes", nargs="*", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument(
+        "--budget", type=float, default=5.0, help="max seconds per case and size"
+    )
+    parser.add_argument("--output", help="JSON file to write (default: stdout)")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    results = []
+    for name in args.cases or sorted(CASES):
+        for size in args.sizes:
+            if size > CASES[name].max_size:
+                continue
+            result = time_case(name, size, args.repeats, args.budget)
+            results.append(result)
+            print(
+                f"{name:<36}{size:>8}  median {result['median_s'] * 1000:10.3f} ms",
+                file=sys.stderr,
+            )
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
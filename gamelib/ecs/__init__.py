@@ -1,4 +1,20 @@
-from .collision import ColliderComponent, CollisionEvent, CollisionProcessor
+from .broadphase import (
+    BroadPhase,
+    BruteForceBroadPhase,
+    SpatialHashBroadPhase,
+    SweepAndPruneBroadPhase,
+)
+from .collision import (
+    ColliderComponent,
+    CollisionEvent,
+    CollisionProcessor,
+    SpatialHashProcessor,
+)
+from .layers import CollisionMatrix
+from .masks import MaskCache
+from .profiler import ProcessorProfiler, ProcessorStats
+from .spatial_query import RaycastHit, SpatialQuery
+from .camera import CameraComponent, CameraProcessor
 from .custom import CustomProcessComponent, CustomUpdateProcessor
 from .geometry import (
     PositionComponent,
@@ -9,13 +25,26 @@ from .geometry import (
 )
 from .player import PlayerControllerComponent, PlayerMoveProcessor
 from .rendering import RenderSurfaceComponent, RenderSurfaceProcessor
-from .timer import TimerComponent, TimerProcessor
+from .timer import TimerComponent, TimerHandle, TimerProcessor, TimerScheduler
 from .modifiers.modifier import ModifierProcessor
 
 __all__ = [
+    "BroadPhase",
+    "BruteForceBroadPhase",
+    "SpatialHashBroadPhase",
+    "SweepAndPruneBroadPhase",
     "ColliderComponent",
     "CollisionEvent",
     "CollisionProcessor",
+    "SpatialHashProcessor",
+    "CollisionMatrix",
+    "MaskCache",
+    "ProcessorProfiler",
+    "ProcessorStats",
+    "RaycastHit",
+    "SpatialQuery",
+    "CameraComponent",
+    "CameraProcessor",
     "CustomProcessComponent",
     "CustomUpdateProcessor",
     "PositionComponent",
@@ -28,6 +57,8 @@ __all__ = [
     "RenderSurfaceComponent",
     "RenderSurfaceProcessor",
     "TimerComponent",
+    "TimerHandle",
+    "TimerScheduler",
     "TimerProcessor",
     "ModifierProcessor",
 ]
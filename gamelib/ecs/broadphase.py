@@ -0,0 +1,559 @@
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Any, Iterator, List, Optional, Tuple
+
+import pygame
+
+from gamelib.ecs import layers
+from gamelib.ecs.layers import CollisionMatrix
+
+if TYPE_CHECKING:
+    from gamelib.ecs.collision import ColliderComponent
+
+T_ColliderList = List[Tuple[int, "ColliderComponent"]]
+T_CandidatePair = Tuple[int, "ColliderComponent", int, "ColliderComponent"]
+T_ColliderEntry = Tuple[int, "ColliderComponent"]
+T_CellRange = Tuple[int, int, int, int]
+# (layer_bits, ignore_bits) of a collider; colliders sharing a signature
+# share a bucket.
+T_Signature = Tuple[int, int]
+
+
+def signature_of(collider: "ColliderComponent") -> T_Signature:
+    """Get the bucket signature of a collider."""
+    return collider.layer_bits, collider.ignore_bits
+
+
+def signatures_interact(
+    signature_a: T_Signature,
+    signature_b: T_Signature,
+    layer_matrix: Optional[CollisionMatrix] = None,
+) -> bool:
+    """Check whether colliders with these signatures may collide at all."""
+    layers_a, ignore_a = signature_a
+    layers_b, ignore_b = signature_b
+    if layer_matrix is not None:
+        ignore_a |= layer_matrix.ignored_bits(layers_a)
+        ignore_b |= layer_matrix.ignored_bits(layers_b)
+    return not (ignore_a & layers_b or ignore_b & layers_a)
+
+
+class SpatialGrid:
+    """Uniform grid mapping cells to the items whose rects touch them.
+
+    Attributes:
+        cell_size: Width and height of a grid cell in pixels
+        cells: Mapping of (cell_x, cell_y) to {key: item}
+        ranges: Inclusive (left, top, right, bottom) cell range of every key
+    """
+
+    def __init__(self, cell_size: int = 64) -> None:
+        self.cell_size = cell_size
+        self.cells: dict[Tuple[int, int], dict[int, Any]] = {}
+        self.ranges: dict[int, T_CellRange] = {}
+
+    def __len__(self) -> int:
+        return len(self.ranges)
+
+    def cell_range(self, rect: pygame.Rect) -> T_CellRange:
+        """Get the inclusive (left, top, right, bottom) cell range of a rect."""
+        size = self.cell_size
+        return (
+            rect.left // size,
+            rect.top // size,
+            rect.right // size,
+            rect.bottom // size,
+        )
+
+    def insert(self, key: int, item: Any, rect: pygame.Rect) -> None:
+        cell_range = self.cell_range(rect)
+        self.ranges[key] = cell_range
+        self._insert(key, item, cell_range)
+
+    def remove(self, key: int) -> None:
+        self._discard(key, self.ranges.pop(key))
+
+    def query(self, rect: pygame.Rect) -> Iterator[Tuple[int, Any]]:
+        """Yield each (key, item) sharing a cell with `rect`, once."""
+        cells, ranges = self.cells, self.ranges
+        left, top, right, bottom = self.cell_range(rect)
+        for x in range(left, right + 1):
+            for y in range(top, bottom + 1):
+                cell = cells.get((x, y))
+                if cell is None:
+                    continue
+                for key, item in cell.items():
+                    key_range = ranges[key]
+                    # Report each key from the first cell it shares only
+                    if max(left, key_range[0]) == x and max(top, key_range[1]) == y:
+                        yield key, item
+
+    def move(self, key: int, item: Any, rect: pygame.Rect) -> bool:
+        """Re-bucket `key` if `rect` now covers a different cell range."""
+        new_range = self.cell_range(rect)
+        old_range = self.ranges[key]
+        if new_range == old_range:
+            return False
+        self._discard(key, old_range)
+        self._insert(key, item, new_range)
+        self.ranges[key] = new_range
+        return True
+
+    def _insert(self, key: int, item: Any, cell_range: T_CellRange) -> None:
+        cells = self.cells
+        left, top, right, bottom = cell_range
+        for x in range(left, right + 1):
+            for y in range(top, bottom + 1):
+                cell = cells.get((x, y))
+                if cell is None:
+                    cell = cells[(x, y)] = {}
+                cell[key] = item
+
+    def _discard(self, key: int, cell_range: T_CellRange) -> None:
+        cells = self.cells
+        left, top, right, bottom = cell_range
+        for x in range(left, right + 1):
+            for y in range(top, bottom + 1):
+                cell = cells[(x, y)]
+                del cell[key]
+                if not cell:
+                    del cells[(x, y)]
+
+
+class BroadPhase:
+    """Base class for collision broad phases.
+
+    A broad phase keeps its own index of colliders between frames. Each frame
+    the processor hands it the current (entity, collider) list via `update`
+    and then asks it for candidate pairs via `pairs`.
+
+    Colliders are bucketed by their layer signature (compiled tag and ignore
+    bits). Buckets that can never interact, because of `ignore_tags` or the
+    processor's CollisionMatrix, are never paired, so every yielded pair has
+    already passed filtering. Pairs still go through the narrow phase in the
+    processor unless the broad phase sets `exact`, meaning its pairs are
+    already known to overlap.
+
+    Attributes:
+        colliders: Mapping of entity to collider for everything indexed
+        buckets: Mapping of layer signature to {entity: collider}
+    """
+
+    exact = False
+
+    def __init__(self) -> None:
+        self.colliders: dict[int, "ColliderComponent"] = {}
+        self.buckets: dict[T_Signature, dict[int, "ColliderComponent"]] = {}
+        self.layer_matrix: Optional[CollisionMatrix] = None
+        self._signatures: dict[int, T_Signature] = {}
+        self._source: Optional[T_ColliderList] = None
+        self._generation = layers.generation
+        self._matrix_state: Optional[Tuple[CollisionMatrix, int]] = None
+        self._bucket_pairs: Optional[List[Tuple[T_Signature, T_Signature]]] = None
+
+    def update(
+        self,
+        colliders: T_ColliderList,
+        layer_matrix: Optional[CollisionMatrix] = None,
+    ) -> None:
+        """Sync the index with the current colliders.
+
+        Membership is only diffed when `colliders` is a different list
+        object than last time, so callers must pass a new list whenever
+        colliders are added or removed (CollisionProcessor rebuilds its list
+        only then).
+        """
+        if colliders is not self._source:
+            self._source = colliders
+            current = dict(colliders)
+            for entity in [
+                entity
+                for entity, collider in self.colliders.items()
+                if current.get(entity) is not collider
+            ]:
+                self._discard_collider(entity)
+            for entity, collider in current.items():
+                if entity not in self.colliders:
+                    self._insert_collider(entity, collider)
+
+        if self._generation != layers.generation:
+            # Some collider had its tags reassigned; move it to its new bucket
+            self._generation = layers.generation
+            for entity, collider in list(self.colliders.items()):
+                if signature_of(collider) != self._signatures[entity]:
+                    self._discard_collider(entity)
+                    self._insert_collider(entity, collider)
+
+        matrix_state = layer_matrix and (layer_matrix, layer_matrix.version)
+        if matrix_state != self._matrix_state:
+            self._matrix_state = matrix_state
+            self._bucket_pairs = None
+        self.layer_matrix = layer_matrix
+        self._refresh()
+
+    def bucket_pairs(self) -> List[Tuple[T_Signature, T_Signature]]:
+        """Get every pair of buckets that may interact, including a bucket
+        with itself. Cached until buckets or the layer matrix change."""
+        if self._bucket_pairs is None:
+            signatures = sorted(self.buckets)
+            self._bucket_pairs = [
+                (signature_a, signature_b)
+                for i, signature_a in enumerate(signatures)
+                for signature_b in signatures[i:]
+                if signatures_interact(signature_a, signature_b, self.layer_matrix)
+            ]
+        return self._bucket_pairs
+
+    def pairs(self) -> Iterator[T_CandidatePair]:
+        """Yield candidate pairs as (entity_a, collider_a, entity_b, collider_b)."""
+        raise NotImplementedError
+
+    def query_rect(
+        self, rect: pygame.Rect, layer_mask: Optional[int] = None
+    ) -> Iterator[T_ColliderEntry]:
+        """Yield every indexed (entity, collider) whose rect overlaps `rect`.
+
+        With `layer_mask`, only colliders with at least one of those layer
+        bits are considered; whole buckets are skipped otherwise. Rects are
+        as of the last `update`.
+        """
+        for signature, bucket in self.buckets.items():
+            if layer_mask is not None and not signature[0] & layer_mask:
+                continue
+            for entity, collider in bucket.items():
+                if collider.rect.colliderect(rect):
+                    yield entity, collider
+
+    def _insert_collider(self, entity: int, collider: "ColliderComponent") -> None:
+        signature = signature_of(collider)
+        self.colliders[entity] = collider
+        self._signatures[entity] = signature
+        bucket = self.buckets.get(signature)
+        if bucket is None:
+            bucket = self.buckets[signature] = {}
+            self._bucket_pairs = None
+        bucket[entity] = collider
+        self._add(entity, collider, signature)
+
+    def _discard_collider(self, entity: int) -> None:
+        del self.colliders[entity]
+        signature = self._signatures.pop(entity)
+        bucket = self.buckets[signature]
+        del bucket[entity]
+        if not bucket:
+            del self.buckets[signature]
+            self._bucket_pairs = None
+        self._remove(entity, signature)
+
+    def _add(
+        self, entity: int, collider: "ColliderComponent", signature: T_Signature
+    ) -> None:
+        """Hook called when a collider enters the index."""
+
+    def _remove(self, entity: int, signature: T_Signature) -> None:
+        """Hook called when a collider leaves the index. If it was the last
+        collider of its bucket, the bucket is already gone."""
+
+    def _refresh(self) -> None:
+        """Hook called every frame after membership has been synced."""
+
+
+class BruteForceBroadPhase(BroadPhase):
+    """Yields every pair of colliders. O(n²), but has no upkeep at all."""
+
+    def pairs(self) -> Iterator[T_CandidatePair]:
+        buckets = self.buckets
+        for signature_a, signature_b in self.bucket_pairs():
+            members_a = list(buckets[signature_a].items())
+            if signature_a == signature_b:
+                for i in range(len(members_a)):
+                    entity_a, collider_a = members_a[i]
+                    for j in range(i + 1, len(members_a)):
+                        entity_b, collider_b = members_a[j]
+                        yield entity_a, collider_a, entity_b, collider_b
+                continue
+            members_b = list(buckets[signature_b].items())
+            for entity_a, collider_a in members_a:
+                for entity_b, collider_b in members_b:
+                    yield entity_a, collider_a, entity_b, collider_b
+
+
+class SpatialHashBroadPhase(BroadPhase):
+    """Uniform grid broad phase that persists between frames.
+
+    Each bucket has its own SpatialGrid and each collider is stored in every
+    cell its rect touches. The grids are kept across frames and a collider is
+    only re-bucketed when its rect moves into a different cell range, so
+    static colliders cost a range check per frame and nothing else.
+
+    Attributes:
+        cell_size: Width and height of a grid cell in pixels
+        grids: Mapping of layer signature to that bucket's SpatialGrid
+    """
+
+    def __init__(self, cell_size: int = 64) -> None:
+        super().__init__()
+        self.cell_size = cell_size
+        self.grids: dict[T_Signature, SpatialGrid] = {}
+
+    def _add(
+        self, entity: int, collider: "ColliderComponent", signature: T_Signature
+    ) -> None:
+        grid = self.grids.get(signature)
+        if grid is None:
+            grid = self.grids[signature] = SpatialGrid(self.cell_size)
+        grid.insert(entity, collider, collider.rect)
+
+    def _remove(self, entity: int, signature: T_Signature) -> None:
+        grid = self.grids[signature]
+        grid.remove(entity)
+        if not grid:
+            del self.grids[signature]
+
+    def _refresh(self) -> None:
+        for signature, bucket in self.buckets.items():
+            move = self.grids[signature].move
+            for entity, collider in bucket.items():
+                move(entity, collider, collider.rect)
+
+    def pairs(self) -> Iterator[T_CandidatePair]:
+        grids = self.grids
+        for signature_a, signature_b in self.bucket_pairs():
+            if signature_a == signature_b:
+                yield from self._pairs_within(grids[signature_a])
+            else:
+                yield from self._pairs_between(grids[signature_a], grids[signature_b])
+
+    def query_rect(
+        self, rect: pygame.Rect, layer_mask: Optional[int] = None
+    ) -> Iterator[T_ColliderEntry]:
+        for signature, grid in self.grids.items():
+            if layer_mask is not None and not signature[0] & layer_mask:
+                continue
+            for entity, collider in grid.query(rect):
+                if collider.rect.colliderect(rect):
+                    yield entity, collider
+
+    @staticmethod
+    def _pairs_within(grid: SpatialGrid) -> Iterator[T_CandidatePair]:
+        ranges = grid.ranges
+        for (cx, cy), cell in grid.cells.items():
+            if len(cell) < 2:
+                continue
+            members = list(cell.items())
+            for i in range(len(members)):
+                entity_a, collider_a = members[i]
+                range_a = ranges[entity_a]
+                for j in range(i + 1, len(members)):
+                    entity_b, collider_b = members[j]
+                    range_b = ranges[entity_b]
+                    # A pair sharing several cells is only reported from the
+                    # top-left cell of the overlap, so no pair set is needed.
+                    if (
+                        max(range_a[0], range_b[0]) != cx
+                        or max(range_a[1], range_b[1]) != cy
+                    ):
+                        continue
+                    yield entity_a, collider_a, entity_b, collider_b
+
+    @staticmethod
+    def _pairs_between(
+        grid_a: SpatialGrid, grid_b: SpatialGrid
+    ) -> Iterator[T_CandidatePair]:
+        if len(grid_b.cells) < len(grid_a.cells):
+            grid_a, grid_b = grid_b, grid_a
+        ranges_a, ranges_b = grid_a.ranges, grid_b.ranges
+        cells_b = grid_b.cells
+        for (cx, cy), cell_a in grid_a.cells.items():
+            cell_b = cells_b.get((cx, cy))
+            if cell_b is None:
+                continue
+            for entity_a, collider_a in cell_a.items():
+                range_a = ranges_a[entity_a]
+                for entity_b, collider_b in cell_b.items():
+                    range_b = ranges_b[entity_b]
+                    if (
+                        max(range_a[0], range_b[0]) != cx
+                        or max(range_a[1], range_b[1]) != cy
+                    ):
+                        continue
+                    yield entity_a, collider_a, entity_b, collider_b
+
+
+class SweepAndPruneBroadPhase(BroadPhase):
+    """Sort-and-sweep broad phase along the x axis.
+
+    Each bucket keeps a list sorted by `rect.left` that persists between
+    frames. Since positions barely change from one frame to the next, the
+    lists are re-sorted with insertion sort, which is close to O(n) on nearly
+    sorted input. Interacting buckets are then swept against themselves and
+    each other, only pairing colliders whose x and y intervals both overlap.
+
+    Attributes:
+        orders: Mapping of layer signature to that bucket's sorted list
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.orders: dict[T_Signature, T_ColliderList] = {}
+        self._removed: dict[T_Signature, set[int]] = {}
+
+    def _add(
+        self, entity: int, collider: "ColliderComponent", signature: T_Signature
+    ) -> None:
+        # Appended at the end; the next insertion sort moves it into place.
+        self.orders.setdefault(signature, []).append((entity, collider))
+
+    def _remove(self, entity: int, signature: T_Signature) -> None:
+        if signature not in self.buckets:
+            self.orders.pop(signature, None)
+            self._removed.pop(signature, None)
+            return
+        self._removed.setdefault(signature, set()).add(entity)
+
+    def _refresh(self) -> None:
+        if self._removed:
+            for signature, removed in self._removed.items():
+                # The bucket says which entry, if any, is still current: a
+                # retagged collider left it, a re-added one has one new entry
+                bucket = self.buckets[signature]
+                kept = []
+                for entry in self.orders[signature]:
+                    entity = entry[0]
+                    if entity in removed:
+                        if bucket.get(entity) is not entry[1]:
+                            continue
+                        removed.discard(entity)
+                    kept.append(entry)
+                self.orders[signature] = kept
+            self._removed.clear()
+        for order in self.orders.values():
+            self._insertion_sort(order)
+
+    @staticmethod
+    def _insertion_sort(order: T_ColliderList) -> None:
+        lefts = [collider.rect.left for _, collider in order]
+        for i in range(1, len(order)):
+            left = lefts[i]
+            if lefts[i - 1] <= left:
+                continue
+            entry = order[i]
+            j = i - 1
+            while j >= 0 and lefts[j] > left:
+                order[j + 1] = order[j]
+                lefts[j + 1] = lefts[j]
+                j -= 1
+            order[j + 1] = entry
+            lefts[j + 1] = left
+
+    def query_rect(
+        self, rect: pygame.Rect, layer_mask: Optional[int] = None
+    ) -> Iterator[T_ColliderEntry]:
+        for signature, order in self.orders.items():
+            if layer_mask is not None and not signature[0] & layer_mask:
+                continue
+            # Nothing at or past the first left edge beyond rect can overlap
+            end = bisect_left(order, rect.right, key=lambda entry: entry[1].rect.left)
+            for i in range(end):
+                entity, collider = order[i]
+                if self.colliders.get(entity) is collider and collider.rect.colliderect(
+                    rect
+                ):
+                    yield entity, collider
+
+    def pairs(self) -> Iterator[T_CandidatePair]:
+        orders = self.orders
+        for signature_a, signature_b in self.bucket_pairs():
+            if signature_a == signature_b:
+                yield from self._sweep_within(orders[signature_a])
+            else:
+                yield from self._sweep_between(orders[signature_a], orders[signature_b])
+
+    @staticmethod
+    def _sweep_within(order: T_ColliderList) -> Iterator[T_CandidatePair]:
+        count = len(order)
+        for i in range(count):
+            entity_a, collider_a = order[i]
+            rect_a = collider_a.rect
+            right, top, bottom = rect_a.right, rect_a.top, rect_a.bottom
+            for j in range(i + 1, count):
+                entity_b, collider_b = order[j]
+                rect_b = collider_b.rect
+                if rect_b.left >= right:
+                    break
+                if rect_b.top < bottom and rect_b.bottom > top:
+                    yield entity_a, collider_a, entity_b, collider_b
+
+    @staticmethod
+    def _sweep_between(
+        order_a: T_ColliderList, order_b: T_ColliderList
+    ) -> Iterator[T_CandidatePair]:
+        # Merge-walk both lists; whichever entry starts first is swept against
+        # the not yet visited part of the other list.
+        count_a, count_b = len(order_a), len(order_b)
+        i = j = 0
+        while i < count_a and j < count_b:
+            if order_a[i][1].rect.left <= order_b[j][1].rect.left:
+                first, others, start, i = order_a[i], order_b, j, i + 1
+            else:
+                first, others, start, j = order_b[j], order_a, i, j + 1
+            entity_a, collider_a = first
+            rect_a = collider_a.rect
+            right, top, bottom = rect_a.right, rect_a.top, rect_a.bottom
+            for k in range(start, len(others)):
+                entity_b, collider_b = others[k]
+                rect_b = collider_b.rect
+                if rect_b.left >= right:
+                    break
+                if rect_b.top < bottom and rect_b.bottom > top:
+                    yield entity_a, collider_a, entity_b, collider_b
+
+
+class StaticIndex(SpatialHashBroadPhase):
+    """Prebuilt spatial hash for colliders that never move.
+
+    Statics are bucketed once, when they enter the index, and never
+    re-checked afterwards. They are only ever paired with dynamic colliders
+    via `query_pairs`; static-static pairs are never produced.
+    """
+
+    def _refresh(self) -> None:
+        pass
+
+    def pairs(self) -> Iterator[T_CandidatePair]:
+        return iter(())
+
+    def query_pairs(self, dynamic: BroadPhase) -> Iterator[T_CandidatePair]:
+        """Yield (dynamic entity, collider, static entity, collider) pairs for
+        every dynamic collider of `dynamic` whose cells hold statics it may
+        interact with."""
+        if not self.grids:
+            return
+        cell_size = self.cell_size
+        for signature, bucket in dynamic.buckets.items():
+            grids = [
+                grid
+                for static_signature, grid in self.grids.items()
+                if signatures_interact(signature, static_signature, self.layer_matrix)
+            ]
+            if not grids:
+                continue
+            for entity_a, collider_a in bucket.items():
+                rect = collider_a.rect
+                left, top = rect.left // cell_size, rect.top // cell_size
+                right, bottom = rect.right // cell_size, rect.bottom // cell_size
+                for grid in grids:
+                    cells, ranges = grid.cells, grid.ranges
+                    for x in range(left, right + 1):
+                        for y in range(top, bottom + 1):
+                            cell = cells.get((x, y))
+                            if cell is None:
+                                continue
+                            for entity_b, collider_b in cell.items():
+                                range_b = ranges[entity_b]
+                                # Report each pair from one shared cell only
+                                if (
+                                    max(left, range_b[0]) != x
+                                    or max(top, range_b[1]) != y
+                                ):
+                                    continue
+                                yield entity_a, collider_a, entity_b, collider_b
@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+from math import ceil, exp, floor
+from typing import Optional, Tuple
+
+from esper import Processor
+import esper
+import pygame
+
+from gamelib.ecs.geometry import PositionComponent
+
+
+@dataclass
+class CameraComponent:
+    """Viewport onto the world.
+
+    `x`, `y` is the world coordinate shown at the top-left corner of the
+    screen, and one world pixel covers `zoom` screen pixels.
+
+    Attributes:
+        width: Viewport width in screen pixels
+        height: Viewport height in screen pixels
+        x: World x at the left edge of the viewport
+        y: World y at the top edge of the viewport
+        zoom: Screen pixels per world pixel
+        bounds: World area the viewport is kept inside, if any
+        target: Entity whose PositionComponent the camera follows, if any
+        follow_speed: How quickly the camera catches up with its target, per
+            second; 0 snaps to the target every frame
+    """
+
+    width: int
+    height: int
+    x: float = 0
+    y: float = 0
+    zoom: float = 1
+    bounds: Optional[pygame.Rect] = None
+    target: Optional[int] = None
+    follow_speed: float = 0
+
+    @property
+    def view_rect(self) -> pygame.Rect:
+        """World rect currently visible, rounded outwards to whole pixels."""
+        left, top = floor(self.x), floor(self.y)
+        return pygame.Rect(
+            left,
+            top,
+            ceil(self.x + self.width / self.zoom) - left,
+            ceil(self.y + self.height / self.zoom) - top,
+        )
+
+    def world_to_screen(self, x: float, y: float) -> Tuple[float, float]:
+        return (x - self.x) * self.zoom, (y - self.y) * self.zoom
+
+    def screen_to_world(self, x: float, y: float) -> Tuple[float, float]:
+        return x / self.zoom + self.x, y / self.zoom + self.y
+
+    def center_on(self, x: float, y: float) -> None:
+        self.x = x - self.width / self.zoom / 2
+        self.y = y - self.height / self.zoom / 2
+        self.clamp()
+
+    def clamp(self) -> None:
+        """Keep the viewport inside `bounds`, centering it if it's larger."""
+        if self.bounds is None:
+            return
+        view_w, view_h = self.width / self.zoom, self.height / self.zoom
+        bounds = self.bounds
+        if view_w >= bounds.width:
+            self.x = bounds.centerx - view_w / 2
+        else:
+            self.x = min(max(self.x, bounds.left), bounds.right - view_w)
+        if view_h >= bounds.height:
+            self.y = bounds.centery - view_h / 2
+        else:
+            self.y = min(max(self.y, bounds.top), bounds.bottom - view_h)
+
+
+class CameraProcessor(Processor):
+    """Moves every CameraComponent towards its target and into its bounds."""
+
+    def process(self, dt):
+        for entity, camera in esper.get_component(CameraComponent):
+            if camera.target is None or not esper.entity_exists(camera.target):
+                camera.clamp()
+                continue
+            target = esper.try_component(camera.target, PositionComponent)
+            if target is None:
+                camera.clamp()
+                continue
+
+            view_w = camera.width / camera.zoom
+            view_h = camera.height / camera.zoom
+            goal_x, goal_y = target.x - view_w / 2, target.y - view_h / 2
+            if camera.follow_speed > 0:
+                # Frame-rate independent exponential smoothing
+                blend = 1 - exp(-camera.follow_speed * dt)
+                goal_x = camera.x + (goal_x - camera.x) * blend
+                goal_y = camera.y + (goal_y - camera.y) * blend
+            camera.x, camera.y = goal_x, goal_y
+            camera.clamp()
@@ -0,0 +1,164 @@
+"""Change counters for the esper world.
+
+esper throws its query cache away on every `esper.process()` (in
+`clear_dead_entities`), so the identity of a `get_component` list can't tell
+whether components were added or removed. On import, this module wraps
+esper's mutating functions to record when each component type last gained,
+lost or replaced a component. Processors compare `generation(...)` against
+the value they last saw and only rescan when it moved, or keep a
+ChangeTracker to learn exactly which entities changed.
+
+`clear_dead_entities` also stops clearing esper's cache when there is
+nothing to delete, so unchanged queries keep their lists between frames.
+
+Components must be added and removed through the `esper` module functions
+(`esper.add_component(...)`, not `from esper import add_component`).
+"""
+
+from functools import wraps
+from itertools import count
+from typing import Iterable, Optional, Type
+from weakref import WeakSet
+
+import esper
+
+_counter = count(1)
+# Counter value of the latest change to each component type
+_changed: dict[Type, int] = {}
+# Counter value of the latest change of any kind
+_latest = 0
+# Counter value of the latest change to every type (new database or world)
+_reset = 0
+_trackers: "WeakSet[ChangeTracker]" = WeakSet()
+
+
+def generation(*component_types: Type) -> int:
+    """Get a number that changes whenever any of `component_types` is added
+    to, removed from or replaced on an entity.
+
+    Without arguments, changes whenever any component does.
+    """
+    if not component_types:
+        return _latest
+    return max(_reset, *[_changed.get(t, 0) for t in component_types])
+
+
+class ChangeTracker:
+    """Collects the entities whose components of some types changed.
+
+    A tracker starts out (and returns to, after `esper.clear_database` or
+    `esper.switch_world`) asking for a full rescan. Trackers are held
+    weakly, so one dies with the processor that owns it.
+
+    Usage:
+        tracker = ChangeTracker(PositionComponent)
+        # every frame
+        changed = tracker.take()
+        if changed is None:
+            ...  # rescan everything
+        else:
+            ...  # look at just these entities
+    """
+
+    def __init__(self, *component_types: Type):
+        self.component_types = frozenset(component_types)
+        self._entities: set[int] = set()
+        self._everything = True
+        _trackers.add(self)
+
+    def take(self) -> Optional[set[int]]:
+        """Get the entities changed since the last call, or None if every
+        entity has to be rescanned."""
+        if self._everything:
+            self._everything = False
+            self._entities = set()
+            return None
+        entities, self._entities = self._entities, set()
+        return entities
+
+
+def _bump(component_types: Iterable[Type], entity: int) -> None:
+    global _latest
+    _latest = next(_counter)
+    for component_type in component_types:
+        _changed[component_type] = _latest
+    for tracker in _trackers:
+        if not tracker.component_types.isdisjoint(component_types):
+            tracker._entities.add(entity)
+
+
+def _bump_all() -> None:
+    global _latest, _reset
+    _latest = _reset = next(_counter)
+    for tracker in _trackers:
+        tracker._everything = True
+
+
+def _install() -> None:
+    if getattr(esper.add_component, "_tracks_changes", False):
+        return
+
+    add_component = esper.add_component
+    remove_component = esper.remove_component
+    create_entity = esper.create_entity
+    delete_entity = esper.delete_entity
+    clear_dead_entities = esper.clear_dead_entities
+    clear_database = esper.clear_database
+    switch_world = esper.switch_world
+
+    @wraps(add_component)
+    def add_component_hook(entity, component_instance, type_alias=None):
+        add_component(entity, component_instance, type_alias)
+        _bump((type_alias or type(component_instance),), entity)
+
+    @wraps(remove_component)
+    def remove_component_hook(entity, component_type):
+        component = remove_component(entity, component_type)
+        _bump((component_type,), entity)
+        return component
+
+    @wraps(create_entity)
+    def create_entity_hook(*components):
+        entity = create_entity(*components)
+        if components:
+            _bump([type(component) for component in components], entity)
+        return entity
+
+    @wraps(delete_entity)
+    def delete_entity_hook(entity, immediate=False):
+        types = list(esper._entities.get(entity, ())) if immediate else ()
+        delete_entity(entity, immediate)
+        if types:
+            _bump(types, entity)
+
+    @wraps(clear_dead_entities)
+    def clear_dead_entities_hook():
+        dead = esper._dead_entities
+        if not dead:
+            return
+        changes = [(list(esper._entities.get(entity, ())), entity) for entity in dead]
+        clear_dead_entities()
+        for types, entity in changes:
+            _bump(types, entity)
+
+    @wraps(clear_database)
+    def clear_database_hook():
+        clear_database()
+        _bump_all()
+
+    @wraps(switch_world)
+    def switch_world_hook(name):
+        switch_world(name)
+        _bump_all()
+
+    add_component_hook._tracks_changes = True
+    esper.add_component = add_component_hook
+    esper.remove_component = remove_component_hook
+    esper.create_entity = create_entity_hook
+    esper.delete_entity = delete_entity_hook
+    esper.clear_dead_entities = clear_dead_entities_hook
+    esper.clear_database = clear_database_hook
+    esper.switch_world = switch_world_hook
+
+
+_install()
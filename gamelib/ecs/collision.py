@@ -1,8 +1,17 @@
 import esper
 import pygame
-from typing import Set, Callable, Optional
-
+from typing import Set, Callable, Hashable, Optional, Tuple
+
+from gamelib.ecs.broadphase import (
+    BroadPhase,
+    BruteForceBroadPhase,
+    SpatialHashBroadPhase,
+    StaticIndex,
+)
+from gamelib.ecs.changes import generation
 from gamelib.ecs.geometry import PositionComponent
+from gamelib.ecs.layers import CollisionMatrix, layer_bits, mark_filters_changed
+from gamelib.ecs.masks import MaskCache, default_mask_cache
 
 
 class ColliderComponent:
@@ -17,9 +26,19 @@ class ColliderComponent:
         offset_y: Y offset from PositionComponent (default 0)
         tags: Set of tags for filtering (e.g., {'enemy', 'solid'})
         ignore_tags: Set of tags to ignore during collision detection
+        layer_bits: Bitmask compiled from `tags`
+        ignore_bits: Bitmask compiled from `ignore_tags`
         on_collision: Optional callback function(entity, other_entity, tags)
+        on_collision_end: Optional callback function(entity, other_entity, tags),
+            called once when a contact ends
+        static: Whether the collider never moves. Static colliders are synced
+            from PositionComponent once, indexed once, and only tested
+            against non-static colliders
         mask: Optional pygame.mask.Mask for pixel-perfect collision
         rect: pygame.Rect (automatically updated from PositionComponent)
+
+    Tags are compiled to bits when assigned. Mutating the sets in place does
+    not recompile them; assign a new set instead (`collider.tags = {...}`).
     """
 
     def __init__(
@@ -32,17 +51,43 @@ class ColliderComponent:
         ignore_tags: Optional[Set[str]] = None,
         on_collision: Optional[Callable] = None,
         mask: Optional[pygame.mask.Mask] = None,
+        on_collision_end: Optional[Callable] = None,
+        static: bool = False,
     ):
         self.width = width
         self.height = height
         self.offset_x = offset_x
         self.offset_y = offset_y
-        self.tags = tags or set()
-        self.ignore_tags = ignore_tags or set()
+        self._tags = tags or set()
+        self._ignore_tags = ignore_tags or set()
+        self.layer_bits = layer_bits(self._tags)
+        self.ignore_bits = layer_bits(self._ignore_tags)
         self.on_collision = on_collision
+        self.on_collision_end = on_collision_end
+        self.static = static
         self.mask = mask
         self.rect = pygame.Rect(0, 0, width, height)
 
+    @property
+    def tags(self) -> Set[str]:
+        return self._tags
+
+    @tags.setter
+    def tags(self, tags: Set[str]):
+        self._tags = tags
+        self.layer_bits = layer_bits(tags)
+        mark_filters_changed()
+
+    @property
+    def ignore_tags(self) -> Set[str]:
+        return self._ignore_tags
+
+    @ignore_tags.setter
+    def ignore_tags(self, ignore_tags: Set[str]):
+        self._ignore_tags = ignore_tags
+        self.ignore_bits = layer_bits(ignore_tags)
+        mark_filters_changed()
+
     @classmethod
     def from_surface(
         cls,
@@ -53,9 +98,22 @@ class ColliderComponent:
         ignore_tags: Optional[Set[str]] = None,
         on_collision: Optional[Callable] = None,
         use_mask: bool = False,
+        on_collision_end: Optional[Callable] = None,
+        static: bool = False,
+        mask_key: Optional[Hashable] = None,
+        mask_cache: Optional[MaskCache] = None,
     ):
-        """Create ColliderComponent from pygame.Surface."""
-        mask = pygame.mask.from_surface(surface) if use_mask else None
+        """Create ColliderComponent from pygame.Surface.
+
+        With `use_mask`, the mask comes from `mask_cache` (the shared default
+        cache if not given), so colliders built from the same surface, or
+        with the same `mask_key`, share a single mask.
+        """
+        mask = None
+        if use_mask:
+            if mask_cache is None:
+                mask_cache = default_mask_cache
+            mask = mask_cache.get(surface, mask_key)
         return cls(
             surface.get_width(),
             surface.get_height(),
@@ -65,6 +123,8 @@ class ColliderComponent:
             ignore_tags,
             on_collision,
             mask,
+            on_collision_end,
+            static,
         )
 
     def update_from_position(self, position: PositionComponent):
@@ -94,15 +154,39 @@ class ColliderComponent:
 
     def should_collide_with(self, other: "ColliderComponent") -> bool:
         """Check if collision should occur based on tag filtering."""
-        if self.ignore_tags & other.tags:
+        if self.ignore_bits & other.layer_bits:
             return False
-        if other.ignore_tags & self.tags:
+        if other.ignore_bits & self.layer_bits:
             return False
         return True
 
 
 class CollisionEvent:
-    """Event triggered when a collision occurs."""
+    """Event triggered when a collision occurs.
+
+    Events belong to a contact and are reused: the same instance is handed
+    out every frame while two colliders keep touching, and it goes back to
+    the processor's pool once the contact ends. Copy what you need instead
+    of holding on to an event after its `end` phase.
+
+    Attributes:
+        phase: BEGIN on the first frame of a contact, PERSIST while it lasts
+            and END on the first frame the colliders no longer touch
+        overlap_point: First overlapping pixel relative to collider_a's mask
+            (pixel-perfect hits without `contact_details` only)
+        overlap_area: Overlapping pixel count, or rect area without masks
+            (only with `contact_details`)
+        normal: Unit vector pointing from collider_a towards the overlap
+            (only with `contact_details`)
+        overlap_center: Centroid of the overlap relative to collider_a's
+            rect, in float pixels: of the overlapping pixels for pixel-perfect
+            hits, of the rects' intersection otherwise (only with
+            `contact_details`)
+    """
+
+    BEGIN = "begin"
+    PERSIST = "persist"
+    END = "end"
 
     def __init__(
         self,
@@ -111,19 +195,72 @@ class CollisionEvent:
         collider_a: ColliderComponent,
         collider_b: ColliderComponent,
         overlap_point: Optional[tuple] = None,
+        phase: str = BEGIN,
+        overlap_area: Optional[int] = None,
+        normal: Optional[Tuple[float, float]] = None,
+        overlap_center: Optional[Tuple[float, float]] = None,
     ):
+        self.reset(
+            entity_a,
+            entity_b,
+            collider_a,
+            collider_b,
+            overlap_point,
+            phase,
+            overlap_area,
+            normal,
+            overlap_center,
+        )
+
+    def reset(
+        self,
+        entity_a: int,
+        entity_b: int,
+        collider_a: ColliderComponent,
+        collider_b: ColliderComponent,
+        overlap_point: Optional[tuple] = None,
+        phase: str = BEGIN,
+        overlap_area: Optional[int] = None,
+        normal: Optional[Tuple[float, float]] = None,
+        overlap_center: Optional[Tuple[float, float]] = None,
+    ):
+        """Reinitialize a pooled event for a new contact."""
         self.entity_a = entity_a
         self.entity_b = entity_b
         self.collider_a = collider_a
         self.collider_b = collider_b
         self.overlap_point = overlap_point
+        self.phase = phase
+        self.overlap_area = overlap_area
+        self.normal = normal
+        self.overlap_center = overlap_center
+        self.frame = 0
 
 
 class CollisionProcessor(esper.Processor):
     """System that processes collisions using pygame collision detection.
 
     Automatically syncs ColliderComponent rects with PositionComponent before
-    checking collisions.
+    checking collisions. Candidate pairs come from a pluggable broad phase;
+    the default tests every pair. Colliders are bucketed by layer, so pairs
+    excluded by `ignore_tags` or by `layer_matrix` are never enumerated.
+
+    Touching pairs are tracked in a contact cache. `on_collision` listeners
+    and ColliderComponent callbacks fire every frame a pair touches (with
+    `event.phase` telling begin from persist), unless `transitions_only` is
+    set, in which case they only fire when a contact begins.
+    `on_collision_begin` and `on_collision_end` listeners only ever see
+    transitions.
+
+    Colliders created with `static=True` (level geometry) skip the broad
+    phase: they go into a prebuilt StaticIndex when they are added, and each
+    frame only the dynamic colliders are looked up in it. Moving a static
+    collider requires re-adding its component.
+
+    The narrow phase runs once per pair: a single mask call both decides a
+    pixel-perfect hit and fills in the event. With `contact_details`, that
+    call is `Mask.overlap_mask`, which also yields `overlap_area` and a
+    contact `normal`.
 
     Usage:
         world = esper.World()
@@ -134,12 +271,54 @@ class CollisionProcessor(esper.Processor):
         @collision_processor.on_collision
         def handle_collision(event):
             print(f"Collision between {event.entity_a} and {event.entity_b}")
+
+        # Only hear about contacts starting and ending
+        @collision_processor.on_collision_end
+        def handle_separation(event):
+            print(f"{event.entity_a} and {event.entity_b} separated")
+
+        # Swap in a sort-and-sweep broad phase for many colliders
+        collision_processor = CollisionProcessor(
+            broad_phase=SweepAndPruneBroadPhase()
+        )
+
+        # Never pair enemy bullets with enemies
+        matrix = CollisionMatrix()
+        matrix.ignore("enemy_bullet", "enemy")
+        collision_processor = CollisionProcessor(layer_matrix=matrix)
     """
 
-    def __init__(self, pixel_perfect: bool = False):
+    def __init__(
+        self,
+        pixel_perfect: bool = False,
+        broad_phase: Optional[BroadPhase] = None,
+        layer_matrix: Optional[CollisionMatrix] = None,
+        transitions_only: bool = False,
+        static_cell_size: int = 64,
+        contact_details: bool = False,
+    ):
         super().__init__()
         self.collision_listeners = []
+        self.begin_listeners = []
+        self.end_listeners = []
         self.pixel_perfect = pixel_perfect
+        self.broad_phase = broad_phase or BruteForceBroadPhase()
+        self.static_index = StaticIndex(static_cell_size)
+        self.layer_matrix = layer_matrix
+        self.transitions_only = transitions_only
+        self.contact_details = contact_details
+        self.contacts: dict[Tuple[int, int], CollisionEvent] = {}
+        self._event_pool: list[CollisionEvent] = []
+        self._frame = 0
+        self._seen: Optional[int] = None
+        self._dynamic: list[Tuple[int, ColliderComponent]] = []
+        self._static: list[Tuple[int, ColliderComponent]] = []
+        self._dynamic_positions: list[Tuple[ColliderComponent, PositionComponent]] = []
+
+    @property
+    def entity_count(self) -> int:
+        """Number of colliders, for ProcessorProfiler."""
+        return len(self._dynamic) + len(self._static)
 
     def on_collision(self, func: Callable):
         """Decorator to register collision event listeners."""
@@ -150,151 +329,226 @@ class CollisionProcessor(esper.Processor):
         """Add a collision event listener."""
         self.collision_listeners.append(func)
 
-    def process(self, dt):
-        """Check for collisions between all entities with ColliderComponents."""
-        # First, sync all collider rects with their PositionComponents
-        for entity, (collider, position) in esper.get_components(
-            ColliderComponent, PositionComponent
-        ):
-            collider.update_from_position(position)
-
-        # Get all entities with colliders
-        entities = esper.get_component(ColliderComponent)
-        entity_list = list(entities)
-
-        # Check all pairs of entities for collision
-        for i in range(len(entity_list)):
-            entity_a, collider_a = entity_list[i]
-
-            for j in range(i + 1, len(entity_list)):
-                entity_b, collider_b = entity_list[j]
+    def on_collision_begin(self, func: Callable):
+        """Decorator to register listeners for contacts that just started."""
+        self.begin_listeners.append(func)
+        return func
 
-                # Check if they should collide based on filters
-                if not collider_a.should_collide_with(collider_b):
-                    continue
+    def on_collision_end(self, func: Callable):
+        """Decorator to register listeners for contacts that just ended."""
+        self.end_listeners.append(func)
+        return func
 
-                # Check collision using pygame methods
-                if collider_a.collides_with(collider_b, self.pixel_perfect):
-                    # Get overlap point if using masks
-                    overlap_point = None
-                    if self.pixel_perfect and collider_a.mask and collider_b.mask:
-                        offset = (
-                            collider_b.rect.x - collider_a.rect.x,
-                            collider_b.rect.y - collider_a.rect.y,
-                        )
-                        overlap_point = collider_a.mask.overlap(collider_b.mask, offset)
+    def process(self, dt):
+        """Check for collisions between all entities with ColliderComponents."""
+        seen = generation(ColliderComponent, PositionComponent)
+        if seen != self._seen:
+            self._seen = seen
+            self._split_static(esper.get_component(ColliderComponent))
 
-                    event = CollisionEvent(
-                        entity_a, entity_b, collider_a, collider_b, overlap_point
-                    )
+        # First, sync dynamic collider rects with their PositionComponents
+        for collider, position in self._dynamic_positions:
+            collider.update_from_position(position)
 
-                    # Call component-specific callbacks
-                    if collider_a.on_collision:
-                        collider_a.on_collision(entity_a, entity_b, collider_b.tags)
-                    if collider_b.on_collision:
-                        collider_b.on_collision(entity_b, entity_a, collider_a.tags)
+        self.broad_phase.update(self._dynamic, self.layer_matrix)
+        self.static_index.update(self._static, self.layer_matrix)
+        self._frame += 1
 
-                    # Notify all registered listeners
-                    for listener in self.collision_listeners:
-                        listener(event)
+        for entity_a, collider_a, entity_b, collider_b in self.static_index.query_pairs(
+            self.broad_phase
+        ):
+            if collider_a.rect.colliderect(collider_b.rect):
+                self._narrow_phase(entity_a, entity_b, collider_a, collider_b)
+
+        # Pairs come out of the broad phase already filtered by layer, and
+        # exact broad phases already checked that their rects overlap
+        exact = self.broad_phase.exact
+        for entity_a, collider_a, entity_b, collider_b in self.broad_phase.pairs():
+            if exact or collider_a.rect.colliderect(collider_b.rect):
+                self._narrow_phase(entity_a, entity_b, collider_a, collider_b)
+
+        self._end_stale_contacts()
+
+    def _split_static(self, colliders: list[Tuple[int, ColliderComponent]]):
+        """Split colliders into dynamic and static lists after colliders or
+        positions were added or removed. New statics get their rect synced
+        here, once."""
+        indexed = self.static_index.colliders
+        self._dynamic, self._static = [], []
+        for entity, collider in colliders:
+            if not collider.static:
+                self._dynamic.append((entity, collider))
+                continue
+            self._static.append((entity, collider))
+            if indexed.get(entity) is not collider:
+                position = esper.try_component(entity, PositionComponent)
+                if position is not None:
+                    collider.update_from_position(position)
+        self._dynamic_positions = [
+            (collider, position)
+            for _, (collider, position) in esper.get_components(
+                ColliderComponent, PositionComponent
+            )
+            if not collider.static
+        ]
+
+    def _narrow_phase(
+        self,
+        entity_a: int,
+        entity_b: int,
+        collider_a: ColliderComponent,
+        collider_b: ColliderComponent,
+    ):
+        """Finish the test of a pair whose rects overlap, touching the contact
+        on a hit. Masks are queried at most once per pair."""
+        key = (entity_a, entity_b) if entity_a < entity_b else (entity_b, entity_a)
+        event = self.contacts.get(key)
+        if event is not None and event.entity_a != entity_a:
+            # Keep the entity order the contact began with
+            entity_a, entity_b = entity_b, entity_a
+            collider_a, collider_b = collider_b, collider_a
+
+        rect_a, rect_b = collider_a.rect, collider_b.rect
+        overlap_point = overlap_area = normal = overlap_center = None
+        if self.pixel_perfect and collider_a.mask and collider_b.mask:
+            offset = (rect_b.x - rect_a.x, rect_b.y - rect_a.y)
+            if self.contact_details:
+                overlap = collider_a.mask.overlap_mask(collider_b.mask, offset)
+                overlap_area = overlap.count()
+                if not overlap_area:
+                    return
+                cx, cy = overlap_center = overlap.centroid()
+                normal = self._normal(rect_a, rect_a.x + cx, rect_a.y + cy)
+            else:
+                overlap_point = collider_a.mask.overlap(collider_b.mask, offset)
+                if overlap_point is None:
+                    return
+        elif self.contact_details:
+            clip = rect_a.clip(rect_b)
+            overlap_area = clip.width * clip.height
+            cx, cy = clip.x + clip.width / 2, clip.y + clip.height / 2
+            overlap_center = (cx - rect_a.x, cy - rect_a.y)
+            normal = self._normal(rect_a, cx, cy)
+
+        self._touch(
+            key,
+            event,
+            entity_a,
+            entity_b,
+            collider_a,
+            collider_b,
+            overlap_point,
+            overlap_area,
+            normal,
+            overlap_center,
+        )
 
+    @staticmethod
+    def _normal(rect: pygame.Rect, x: float, y: float) -> Tuple[float, float]:
+        """Unit vector from the center of `rect` towards (x, y)."""
+        dx, dy = x - rect.centerx, y - rect.centery
+        length = (dx * dx + dy * dy) ** 0.5
+        if not length:
+            return 0.0, 0.0
+        return dx / length, dy / length
 
-class SpatialHashProcessor(esper.Processor):
-    """Optimized collision processor using spatial hashing for better performance.
+    def _touch(
+        self,
+        key: Tuple[int, int],
+        event: Optional[CollisionEvent],
+        entity_a: int,
+        entity_b: int,
+        collider_a: ColliderComponent,
+        collider_b: ColliderComponent,
+        overlap_point: Optional[tuple],
+        overlap_area: Optional[int],
+        normal: Optional[Tuple[float, float]],
+        overlap_center: Optional[Tuple[float, float]],
+    ):
+        """Record a hit in the contact cache and notify callbacks and listeners."""
+        if event is None:
+            if self._event_pool:
+                event = self._event_pool.pop()
+                event.reset(entity_a, entity_b, collider_a, collider_b)
+            else:
+                event = CollisionEvent(entity_a, entity_b, collider_a, collider_b)
+            self.contacts[key] = event
+        else:
+            event.phase = CollisionEvent.PERSIST
+            event.collider_a = collider_a
+            event.collider_b = collider_b
+        event.frame = self._frame
+        event.overlap_point = overlap_point
+        event.overlap_area = overlap_area
+        event.normal = normal
+        event.overlap_center = overlap_center
+
+        began = event.phase == CollisionEvent.BEGIN
+        if began:
+            for listener in self.begin_listeners:
+                listener(event)
+        elif self.transitions_only:
+            return
+
+        # Call component-specific callbacks
+        if collider_a.on_collision:
+            collider_a.on_collision(entity_a, entity_b, collider_b.tags)
+        if collider_b.on_collision:
+            collider_b.on_collision(entity_b, entity_a, collider_a.tags)
+
+        # Notify all registered listeners
+        for listener in self.collision_listeners:
+            listener(event)
+
+    def _end_stale_contacts(self):
+        """End every contact that was not touched this frame and pool its event."""
+        frame = self._frame
+        stale = [key for key, event in self.contacts.items() if event.frame != frame]
+        for key in stale:
+            event = self.contacts.pop(key)
+            event.phase = CollisionEvent.END
+            collider_a, collider_b = event.collider_a, event.collider_b
+            if collider_a.on_collision_end:
+                collider_a.on_collision_end(
+                    event.entity_a, event.entity_b, collider_b.tags
+                )
+            if collider_b.on_collision_end:
+                collider_b.on_collision_end(
+                    event.entity_b, event.entity_a, collider_a.tags
+                )
+            for listener in self.end_listeners:
+                listener(event)
+            self._event_pool.append(event)
+
+
+class SpatialHashProcessor(CollisionProcessor):
+    """Collision processor using a persistent spatial hash as its broad phase.
 
     Automatically syncs ColliderComponent rects with PositionComponent before
-    checking collisions. More efficient for games with many entities.
+    checking collisions. More efficient for games with many entities, and
+    mostly static scenes only pay for colliders that change grid cells.
     """
 
-    def __init__(self, cell_size: int = 64, pixel_perfect: bool = False):
-        super().__init__()
-        self.collision_listeners = []
-        self.pixel_perfect = pixel_perfect
-        self.cell_size = cell_size
-
-    def on_collision(self, func: Callable):
-        """Decorator to register collision event listeners."""
-        self.collision_listeners.append(func)
-        return func
-
-    def add_listener(self, func: Callable):
-        """Add a collision event listener."""
-        self.collision_listeners.append(func)
-
-    def _get_cells(self, rect: pygame.Rect) -> Set[tuple]:
-        """Get all grid cells that this rect occupies."""
-        cells = set()
-        left = rect.left // self.cell_size
-        right = rect.right // self.cell_size
-        top = rect.top // self.cell_size
-        bottom = rect.bottom // self.cell_size
-
-        for x in range(left, right + 1):
-            for y in range(top, bottom + 1):
-                cells.add((x, y))
-        return cells
-
-    def process(self):
-        """Check for collisions using spatial hashing."""
-        # First, sync all collider rects with their PositionComponents
-        for entity, (collider, position) in esper.get_components(
-            ColliderComponent, PositionComponent
-        ):
-            collider.update_from_position(position)
+    def __init__(
+        self,
+        cell_size: int = 64,
+        pixel_perfect: bool = False,
+        layer_matrix: Optional[CollisionMatrix] = None,
+        transitions_only: bool = False,
+        static_cell_size: Optional[int] = None,
+        contact_details: bool = False,
+    ):
+        """`static_cell_size` defaults to `cell_size`; the other options are
+        CollisionProcessor's."""
+        super().__init__(
+            pixel_perfect,
+            SpatialHashBroadPhase(cell_size),
+            layer_matrix,
+            transitions_only,
+            static_cell_size or cell_size,
+            contact_details,
+        )
 
-        # Build spatial hash
-        spatial_hash = {}
-        entities = list(esper.get_component(ColliderComponent))
-
-        for entity, collider in entities:
-            cells = self._get_cells(collider.rect)
-            for cell in cells:
-                if cell not in spatial_hash:
-                    spatial_hash[cell] = []
-                spatial_hash[cell].append((entity, collider))
-
-        # Check collisions only within same cells
-        checked_pairs = set()
-
-        for cell, cell_entities in spatial_hash.items():
-            for i in range(len(cell_entities)):
-                entity_a, collider_a = cell_entities[i]
-
-                for j in range(i + 1, len(cell_entities)):
-                    entity_b, collider_b = cell_entities[j]
-
-                    # Avoid checking same pair twice
-                    pair = tuple(sorted([entity_a, entity_b]))
-                    if pair in checked_pairs:
-                        continue
-                    checked_pairs.add(pair)
-
-                    # Check filtering
-                    if not collider_a.should_collide_with(collider_b):
-                        continue
-
-                    # Check collision
-                    if collider_a.collides_with(collider_b, self.pixel_perfect):
-                        overlap_point = None
-                        if self.pixel_perfect and collider_a.mask and collider_b.mask:
-                            offset = (
-                                collider_b.rect.x - collider_a.rect.x,
-                                collider_b.rect.y - collider_a.rect.y,
-                            )
-                            overlap_point = collider_a.mask.overlap(
-                                collider_b.mask, offset
-                            )
-
-                        event = CollisionEvent(
-                            entity_a, entity_b, collider_a, collider_b, overlap_point
-                        )
-
-                        # Call callbacks
-                        if collider_a.on_collision:
-                            collider_a.on_collision(entity_a, entity_b, collider_b.tags)
-                        if collider_b.on_collision:
-                            collider_b.on_collision(entity_b, entity_a, collider_a.tags)
-
-                        # Notify listeners
-                        for listener in self.collision_listeners:
-                            listener(event)
+    @property
+    def cell_size(self) -> int:
+        return self.broad_phase.cell_size
@@ -40,13 +40,25 @@ class PositionBoundsComponent:
 
 
 class MoveProcessor(Processor):
+    """Move entities by `base_speed * multiplier` every frame.
+
+    Args:
+        use_dt: Treat `base_speed` as units per second and scale it by the
+            frame's dt instead of moving a fixed amount per frame
+    """
+
+    def __init__(self, use_dt: bool = False):
+        super().__init__()
+        self.use_dt = use_dt
+
     def process(self, dt):
+        step = dt if self.use_dt else 1
         for entity, (speed_comp, pos) in esper.get_components(
             VelocityComponent, PositionComponent
         ):
-            # TO-DO: Factor for dt
-            pos.x += speed_comp.base_speed[0]
-            pos.y += speed_comp.base_speed[1]
+            factor = speed_comp.multiplier * step
+            pos.x += speed_comp.base_speed[0] * factor
+            pos.y += speed_comp.base_speed[1] * factor
 
 
 class PositionBoundsProcessor(Processor):
@@ -0,0 +1,81 @@
+from typing import Iterable, Optional
+
+# Process-wide tag -> bit registry. Tags are compiled once, when a collider is
+# created or its tags are reassigned, so filtering is plain integer math.
+_tag_bits: dict[str, int] = {}
+
+# Bumped whenever an existing collider's tags are reassigned, so broad phases
+# know to re-check which layer bucket their colliders belong to.
+generation = 0
+
+
+def layer_bit(tag: str) -> int:
+    """Get the bit for a tag, assigning the next free bit on first use."""
+    bit = _tag_bits.get(tag)
+    if bit is None:
+        bit = _tag_bits[tag] = 1 << len(_tag_bits)
+    return bit
+
+
+def layer_bits(tags: Optional[Iterable[str]]) -> int:
+    """Compile a collection of tags into a single bitmask."""
+    bits = 0
+    for tag in tags or ():
+        bits |= layer_bit(tag)
+    return bits
+
+
+def mark_filters_changed() -> None:
+    """Signal that a collider's tags changed after it was created."""
+    global generation
+    generation += 1
+
+
+class CollisionMatrix:
+    """World-level table of which collision layers interact.
+
+    Every pair of layers interacts until told otherwise. Layers are the same
+    tags used on ColliderComponent, so a collider is excluded from a pair as
+    soon as any of its tags ignores any tag of the other collider, matching
+    how `ignore_tags` behaves.
+
+    Usage:
+        matrix = CollisionMatrix()
+        matrix.ignore("enemy_bullet", "enemy")
+        processor = CollisionProcessor(layer_matrix=matrix)
+    """
+
+    def __init__(self) -> None:
+        self._ignored: dict[int, int] = {}
+        self._cache: dict[int, int] = {}
+        self.version = 0
+
+    def ignore(self, layer_a: str, layer_b: str) -> None:
+        """Stop colliders on `layer_a` and `layer_b` from ever being paired."""
+        self._set(layer_bit(layer_a), layer_bit(layer_b), True)
+
+    def allow(self, layer_a: str, layer_b: str) -> None:
+        """Let colliders on `layer_a` and `layer_b` interact again."""
+        self._set(layer_bit(layer_a), layer_bit(layer_b), False)
+
+    def interacts(self, layer_a: str, layer_b: str) -> bool:
+        """Check whether two layers interact."""
+        return not self._ignored.get(layer_bit(layer_a), 0) & layer_bit(layer_b)
+
+    def ignored_bits(self, bits: int) -> int:
+        """Get every layer bit ignored by at least one layer in `bits`."""
+        ignored = self._cache.get(bits)
+        if ignored is None:
+            ignored = 0
+            for bit, mask in self._ignored.items():
+                if bits & bit:
+                    ignored |= mask
+            self._cache[bits] = ignored
+        return ignored
+
+    def _set(self, bit_a: int, bit_b: int, ignored: bool) -> None:
+        for bit, other in ((bit_a, bit_b), (bit_b, bit_a)):
+            mask = self._ignored.get(bit, 0)
+            self._ignored[bit] = mask | other if ignored else mask & ~other
+        self._cache.clear()
+        self.version += 1
@@ -0,0 +1,86 @@
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Hashable, Optional
+import weakref
+
+import pygame
+
+
+class MaskCache:
+    """LRU cache of pygame masks shared between colliders.
+
+    Masks are keyed by surface identity by default, so every collider built
+    from the same Surface object shares one mask. Pass an explicit `key`
+    (an image path, a sprite name, or `MaskCache.content_key(surface)`) to
+    share masks between distinct but identical surfaces. Identity entries are
+    dropped as soon as their surface is garbage collected; all entries are
+    subject to LRU eviction beyond `max_size`.
+
+    Cached masks are shared, so do not draw into them. A surface changed
+    after its mask was built needs `discard` before the next lookup.
+
+    Attributes:
+        max_size: Maximum number of masks kept
+        threshold: Alpha threshold passed to pygame.mask.from_surface
+        hits: Number of lookups served from the cache
+        misses: Number of lookups that built a new mask
+    """
+
+    def __init__(self, max_size: int = 256, threshold: int = 127) -> None:
+        self.max_size = max_size
+        self.threshold = threshold
+        self.hits = 0
+        self.misses = 0
+        self._masks: OrderedDict[Hashable, pygame.mask.Mask] = OrderedDict()
+        self._watched: set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._masks)
+
+    @staticmethod
+    def content_key(surface: pygame.Surface) -> Hashable:
+        """Build a key from the surface's size and pixel data.
+
+        Hashing the pixels costs about as much as building the mask once, so
+        this is worth it when many distinct surfaces hold the same image.
+        """
+        digest = blake2b(pygame.image.tobytes(surface, "RGBA"), digest_size=16)
+        return surface.get_size(), digest.digest()
+
+    def get(
+        self, surface: pygame.Surface, key: Optional[Hashable] = None
+    ) -> pygame.mask.Mask:
+        """Get the mask of `surface`, building and caching it on a miss."""
+        if key is None:
+            key = ("surface", id(surface))
+            if id(surface) not in self._watched:
+                self._watched.add(id(surface))
+                weakref.finalize(surface, self._forget, id(surface))
+
+        mask = self._masks.get(key)
+        if mask is not None:
+            self._masks.move_to_end(key)
+            self.hits += 1
+            return mask
+
+        self.misses += 1
+        mask = pygame.mask.from_surface(surface, self.threshold)
+        self._masks[key] = mask
+        while len(self._masks) > self.max_size:
+            self._masks.popitem(last=False)
+        return mask
+
+    def discard(self, surface: pygame.Surface, key: Optional[Hashable] = None):
+        """Drop the cached mask of `surface` (or of `key`)."""
+        self._masks.pop(("surface", id(surface)) if key is None else key, None)
+
+    def clear(self) -> None:
+        self._masks.clear()
+
+    def _forget(self, surface_id: int) -> None:
+        self._watched.discard(surface_id)
+        self._masks.pop(("surface", surface_id), None)
+
+
+# Shared by ColliderComponent.from_surface unless another cache is passed in
+default_mask_cache = MaskCache()
@@ -1,14 +1,40 @@
 from dataclasses import dataclass, field
-from typing import List
+from functools import partial
+import logging
+from typing import Callable, Dict, List, Optional
 from esper import Processor
 import esper
 
+from gamelib.ecs.changes import ChangeTracker
+from gamelib.ecs.timer import TimerHandle, TimerScheduler
+from gamelib.mgmt.game_event import GameEvent
+
+# Triggered with (event, entity, modifier) where event is one of "applied",
+# "stacked", "refreshed", "removed" or "expired". Nothing listens by default.
+modifier_events = GameEvent()
+
 
 @dataclass
 class ModifierContainer:
-    """Component that holds all active modifiers for an entity"""
+    """Component that holds all active modifiers for an entity
+
+    Use `add_modifier` and `remove_modifier` rather than editing `modifiers`
+    directly, so `by_name` and the ModifierProcessor stay in sync.
+
+    Attributes:
+        modifiers: Active modifiers, in the order they were applied
+        by_name: The same modifiers, indexed by name
+        pending: Modifiers applied since a ModifierProcessor last saw the
+            container; the processor schedules them on its next frame
+    """
 
     modifiers: List["Modifier"] = field(default_factory=list)
+    by_name: Dict[str, "Modifier"] = field(default_factory=dict, repr=False)
+    pending: List["Modifier"] = field(default_factory=list, repr=False)
+
+    def __post_init__(self):
+        if self.modifiers and not self.by_name:
+            self.by_name = {modifier.name: modifier for modifier in self.modifiers}
 
 
 class Modifier:
@@ -26,10 +52,23 @@ class Modifier:
         """
         self.name = name
         self.duration = duration
-        self.time_remaining = duration
         self.stackable = stackable
         self.max_stacks = max_stacks
         self.current_stacks = 1
+        self.expiry: Optional[TimerHandle] = None
+        self._time_remaining = duration
+
+    @property
+    def time_remaining(self) -> float:
+        if self.expiry is None:
+            return self._time_remaining
+        return self.expiry.remaining
+
+    @time_remaining.setter
+    def time_remaining(self, value: float):
+        self._time_remaining = value
+        if self.expiry is not None:
+            self.expiry.reset(value)
 
     def on_apply(self, entity: int) -> None:
         """Called when modifier is first applied to an entity"""
@@ -39,6 +78,9 @@ class Modifier:
         """
         Called every frame while modifier is active
 
+        Only called for subclasses that override it; expiry after `duration`
+        is scheduled by ModifierProcessor and needs no per-frame update.
+
         Args:
             entity: The entity ID
             dt: Delta time in seconds
@@ -46,10 +88,7 @@ class Modifier:
         Returns:
             True to keep modifier active, False to remove it
         """
-        if self.duration > 0:
-            self.time_remaining -= dt
-            return self.time_remaining > 0
-        return True  # Permanent modifiers
+        return True
 
     def on_remove(self, entity: int) -> None:
         """Called when modifier is removed from an entity"""
@@ -68,33 +107,116 @@ class Modifier:
         return False
 
 
+def _overrides_update(modifier: Modifier) -> bool:
+    return type(modifier).on_update is not Modifier.on_update
+
+
 # ===== PROCESSOR =====
 
 
 class ModifierProcessor(Processor):
-    """Processes all active modifiers on entities"""
+    """Expires timed modifiers and updates modifiers that need it
+
+    Timed modifiers expire through a TimerScheduler, so only modifiers that
+    override `on_update` are visited every frame. ModifierContainers are
+    found on the first frame and, once added or removed, through a
+    ChangeTracker; modifiers applied to a known container wait in its
+    `pending` list until the next frame. The processor doesn't have to be
+    registered with esper, e.g. when a FixedStepScene runs it. The modifiers
+    of a removed container stop expiring until it's added again.
+    """
 
-    def process(self, dt) -> None:
-        for ent, container in esper.get_component(ModifierContainer):
-            # Update all modifiers and filter out expired ones
-            active_modifiers = []
+    def __init__(self):
+        super().__init__()
+        self.scheduler = TimerScheduler()
+        self._updating: Dict[tuple[int, str], Modifier] = {}
+        self._changes = ChangeTracker(ModifierContainer)
+        self._containers: Dict[int, ModifierContainer] = {}
+
+    @property
+    def entity_count(self) -> int:
+        """Number of ModifierContainers, for ProcessorProfiler"""
+        return len(self._containers)
+
+    def track(self, entity: int, modifier: Modifier) -> None:
+        """Schedule expiry and per-frame updates of a newly applied modifier"""
+        if modifier.expiry is None and modifier.duration > 0:
+            modifier.expiry = self.scheduler.schedule(
+                modifier._time_remaining,
+                partial(self._expire, entity, modifier),
+                entity=entity,
+            )
+        if _overrides_update(modifier):
+            self._updating[entity, modifier.name] = modifier
 
+    def process(self, dt) -> None:
+        changed = self._changes.take()
+        if changed is None:
+            changed = set(self._containers)
+            changed.update(ent for ent, _ in esper.get_component(ModifierContainer))
+        for ent in changed:
+            self._track_container(ent)
+        for ent, container in self._containers.items():
+            if container.pending:
+                for modifier in container.pending:
+                    if container.by_name.get(modifier.name) is modifier:
+                        self.track(ent, modifier)
+                container.pending.clear()
+
+        self.scheduler.advance(dt)
+
+        for (ent, name), modifier in list(self._updating.items()):
+            container = esper.entity_exists(ent) and esper.try_component(
+                ent, ModifierContainer
+            )
+            if not container or container.by_name.get(name) is not modifier:
+                # Removed since it was tracked
+                del self._updating[ent, name]
+            elif not modifier.on_update(ent, dt):
+                _detach(ent, container, modifier, "expired")
+
+    def _track_container(self, entity: int) -> None:
+        container = esper._entities.get(entity, {}).get(ModifierContainer)
+        old = self._containers.get(entity)
+        if container is old:
+            return
+        if old is not None:
+            del self._containers[entity]
+            for modifier in old.modifiers:
+                expiry = modifier.expiry
+                if expiry is not None and expiry._scheduler is self.scheduler:
+                    modifier._time_remaining = expiry.remaining
+                    expiry.cancel()
+                    modifier.expiry = None
+        if container is not None:
+            self._containers[entity] = container
+            container.pending.clear()
             for modifier in container.modifiers:
-                should_keep = modifier.on_update(ent, dt)
+                self.track(entity, modifier)
 
-                if should_keep:
-                    active_modifiers.append(modifier)
-                else:
-                    # Modifier expired
-                    modifier.on_remove(ent)
-                    print(f"[Entity {ent}] {modifier.name} expired")
-
-            container.modifiers = active_modifiers
+    @staticmethod
+    def _expire(entity: int, modifier: Modifier) -> None:
+        container = esper.try_component(entity, ModifierContainer)
+        if container is not None and container.by_name.get(modifier.name) is modifier:
+            _detach(entity, container, modifier, "expired")
 
 
 # ===== HELPER FUNCTIONS =====
 
 
+def _detach(
+    entity: int, container: ModifierContainer, modifier: Modifier, event: str
+) -> None:
+    del container.by_name[modifier.name]
+    container.modifiers.remove(modifier)
+    if modifier in container.pending:
+        container.pending.remove(modifier)
+    if modifier.expiry is not None:
+        modifier.expiry.cancel()
+    modifier.on_remove(entity)
+    modifier_events.trigger(event, entity, modifier)
+
+
 def add_modifier(entity: int, modifier: Modifier) -> None:
     """
     Add a modifier to an entity
@@ -104,30 +226,29 @@ def add_modifier(entity: int, modifier: Modifier) -> None:
         modifier: The modifier instance to add
     """
     # Ensure entity has ModifierContainer
-    if not esper.has_component(entity, ModifierContainer):
-        esper.add_component(entity, ModifierContainer())
-
-    container = esper.component_for_entity(entity, ModifierContainer)
+    container = esper.try_component(entity, ModifierContainer)
+    if container is None:
+        container = ModifierContainer()
+        esper.add_component(entity, container)
 
     # Check if modifier already exists and is stackable
-    existing = next((m for m in container.modifiers if m.name == modifier.name), None)
+    existing = container.by_name.get(modifier.name)
 
     if existing:
         if existing.on_stack(entity):
-            print(
-                f"[Entity {entity}] {modifier.name} stacked ({existing.current_stacks}x)"
-            )
-            return
+            modifier_events.trigger("stacked", entity, existing)
         else:
             # Refresh duration instead
             existing.time_remaining = existing.duration
-            print(f"[Entity {entity}] {modifier.name} duration refreshed")
-            return
+            modifier_events.trigger("refreshed", entity, existing)
+        return
 
     # Add new modifier
     container.modifiers.append(modifier)
+    container.by_name[modifier.name] = modifier
+    container.pending.append(modifier)
     modifier.on_apply(entity)
-    print(f"[Entity {entity}] {modifier.name} applied")
+    modifier_events.trigger("applied", entity, modifier)
 
 
 def remove_modifier(entity: int, modifier_name: str) -> None:
@@ -138,17 +259,13 @@ def remove_modifier(entity: int, modifier_name: str) -> None:
         entity: The entity ID
         modifier_name: Name of the modifier to remove
     """
-    if not esper.has_component(entity, ModifierContainer):
+    container = esper.try_component(entity, ModifierContainer)
+    if container is None:
         return
 
-    container = esper.component_for_entity(entity, ModifierContainer)
-
-    for i, modifier in enumerate(container.modifiers):
-        if modifier.name == modifier_name:
-            modifier.on_remove(entity)
-            container.modifiers.pop(i)
-            print(f"[Entity {entity}] {modifier_name} removed")
-            break
+    modifier = container.by_name.get(modifier_name)
+    if modifier is not None:
+        _detach(entity, container, modifier, "removed")
 
 
 def get_active_modifiers(entity: int) -> List[dict]:
@@ -158,11 +275,31 @@ def get_active_modifiers(entity: int) -> List[dict]:
     Returns:
         List of dicts with modifier info (name, time_remaining, stacks)
     """
-    if not esper.has_component(entity, ModifierContainer):
+    container = esper.try_component(entity, ModifierContainer)
+    if container is None:
         return []
 
-    container = esper.component_for_entity(entity, ModifierContainer)
     return [
         {"name": m.name, "time_remaining": m.time_remaining, "stacks": m.current_stacks}
         for m in container.modifiers
     ]
+
+
+def log_modifier_events(
+    logger: Optional[logging.Logger] = None, level: int = logging.DEBUG
+) -> Callable:
+    """
+    Log every modifier event, e.g. while debugging
+
+    Returns:
+        The listener, to pass to `modifier_events.remove_listener` later
+    """
+    logger = logger or logging.getLogger(__name__)
+
+    def listener(event: str, entity: int, modifier: Modifier) -> None:
+        if event == "stacked":
+            event = f"stacked ({modifier.current_stacks}x)"
+        logger.log(level, "[Entity %s] %s %s", entity, modifier.name, event)
+
+    modifier_events.add_listener(listener)
+    return listener
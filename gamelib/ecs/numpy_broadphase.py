@@ -0,0 +1,146 @@
+from itertools import chain
+from typing import TYPE_CHECKING, Iterator
+
+from gamelib.ecs.broadphase import BroadPhase, T_CandidatePair, T_Signature
+
+try:
+    import numpy as np
+except ImportError as exc:  # pragma: no cover - depends on the environment
+    raise ImportError(
+        "NumpyBroadPhase requires numpy. Install it with `pip install numpy`."
+    ) from exc
+
+if TYPE_CHECKING:
+    from gamelib.ecs.collision import ColliderComponent
+
+
+class NumpyBroadPhase(BroadPhase):
+    """Vectorized broad phase that mirrors collider rects into NumPy arrays.
+
+    Every frame the rects are copied into a contiguous (n, 4) array and the
+    overlap test runs as a batched sort-and-sweep: colliders are sorted by
+    x, `searchsorted` finds how far each x interval reaches, and the
+    resulting candidate pairs are filtered on the y axis and on layer bits
+    in bulk. Only pairs that truly overlap and pass layer filtering are
+    yielded, so the processor skips its own rect check for them.
+
+    Layer bits are mirrored into uint64 arrays, so colliders using this broad
+    phase are limited to the first 64 registered tags.
+
+    Attributes:
+        max_pairs: Upper bound on candidate pairs materialized at once.
+            Dense clusters are swept in several batches to cap memory use.
+    """
+
+    exact = True
+
+    def __init__(self, max_pairs: int = 1 << 20) -> None:
+        super().__init__()
+        self.max_pairs = max_pairs
+        self._entities: list[int] = []
+        self._components: list["ColliderComponent"] = []
+        self._layers = np.zeros(0, dtype=np.uint64)
+        self._ignores = np.zeros(0, dtype=np.uint64)
+        self._dirty = True
+        self._mirrored_matrix_state = None
+
+    def _add(
+        self, entity: int, collider: "ColliderComponent", signature: T_Signature
+    ) -> None:
+        self._dirty = True
+
+    def _remove(self, entity: int, signature: T_Signature) -> None:
+        self._dirty = True
+
+    def _refresh(self) -> None:
+        if not self._dirty and self._mirrored_matrix_state == self._matrix_state:
+            return
+        self._dirty = False
+        self._mirrored_matrix_state = self._matrix_state
+        self._entities = list(self.colliders.keys())
+        self._components = list(self.colliders.values())
+        matrix = self.layer_matrix
+        ignores = [c.ignore_bits for c in self._components]
+        if matrix is not None:
+            ignores = [
+                ignore | matrix.ignored_bits(c.layer_bits)
+                for ignore, c in zip(ignores, self._components)
+            ]
+        self._layers = np.array(
+            [c.layer_bits for c in self._components], dtype=np.uint64
+        )
+        self._ignores = np.array(ignores, dtype=np.uint64)
+
+    def overlapping_indices(self) -> tuple["np.ndarray", "np.ndarray"]:
+        """Get index arrays (a, b) of every overlapping, non-filtered pair.
+
+        Indices refer to the order of `self.colliders` as of the last update.
+        """
+        count = len(self._components)
+        if count < 2:
+            empty = np.zeros(0, dtype=np.intp)
+            return empty, empty
+
+        rects = np.fromiter(
+            chain.from_iterable(c.rect for c in self._components),
+            dtype=np.int64,
+            count=4 * count,
+        ).reshape(count, 4)
+        x, y = rects[:, 0], rects[:, 1]
+        right, bottom = x + rects[:, 2], y + rects[:, 3]
+
+        # pygame.Rect.colliderect never reports an empty rect, so leave
+        # zero-width and zero-height colliders out of the sweep
+        live = np.flatnonzero((rects[:, 2] > 0) & (rects[:, 3] > 0))
+        count = len(live)
+        order = live[np.argsort(x[live], kind="stable")]
+        sorted_x = x[order]
+        sorted_right = right[order]
+        # Sorted index one past the last collider whose left edge lies
+        # inside each collider's x interval.
+        ends = np.searchsorted(sorted_x, sorted_right, side="left")
+        starts = np.arange(1, count + 1)
+        counts = np.maximum(ends - starts, 0)
+        totals = np.cumsum(counts)
+
+        found_a, found_b = [], []
+        first = 0
+        while first < count:
+            done = totals[first - 1] if first else 0
+            last = int(np.searchsorted(totals, done + self.max_pairs, side="right"))
+            last = min(max(last, first + 1), count)
+            rows = np.arange(first, last)
+            row_counts = counts[first:last]
+            total = int(row_counts.sum())
+            first = last
+            if not total:
+                continue
+
+            # Expand every row into its run of sorted partners i+1 .. end-1.
+            sorted_a = np.repeat(rows, row_counts)
+            run_starts = np.repeat(np.cumsum(row_counts) - row_counts, row_counts)
+            sorted_b = sorted_a + 1 + (np.arange(total) - run_starts)
+
+            a = order[sorted_a]
+            b = order[sorted_b]
+            keep = (
+                (right[b] > x[a])
+                & (y[b] < bottom[a])
+                & (bottom[b] > y[a])
+                & ((self._ignores[a] & self._layers[b]) == 0)
+                & ((self._ignores[b] & self._layers[a]) == 0)
+            )
+            found_a.append(a[keep])
+            found_b.append(b[keep])
+
+        if not found_a:
+            empty = np.zeros(0, dtype=np.intp)
+            return empty, empty
+        return np.concatenate(found_a), np.concatenate(found_b)
+
+    def pairs(self) -> Iterator[T_CandidatePair]:
+        entities = self._entities
+        components = self._components
+        a, b = self.overlapping_indices()
+        for i, j in zip(a.tolist(), b.tolist()):
+            yield entities[i], components[i], entities[j], components[j]
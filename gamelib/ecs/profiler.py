@@ -0,0 +1,209 @@
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Iterable, Optional, Sequence
+
+import esper
+import pygame
+from esper import Processor
+
+
+@dataclass
+class ProcessorStats:
+    """Percentiles of a processor's frame times, in seconds.
+
+    `entities` is the processor's entity count from the last frame it ran.
+    """
+
+    name: str
+    p50: float
+    p95: float
+    p99: float
+    entities: int
+
+
+def percentile(samples: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of `samples` (0 when empty)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class ProcessorProfiler:
+    """Times every watched processor and keeps a rolling per-frame history.
+
+    Enabling the profiler wraps `process` on each processor and the esper
+    query functions; disabling removes the wrappers again, so a disabled
+    profiler costs nothing and can stay in production builds.
+
+    Time and queried entity rows are summed per processor between calls to
+    `end_frame`, which records one sample per watched processor (0 for
+    processors that did not run that frame, e.g. low-rate ones). The last
+    `history` frames are kept.
+
+    Processors that cache their queries don't call esper every frame, so
+    they report the size of their working set instead, through an
+    `entity_count` attribute or property; it replaces the query count for
+    every frame the processor runs.
+
+    Attributes:
+        history: Number of frames kept
+        timings: Per-processor ring buffer of seconds spent per frame
+        entity_counts: Per-processor ring buffer of the entity_count of the
+            processor, or rows returned by esper.get_component(s), per frame
+        frame_times: Ring buffer of the frame times passed to end_frame
+
+    Usage:
+        profiler = ProcessorProfiler()
+        profiler.enable()  # all esper processors; or enable(scene processors)
+
+        # every frame
+        esper.process(dt)
+        profiler.end_frame(dt)
+        scene.screen.blit(profiler.overlay(), (0, 0))
+    """
+
+    def __init__(self, history: int = 240):
+        self.history = history
+        self.enabled = False
+        self.timings: dict[str, deque[float]] = {}
+        self.entity_counts: dict[str, deque[int]] = {}
+        self.frame_times: deque[float] = deque(maxlen=history)
+        self._watched: dict[int, tuple[Processor, str]] = {}
+        self._frame_time: defaultdict[str, float] = defaultdict(float)
+        self._frame_entities: defaultdict[str, int] = defaultdict(int)
+        # Entity count of the last frame each processor ran
+        self._last_entities: dict[str, int] = {}
+        self._current: Optional[str] = None
+        self._queries = None
+        self._font: Optional[pygame.font.Font] = None
+
+    def enable(self, processors: Optional[Iterable[Processor]] = None) -> None:
+        """Start profiling `processors` (default: all esper processors)."""
+        if processors is None:
+            processors = list(esper._processors)
+        for processor in processors:
+            self.watch(processor)
+        if not self.enabled:
+            self.enabled = True
+            self._queries = esper.get_component, esper.get_components
+            esper.get_component = self._counted(esper.get_component)
+            esper.get_components = self._counted(esper.get_components)
+
+    def disable(self) -> None:
+        """Remove every wrapper; collected history is kept."""
+        for processor, _ in list(self._watched.values()):
+            self.unwatch(processor)
+        if self.enabled:
+            esper.get_component, esper.get_components = self._queries
+            self._queries = None
+            self.enabled = False
+
+    def watch(self, processor: Processor, name: Optional[str] = None) -> None:
+        """Time `processor`, reported under `name` (default: its class name)."""
+        if id(processor) in self._watched:
+            return
+        name = name or type(processor).__name__
+        original = processor.process
+
+        def timed_process(*args, **kwargs):
+            outer = self._current
+            self._current = name
+            start = perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self._frame_time[name] += perf_counter() - start
+                self._current = outer
+
+        processor.process = timed_process
+        self._watched[id(processor)] = processor, name
+        self.timings.setdefault(name, deque(maxlen=self.history))
+        self.entity_counts.setdefault(name, deque(maxlen=self.history))
+
+    def unwatch(self, processor: Processor) -> None:
+        if self._watched.pop(id(processor), None) is not None:
+            # Drop the instance attribute so the class method shows through
+            del processor.process
+
+    def end_frame(self, frame_time: Optional[float] = None) -> None:
+        """Close the current frame and push its samples into the history."""
+        if frame_time is not None:
+            self.frame_times.append(frame_time)
+        for processor, name in self._watched.values():
+            if name in self._frame_time:
+                count = getattr(processor, "entity_count", None)
+                if count is not None:
+                    self._frame_entities[name] = count
+                self._last_entities[name] = self._frame_entities.get(name, 0)
+        for name, samples in self.timings.items():
+            samples.append(self._frame_time.get(name, 0.0))
+            self.entity_counts[name].append(self._frame_entities.get(name, 0))
+        self._frame_time.clear()
+        self._frame_entities.clear()
+
+    def stats(self) -> list[ProcessorStats]:
+        """Per-processor percentiles, most expensive (by p95) first."""
+        stats = [
+            ProcessorStats(
+                name,
+                percentile(samples, 0.5),
+                percentile(samples, 0.95),
+                percentile(samples, 0.99),
+                self._last_entities.get(name, 0),
+            )
+            for name, samples in self.timings.items()
+        ]
+        stats.sort(key=lambda s: s.p95, reverse=True)
+        return stats
+
+    def overlay(
+        self,
+        font: Optional[pygame.font.Font] = None,
+        color: pygame.Color = pygame.Color(255, 255, 255),
+        background: pygame.Color = pygame.Color(0, 0, 0, 160),
+    ) -> pygame.Surface:
+        """Render the current stats as a table, ready to blit on the screen."""
+        if font is None:
+            if self._font is None:
+                if not pygame.font.get_init():
+                    pygame.font.init()
+                # Monospace keeps the columns aligned
+                self._font = pygame.font.SysFont("monospace", 14)
+            font = self._font
+
+        lines = [f"{'processor':<28}{'p50':>8}{'p95':>8}{'p99':>8}{'ents':>8}"]
+        for s in self.stats():
+            lines.append(
+                f"{s.name[:27]:<28}{s.p50 * 1000:>8.2f}{s.p95 * 1000:>8.2f}"
+                f"{s.p99 * 1000:>8.2f}{s.entities:>8}"
+            )
+        if self.frame_times:
+            frame = self.frame_times
+            lines.append(
+                f"{'frame (ms)':<28}{percentile(frame, 0.5) * 1000:>8.2f}"
+                f"{percentile(frame, 0.95) * 1000:>8.2f}"
+                f"{percentile(frame, 0.99) * 1000:>8.2f}"
+            )
+
+        rendered = [font.render(line, True, color) for line in lines]
+        width = max(line.get_width() for line in rendered) + 8
+        height = sum(line.get_height() for line in rendered) + 8
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill(background)
+        y = 4
+        for line in rendered:
+            surface.blit(line, (4, y))
+            y += line.get_height()
+        return surface
+
+    def _counted(self, query):
+        def counted_query(*component_types):
+            result = query(*component_types)
+            if self._current is not None:
+                self._frame_entities[self._current] += len(result)
+            return result
+
+        return counted_query
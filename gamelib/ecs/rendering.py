@@ -1,17 +1,118 @@
+from bisect import insort
 from dataclasses import dataclass
-from typing import Self
+from typing import Hashable, Optional, Self
 
 from esper import Processor
 import esper
 import pygame
 from pygame import Surface
 
+from gamelib.ecs.broadphase import SpatialGrid
+from gamelib.ecs.camera import CameraComponent
+from gamelib.ecs.changes import generation
 from gamelib.ecs.geometry import PositionComponent
+from gamelib.mgmt.assets import default_asset_cache
+
+
+# Bumped whenever a RenderSurfaceComponent changes layer, so processors know
+# to re-bucket without checking every component each frame
+layer_generation = 0
+
+T_Renderable = tuple["RenderSurfaceComponent", PositionComponent]
+
+
+def merge_rects(rects: list[pygame.Rect]) -> list[pygame.Rect]:
+    """Union overlapping rects until none of the results overlap."""
+    merged: list[pygame.Rect] = []
+    for rect in rects:
+        if not rect.width or not rect.height:
+            continue
+        rect = rect.copy()
+        while (index := rect.collidelist(merged)) != -1:
+            rect.union_ip(merged.pop(index))
+        merged.append(rect)
+    return merged
+
+
+class DamageTracker:
+    """Remembers what was drawn where, to find the regions that changed.
+
+    Each frame, pass every drawable's current rect and a state token (its
+    surface, color, layer...). Rects of drawables that moved, changed,
+    appeared or disappeared are merged into the damage list.
+    """
+
+    def __init__(self):
+        self.full_redraw = True
+        self._drawn: dict[int, tuple] = {}
+
+    def invalidate(self) -> None:
+        """Damage everything on the next frame, e.g. after a new background."""
+        self.full_redraw = True
+
+    def damage(
+        self, drawn: dict[int, tuple[pygame.Rect, object]], bounds: pygame.Rect
+    ) -> list[pygame.Rect]:
+        """Record `drawn` (id -> (rect, token)) and get the merged damage."""
+        previous, self._drawn = self._drawn, drawn
+        if self.full_redraw:
+            self.full_redraw = False
+            return [bounds.copy()]
+
+        damaged = []
+        for key, state in drawn.items():
+            old = previous.pop(key, None)
+            if old != state:
+                damaged.append(state[0])
+                if old is not None:
+                    damaged.append(old[0])
+        damaged.extend(old[0] for old in previous.values())
+        return [rect.clip(bounds) for rect in merge_rects(damaged)]
+
+
+def _redraw_damage(
+    target: Surface,
+    background: Surface,
+    damage: list[pygame.Rect],
+    layers: list[tuple[list[pygame.Rect], list]],
+    draw,
+) -> None:
+    """Restore the background under each damaged area and redraw into it."""
+    clip = target.get_clip()
+    for area in damage:
+        target.set_clip(area)
+        target.blit(background, area, area)
+        for rects, items in layers:
+            for index in area.collidelistall(rects):
+                draw(items[index], rects[index])
+    target.set_clip(clip)
 
 
 class RenderSurfaceComponent:
-    def __init__(self, surface: Surface):
+    """Surface drawn at the entity's position.
+
+    Attributes:
+        surface: Surface to draw
+        layer: Draw order; higher layers are drawn on top of lower ones
+        static: Promise that the entity never moves and its surface keeps its
+            size, so camera culling can index it once in a spatial grid
+    """
+
+    def __init__(self, surface: Surface, layer: int = 0, static: bool = False):
         self.surface = surface
+        self.static = static
+        self._layer = layer
+
+    @property
+    def layer(self) -> int:
+        return self._layer
+
+    @layer.setter
+    def layer(self, value: int):
+        global layer_generation
+        if value != self._layer:
+            self._layer = value
+            layer_generation += 1
 
     @classmethod
     def from_rect(cls, rect: pygame.Rect, color: tuple = (255, 255, 255)):
@@ -26,13 +127,26 @@ class RenderSurfaceComponent:
         return cls(surface)
 
     @classmethod
-    def from_image(cls, image_path: str, transparent_pixels: bool = False):
-        image = pygame.image.load(image_path)
-        if transparent_pixels:
-            image = image.convert_alpha()
-            return cls(image)
-        image = image.convert()
-        return cls(image)
+    def from_image(
+        cls,
+        image_path: str,
+        transparent_pixels: bool = False,
+        owner: Optional[Hashable] = None,
+        shared: bool = True,
+    ):
+        """Build a component from an image, through `default_asset_cache`.
+
+        The surface is shared with every other load of the same image, so
+        don't draw onto it. With `shared=False`, the component gets its own
+        copy instead; without an `owner`, the cache then keeps no reference
+        to the image.
+        """
+        surface = default_asset_cache.load(image_path, transparent_pixels, owner)
+        if shared:
+            return cls(surface)
+        if owner is None:
+            default_asset_cache.release(image_path, transparent_pixels)
+        return cls(surface.copy())
 
     def scale(self, factor: float) -> Self:
         new_size = (
@@ -51,6 +165,26 @@ class RectSpriteComponent:
 
 
 class RenderRectProcessor(Processor):
+    """Draws RectSpriteComponents centered on their entity's position.
+
+    Args:
+        background: Enables dirty-rect mode. Only areas where a rect moved,
+            changed color, appeared or disappeared are restored from the
+            background and redrawn; they are kept in `dirty_rects` (and
+            returned by `process`) for `pygame.display.update`.
+    """
+
+    def __init__(self, background: Optional[Surface] = None):
+        super().__init__()
+        self.background = background
+        self.dirty_rects: list[pygame.Rect] = []
+        self._trackers: dict[Surface, DamageTracker] = {}
+
+    def invalidate(self) -> None:
+        """Redraw everything on the next frame."""
+        for tracker in self._trackers.values():
+            tracker.invalidate()
+
     def process(self, dt):
         for entity, (position, rect_sprite) in esper.get_components(
             PositionComponent, RectSpriteComponent
@@ -58,17 +192,284 @@ class RenderRectProcessor(Processor):
             rect_sprite.rect.centerx = position.x
             rect_sprite.rect.centery = position.y
 
+        if self.background is None:
+            for entity, draw_rect in esper.get_component(RectSpriteComponent):
+                pygame.draw.rect(draw_rect.surface, draw_rect.color, draw_rect.rect)
+            return None
+
+        targets: dict[Surface, list[RectSpriteComponent]] = {}
         for entity, draw_rect in esper.get_component(RectSpriteComponent):
-            pygame.draw.rect(draw_rect.surface, draw_rect.color, draw_rect.rect)
+            targets.setdefault(draw_rect.surface, []).append(draw_rect)
+
+        self.dirty_rects = []
+        for target, sprites in targets.items():
+            tracker = self._trackers.setdefault(target, DamageTracker())
+            rects = [sprite.rect.copy() for sprite in sprites]
+            drawn = {
+                id(sprite): (rect, tuple(sprite.color))
+                for sprite, rect in zip(sprites, rects)
+            }
+            damage = tracker.damage(drawn, target.get_rect())
+            _redraw_damage(
+                target,
+                self.background,
+                damage,
+                [(rects, sprites)],
+                lambda sprite, rect: pygame.draw.rect(target, sprite.color, rect),
+            )
+            self.dirty_rects.extend(damage)
+
+        # Targets whose last sprite went away still need it erased
+        for target in [target for target in self._trackers if target not in targets]:
+            damage = self._trackers.pop(target).damage({}, target.get_rect())
+            _redraw_damage(target, self.background, damage, [], None)
+            self.dirty_rects.extend(damage)
+        return self.dirty_rects
 
 
 class RenderSurfaceProcessor(Processor):
-    def __init__(self, screen: Surface):
+    """Draws RenderSurfaceComponents layer by layer.
+
+    Renderables are bucketed by layer, and each layer is drawn with a single
+    `Surface.blits` call. Buckets are only rebuilt when a PositionComponent
+    or RenderSurfaceComponent is added or removed (see `gamelib.ecs.changes`)
+    or a layer changes; new layers are inserted into the sorted layer list
+    instead of re-sorting it. Within a layer, draw order follows esper's
+    query order.
+
+    With a `camera`, world positions are transformed into the viewport and
+    sprites outside it are culled. Sprites marked `static` are kept in a
+    spatial grid, so off-screen static sprites aren't even visited; moving
+    sprites are tested against the viewport each frame.
+
+    With a `background`, the processor runs in dirty-rect mode: only areas
+    where a sprite moved, changed, appeared or disappeared are restored from
+    the background and redrawn. Overlapping damage is merged, and the result
+    is kept in `dirty_rects` (and returned by `process`) for
+    `pygame.display.update`. Call `invalidate` after drawing anything else
+    onto the screen.
+
+    Attributes:
+        screen: Surface drawn onto
+        background: Image behind the sprites, or None to draw every sprite
+            every frame
+        camera: Viewport to draw through, or None to draw world coordinates
+            as screen coordinates
+        layers: Layers in use, in draw order
+        dirty_rects: Areas redrawn by the last dirty-rect frame
+        visible_count: Sprites drawn (or considered for drawing) last frame
+    """
+
+    def __init__(
+        self,
+        screen: Surface,
+        background: Optional[Surface] = None,
+        camera: Optional[CameraComponent] = None,
+        cell_size: int = 128,
+    ):
         super().__init__()
         self.screen = screen
+        self.background = background
+        self.camera = camera
+        self.dirty_rects: list[pygame.Rect] = []
+        self.visible_count = 0
+        self.layers: list[int] = []
+        self._damage = DamageTracker()
+        self._buckets: dict[int, list[T_Renderable]] = {}
+        self._dynamic: dict[int, list[T_Renderable]] = {}
+        self._static: dict[int, SpatialGrid] = {}
+        self._static_entries: dict[int, tuple[int, T_Renderable]] = {}
+        self._order: dict[int, int] = {}
+        self._cell_size = cell_size
+        self._scaled: dict[int, tuple[Surface, Surface]] = {}
+        self._scaled_zoom = 1.0
+        self._count = 0
+        self._seen: Optional[tuple[int, int]] = None
 
     def process(self, dt):
-        for entity, (position, surface) in esper.get_components(
-            PositionComponent, RenderSurfaceComponent
-        ):
-            self.screen.blit(surface.surface, (position.x, position.y))
+        seen = (
+            generation(PositionComponent, RenderSurfaceComponent),
+            layer_generation,
+        )
+        if seen != self._seen:
+            self._seen = seen
+            self._rebucket(
+                esper.get_components(PositionComponent, RenderSurfaceComponent)
+            )
+
+        if self.camera is None and self.background is None:
+            blits = self.screen.blits
+            for layer in self.layers:
+                blits(
+                    (
+                        (renderable.surface, (position.x, position.y))
+                        for renderable, position in self._buckets[layer]
+                    ),
+                    doreturn=False,
+                )
+            self.visible_count = self._count
+            return None
+
+        layers = self._visible_layers()
+        self.visible_count = sum(len(sprites) for _, sprites in layers)
+        if self.background is not None:
+            self.dirty_rects = self._draw_dirty(layers)
+            return self.dirty_rects
+
+        blits = self.screen.blits
+        for layer, sprites in layers:
+            blits(
+                ((surface, pos) for _, surface, pos in sprites),
+                doreturn=False,
+            )
+        return None
+
+    @property
+    def entity_count(self) -> int:
+        """Number of renderables, for ProcessorProfiler."""
+        return self._count
+
+    def invalidate(self) -> None:
+        """Redraw the whole screen on the next frame."""
+        self._damage.invalidate()
+
+    def _visible_layers(self) -> list[tuple[int, list[tuple]]]:
+        """Get (layer, [(renderable, surface, screen_pos)]) in draw order."""
+        camera = self.camera
+        if camera is None:
+            return [
+                (
+                    layer,
+                    [
+                        (renderable, renderable.surface, (position.x, position.y))
+                        for renderable, position in self._buckets[layer]
+                    ],
+                )
+                for layer in self.layers
+            ]
+
+        view = camera.view_rect
+        cam_x, cam_y, zoom = camera.x, camera.y, camera.zoom
+        if zoom != self._scaled_zoom:
+            self._scaled.clear()
+            self._scaled_zoom = zoom
+
+        layers = []
+        for layer in self.layers:
+            visible = [
+                (renderable, position)
+                for renderable, position in self._dynamic.get(layer, ())
+                if view.colliderect(
+                    (position.x, position.y, *renderable.surface.get_size())
+                )
+            ]
+            grid = self._static.get(layer)
+            if grid is not None:
+                visible.extend(
+                    item
+                    for key, item in grid.query(view)
+                    if view.colliderect(
+                        (item[1].x, item[1].y, *item[0].surface.get_size())
+                    )
+                )
+                order = self._order
+                visible.sort(key=lambda item: order[id(item[0])])
+
+            sprites = []
+            for renderable, position in visible:
+                surface = renderable.surface
+                if zoom != 1:
+                    surface = self._zoomed(surface, zoom)
+                pos = ((position.x - cam_x) * zoom, (position.y - cam_y) * zoom)
+                sprites.append((renderable, surface, pos))
+            layers.append((layer, sprites))
+        return layers
+
+    def _zoomed(self, surface: Surface, zoom: float) -> Surface:
+        entry = self._scaled.get(id(surface))
+        if entry is None or entry[0] is not surface:
+            width, height = surface.get_size()
+            size = (max(1, round(width * zoom)), max(1, round(height * zoom)))
+            entry = self._scaled[id(surface)] = (
+                surface,
+                pygame.transform.scale(surface, size),
+            )
+        return entry[1]
+
+    def _draw_dirty(self, layers: list[tuple[int, list[tuple]]]) -> list[pygame.Rect]:
+        drawn = {}
+        redraw = []
+        for layer, sprites in layers:
+            rects = []
+            for renderable, surface, pos in sprites:
+                rect = surface.get_rect(topleft=pos)
+                rects.append(rect)
+                drawn[id(renderable)] = (rect, surface, layer)
+            redraw.append((rects, sprites))
+
+        damage = self._damage.damage(drawn, self.screen.get_rect())
+        _redraw_damage(
+            self.screen,
+            self.background,
+            damage,
+            redraw,
+            lambda sprite, rect: self.screen.blit(sprite[1], rect),
+        )
+        return damage
+
+    def _rebucket(self, renderables) -> None:
+        buckets: dict[int, list] = {}
+        dynamic: dict[int, list] = {}
+        static: dict[int, tuple[int, T_Renderable]] = {}
+        order: dict[int, int] = {}
+        for index, (entity, (position, renderable)) in enumerate(renderables):
+            layer = renderable.layer
+            bucket = buckets.get(layer)
+            if bucket is None:
+                bucket = buckets[layer] = []
+                if layer not in self._buckets:
+                    insort(self.layers, layer)
+            bucket.append((renderable, position))
+            order[id(renderable)] = index
+            if renderable.static:
+                static[id(renderable)] = layer, (renderable, position)
+            else:
+                dynamic.setdefault(layer, []).append((renderable, position))
+
+        # Update the static grids incrementally: drop what changed, then
+        # index what is new
+        previous = self._static_entries
+        for key, entry in previous.items():
+            if not _same_static_entry(static.get(key), entry):
+                grid = self._static[entry[0]]
+                grid.remove(key)
+                if not len(grid):
+                    del self._static[entry[0]]
+        for key, entry in static.items():
+            if not _same_static_entry(previous.get(key), entry):
+                layer, (renderable, position) = entry
+                grid = self._static.get(layer)
+                if grid is None:
+                    grid = self._static[layer] = SpatialGrid(self._cell_size)
+                rect = renderable.surface.get_rect(topleft=(position.x, position.y))
+                grid.insert(key, entry[1], rect)
+
+        if len(self.layers) != len(buckets):
+            self.layers = [layer for layer in self.layers if layer in buckets]
+        self._buckets = buckets
+        self._dynamic = dynamic
+        self._static_entries = static
+        self._order = order
+        self._count = len(renderables)
+
+
+def _same_static_entry(a: Optional[tuple], b: Optional[tuple]) -> bool:
+    # Entries are keyed by id(), so compare the objects too in case an id
+    # was reused by a new component
+    return (
+        a is not None
+        and b is not None
+        and a[0] == b[0]
+        and a[1][0] is b[1][0]
+        and a[1][1] is b[1][1]
+    )
@@ -0,0 +1,268 @@
+from typing import Iterable, Optional, Tuple
+
+import esper
+from esper import Processor
+
+from gamelib.ecs.changes import ChangeTracker
+from gamelib.ecs.geometry import PositionComponent, VelocityComponent
+
+try:
+    import numpy as np
+except ImportError as exc:  # pragma: no cover - depends on the environment
+    raise ImportError(
+        "The structure-of-arrays motion backend requires numpy. "
+        "Install it with `pip install numpy`."
+    ) from exc
+
+
+class MotionArrays:
+    """Structure-of-arrays storage for positions and velocities.
+
+    Every mover owns a slot in contiguous NumPy arrays, so a whole frame of
+    movement integrates in one vectorized step. Slots stay dense: removing a
+    mover moves the last slot into the hole.
+
+    Attributes:
+        positions: (capacity, 2) float array of x, y
+        velocities: (capacity, 2) float array of base speeds
+        multipliers: (capacity,) float array of speed multipliers
+        count: Number of slots in use
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.positions = np.zeros((capacity, 2))
+        self.velocities = np.zeros((capacity, 2))
+        self.multipliers = np.ones(capacity)
+        self.count = 0
+        self.slots: dict[int, int] = {}
+        self._entities: list[int] = []
+        self._views: list[
+            Tuple["ArrayPositionComponent", "ArrayVelocityComponent"]
+        ] = []
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, entity: int) -> bool:
+        return entity in self.slots
+
+    def spawn(
+        self,
+        x: float,
+        y: float,
+        base_speed: Tuple[float, float] = (0, 0),
+        multiplier: float = 1,
+        *components,
+    ) -> int:
+        """Create an esper entity whose position and velocity live here.
+
+        Extra `components` are added to the entity as usual.
+        """
+        entity = esper.create_entity(*components)
+        self.attach(entity, x, y, base_speed, multiplier)
+        return entity
+
+    def attach(
+        self,
+        entity: int,
+        x: float,
+        y: float,
+        base_speed: Tuple[float, float] = (0, 0),
+        multiplier: float = 1,
+    ) -> None:
+        """Give an existing entity array-backed position and velocity views.
+
+        The views are registered as PositionComponent and VelocityComponent,
+        so existing queries and processors keep working unchanged.
+        """
+        if entity in self.slots:
+            self.detach(entity)
+        slot = self.count
+        if slot == len(self.positions):
+            self._grow()
+        self.positions[slot] = x, y
+        self.velocities[slot] = base_speed
+        self.multipliers[slot] = multiplier
+        position = ArrayPositionComponent(self, slot)
+        velocity = ArrayVelocityComponent(self, slot)
+        self.slots[entity] = slot
+        self._entities.append(entity)
+        self._views.append((position, velocity))
+        self.count += 1
+        esper.add_component(entity, position, type_alias=PositionComponent)
+        esper.add_component(entity, velocity, type_alias=VelocityComponent)
+
+    def detach(self, entity: int) -> None:
+        """Release the entity's slot. Its esper components are left alone."""
+        slot = self.slots.pop(entity)
+        position, velocity = self._views[slot]
+        position._slot = velocity._slot = None
+        last = self.count - 1
+        if slot != last:
+            # Move the last mover into the freed slot to keep arrays dense
+            self.positions[slot] = self.positions[last]
+            self.velocities[slot] = self.velocities[last]
+            self.multipliers[slot] = self.multipliers[last]
+            moved_entity = self._entities[last]
+            moved_views = self._views[last]
+            moved_views[0]._slot = moved_views[1]._slot = slot
+            self._entities[slot] = moved_entity
+            self._views[slot] = moved_views
+            self.slots[moved_entity] = slot
+        self._entities.pop()
+        self._views.pop()
+        self.count = last
+
+    def sync(self, entities: Optional[Iterable[int]] = None) -> None:
+        """Detach movers whose entity was deleted or lost its array views.
+
+        Only `entities` are checked when given, e.g. the ones a
+        ChangeTracker reported.
+        """
+        slots = self.slots
+        if entities is None:
+            entities = list(slots)
+        components = esper._entities
+        stale = [
+            entity
+            for entity in entities
+            if entity in slots
+            and components.get(entity, {}).get(PositionComponent)
+            is not self._views[slots[entity]][0]
+        ]
+        for entity in stale:
+            self.detach(entity)
+
+    def integrate(self, step: float) -> None:
+        """Advance every mover by `velocity * multiplier * step`."""
+        count = self.count
+        if not count:
+            return
+        factor = self.multipliers[:count, None] * step
+        self.positions[:count] += self.velocities[:count] * factor
+
+    def _grow(self) -> None:
+        capacity = len(self.positions) * 2 or 1
+        for name in ("positions", "velocities"):
+            grown = np.zeros((capacity, 2))
+            grown[: self.count] = getattr(self, name)[: self.count]
+            setattr(self, name, grown)
+        multipliers = np.ones(capacity)
+        multipliers[: self.count] = self.multipliers[: self.count]
+        self.multipliers = multipliers
+
+
+class ArrayPositionComponent(PositionComponent):
+    """PositionComponent view onto a MotionArrays slot."""
+
+    def __init__(self, store: MotionArrays, slot: int):
+        self._store = store
+        self._slot = slot
+
+    @property
+    def x(self) -> float:
+        return self._store.positions.item(self._slot, 0)
+
+    @x.setter
+    def x(self, value: float):
+        self._store.positions[self._slot, 0] = value
+
+    @property
+    def y(self) -> float:
+        return self._store.positions.item(self._slot, 1)
+
+    @y.setter
+    def y(self, value: float):
+        self._store.positions[self._slot, 1] = value
+
+
+class ArrayVelocityComponent(VelocityComponent):
+    """VelocityComponent view onto a MotionArrays slot."""
+
+    def __init__(self, store: MotionArrays, slot: int):
+        self._store = store
+        self._slot = slot
+
+    @property
+    def base_speed(self) -> Tuple[float, float]:
+        velocity = self._store.velocities
+        return velocity.item(self._slot, 0), velocity.item(self._slot, 1)
+
+    @base_speed.setter
+    def base_speed(self, value: Tuple[float, float]):
+        self._store.velocities[self._slot] = value
+
+    @property
+    def multiplier(self) -> float:
+        return self._store.multipliers.item(self._slot)
+
+    @multiplier.setter
+    def multiplier(self, value: float):
+        self._store.multipliers[self._slot] = value
+
+
+class VectorizedMoveProcessor(Processor):
+    """Drop-in replacement for MoveProcessor backed by MotionArrays.
+
+    Entities attached to `store` are integrated in one vectorized step;
+    plain PositionComponent/VelocityComponent entities are still moved one by
+    one, like MoveProcessor does. Use it instead of MoveProcessor, not next to
+    it, or array-backed entities move twice.
+
+    Added and removed movers are picked up through a ChangeTracker, so a
+    frame where nothing was added or removed costs only the integration.
+
+    Usage:
+        motion = MotionArrays()
+        esper.add_processor(VectorizedMoveProcessor(motion, use_dt=True))
+        bullet = motion.spawn(x, y, (0, -300), 1, RenderSurfaceComponent(image))
+    """
+
+    def __init__(self, store: MotionArrays, use_dt: bool = False):
+        super().__init__()
+        self.store = store
+        self.use_dt = use_dt
+        self._changes = ChangeTracker(VelocityComponent, PositionComponent)
+        self._scalar: dict[int, Tuple[VelocityComponent, PositionComponent]] = {}
+
+    @property
+    def entity_count(self) -> int:
+        """Number of movers, for ProcessorProfiler."""
+        return len(self.store) + len(self._scalar)
+
+    def process(self, dt):
+        step = dt if self.use_dt else 1
+        changed = self._changes.take()
+        if changed is None:
+            self.store.sync()
+            self._scalar = {
+                entity: (velocity, position)
+                for entity, (velocity, position) in esper.get_components(
+                    VelocityComponent, PositionComponent
+                )
+                if not isinstance(position, ArrayPositionComponent)
+            }
+        elif changed:
+            self.store.sync(changed)
+            self._rescan(changed)
+
+        self.store.integrate(step)
+        for velocity, position in self._scalar.values():
+            factor = velocity.multiplier * step
+            position.x += velocity.base_speed[0] * factor
+            position.y += velocity.base_speed[1] * factor
+
+    def _rescan(self, entities: set[int]) -> None:
+        components = esper._entities
+        for entity in entities:
+            found = components.get(entity, {})
+            velocity = found.get(VelocityComponent)
+            position = found.get(PositionComponent)
+            if (
+                velocity is None
+                or position is None
+                or isinstance(position, ArrayPositionComponent)
+            ):
+                self._scalar.pop(entity, None)
+            else:
+                self._scalar[entity] = (velocity, position)
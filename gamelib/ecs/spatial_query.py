@@ -0,0 +1,208 @@
+from dataclasses import dataclass
+from math import ceil, floor, hypot, inf
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Tuple, Union
+
+import pygame
+
+from gamelib.ecs.broadphase import BroadPhase, SpatialHashBroadPhase, T_ColliderEntry
+from gamelib.ecs.layers import layer_bits
+
+if TYPE_CHECKING:
+    from gamelib.ecs.collision import ColliderComponent, CollisionProcessor
+
+T_Point = Tuple[float, float]
+
+
+@dataclass
+class RaycastHit:
+    entity: int
+    collider: "ColliderComponent"
+    point: T_Point
+    distance: float
+
+
+class SpatialQuery:
+    """Point, region and ray queries against a CollisionProcessor's index.
+
+    Queries run against the broad phase and static index the processor
+    already maintains, so grid-backed processors answer them by visiting only
+    the cells involved. Results reflect collider rects as of the processor's
+    last `process` call.
+
+    Every query takes an optional `layers` collection of tags; only colliders
+    carrying at least one of them are returned.
+
+    Usage:
+        processor = SpatialHashProcessor(cell_size=32)
+        queries = SpatialQuery(processor)
+
+        clicked = queries.query_point(pygame.mouse.get_pos())
+        hit = queries.raycast(enemy_eye, player_center, layers={"wall"})
+        if hit is None:
+            print("Player in sight")
+    """
+
+    def __init__(self, processor: "CollisionProcessor"):
+        self.processor = processor
+
+    @property
+    def indices(self) -> Tuple[BroadPhase, BroadPhase]:
+        return self.processor.broad_phase, self.processor.static_index
+
+    def query_rect(
+        self, rect: pygame.Rect, layers: Optional[Iterable[str]] = None
+    ) -> List[T_ColliderEntry]:
+        """Get every (entity, collider) overlapping `rect`."""
+        rect = pygame.Rect(rect)
+        layer_mask = self._layer_mask(layers)
+        return [
+            entry
+            for index in self.indices
+            for entry in index.query_rect(rect, layer_mask)
+        ]
+
+    def query_point(
+        self, point: T_Point, layers: Optional[Iterable[str]] = None
+    ) -> List[T_ColliderEntry]:
+        """Get every (entity, collider) containing `point`."""
+        # floor, not int: -0.5 lies in the pixel at -1
+        pixel = pygame.Rect(floor(point[0]), floor(point[1]), 1, 1)
+        return self.query_rect(pixel, layers)
+
+    def query_circle(
+        self,
+        center: T_Point,
+        radius: float,
+        layers: Optional[Iterable[str]] = None,
+    ) -> List[T_ColliderEntry]:
+        """Get every (entity, collider) whose rect intersects the circle."""
+        cx, cy = center
+        size = ceil(2 * radius) + 2
+        bounds = pygame.Rect(floor(cx - radius), floor(cy - radius), size, size)
+        radius_sq = radius * radius
+        hits = []
+        for entity, collider in self.query_rect(bounds, layers):
+            rect = collider.rect
+            # Distance from the center to the closest point of the rect
+            dx = cx - max(rect.left, min(cx, rect.right))
+            dy = cy - max(rect.top, min(cy, rect.bottom))
+            if dx * dx + dy * dy <= radius_sq:
+                hits.append((entity, collider))
+        return hits
+
+    def raycast(
+        self,
+        start: T_Point,
+        end: T_Point,
+        layers: Optional[Iterable[str]] = None,
+        all_hits: bool = False,
+    ) -> Union[Optional[RaycastHit], List[RaycastHit]]:
+        """Cast a segment from `start` to `end`.
+
+        Grid-backed indices are walked cell by cell along the segment
+        (Amanatides-Woo DDA), stopping at the first hit unless `all_hits` is
+        set; other indices are queried with the segment's bounding box.
+
+        Returns:
+            The closest RaycastHit (or None), or with `all_hits` every hit
+            sorted by distance
+        """
+        layer_mask = self._layer_mask(layers)
+        hits: dict[int, RaycastHit] = {}
+        for index in self.indices:
+            if isinstance(index, SpatialHashBroadPhase):
+                candidates = self._walk_grid(
+                    index, start, end, layer_mask, all_hits, hits
+                )
+            else:
+                bounds = pygame.Rect(
+                    floor(min(start[0], end[0])),
+                    floor(min(start[1], end[1])),
+                    floor(abs(end[0] - start[0])) + 2,
+                    floor(abs(end[1] - start[1])) + 2,
+                )
+                candidates = index.query_rect(bounds, layer_mask)
+            for entity, collider in candidates:
+                self._clip(entity, collider, start, end, hits)
+
+        ordered = sorted(hits.values(), key=lambda hit: hit.distance)
+        if all_hits:
+            return ordered
+        return ordered[0] if ordered else None
+
+    @staticmethod
+    def _layer_mask(layers: Optional[Iterable[str]]) -> Optional[int]:
+        return None if layers is None else layer_bits(layers)
+
+    @staticmethod
+    def _clip(
+        entity: int,
+        collider: "ColliderComponent",
+        start: T_Point,
+        end: T_Point,
+        hits: dict[int, RaycastHit],
+    ) -> None:
+        if entity in hits:
+            return
+        clipped = collider.rect.clipline(start, end)
+        if not clipped:
+            return
+        point = clipped[0]
+        distance = hypot(point[0] - start[0], point[1] - start[1])
+        hits[entity] = RaycastHit(entity, collider, point, distance)
+
+    def _walk_grid(
+        self,
+        index: SpatialHashBroadPhase,
+        start: T_Point,
+        end: T_Point,
+        layer_mask: Optional[int],
+        all_hits: bool,
+        hits: dict[int, RaycastHit],
+    ) -> Iterator[T_ColliderEntry]:
+        """Yield colliders from the cells the segment crosses, in order."""
+        grids = [
+            grid
+            for signature, grid in index.grids.items()
+            if layer_mask is None or signature[0] & layer_mask
+        ]
+        if not grids:
+            return
+
+        size = index.cell_size
+        x0, y0 = start
+        dx, dy = end[0] - x0, end[1] - y0
+        length = hypot(dx, dy)
+        cx, cy = floor(x0 / size), floor(y0 / size)
+        end_cx, end_cy = floor(end[0] / size), floor(end[1] / size)
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+        # Ray parameter t (0..1) at which the next vertical / horizontal cell
+        # border is crossed, and how much t advances per cell
+        t_max_x = ((cx + (dx > 0)) * size - x0) / dx if dx else inf
+        t_max_y = ((cy + (dy > 0)) * size - y0) / dy if dy else inf
+        t_delta_x = size / abs(dx) if dx else inf
+        t_delta_y = size / abs(dy) if dy else inf
+        t_enter = 0.0
+
+        while True:
+            if not all_hits and hits:
+                # Cells are visited in order, so once the closest hit lies
+                # before this cell nothing further along can beat it
+                closest = min(hit.distance for hit in hits.values())
+                if closest <= t_enter * length:
+                    return
+            for grid in grids:
+                cell = grid.cells.get((cx, cy))
+                if cell:
+                    yield from cell.items()
+            if (cx, cy) == (end_cx, end_cy) or t_enter > 1:
+                return
+            if t_max_x < t_max_y:
+                t_enter = t_max_x
+                t_max_x += t_delta_x
+                cx += step_x
+            else:
+                t_enter = t_max_y
+                t_max_y += t_delta_y
+                cy += step_y
@@ -1,19 +1,289 @@
+from collections import defaultdict
 from collections.abc import Callable
+from functools import partial
+from heapq import heappop, heappush
+from itertools import count
+from typing import Optional
 
 import esper
 
+from gamelib.ecs.changes import ChangeTracker
+
+
+class TimerHandle:
+    """A scheduled callback, returned by TimerScheduler.schedule.
+
+    Attributes:
+        callback: Called with no arguments when the timer fires
+        interval: Repeat period in seconds, or None for a one-shot timer
+        entity: Entity the timer belongs to, or None
+        deadline: Scheduler time at which the timer fires next
+    """
+
+    __slots__ = (
+        "callback",
+        "interval",
+        "entity",
+        "deadline",
+        "finished",
+        "_scheduler",
+        "_remaining",
+        "_version",
+    )
+
+    def __init__(
+        self,
+        scheduler: "TimerScheduler",
+        deadline: float,
+        callback: Callable,
+        interval: Optional[float],
+        entity: Optional[int],
+    ):
+        self.callback = callback
+        self.interval = interval
+        self.entity = entity
+        self.deadline = deadline
+        self.finished = False
+        self._scheduler = scheduler
+        self._remaining: Optional[float] = None
+        # Bumped whenever the heap entry is superseded; stale entries are
+        # skipped when popped instead of being searched for and removed
+        self._version = 0
+
+    @property
+    def paused(self) -> bool:
+        return self._remaining is not None
+
+    @property
+    def active(self) -> bool:
+        return not self.finished and not self.paused
+
+    @property
+    def remaining(self) -> float:
+        """Seconds left until the timer fires next."""
+        if self._remaining is not None:
+            return self._remaining
+        if self.finished:
+            return 0.0
+        return max(0.0, self.deadline - self._scheduler.now)
+
+    def cancel(self) -> None:
+        """Stop the timer for good. Cancelling twice is harmless."""
+        if not self.finished:
+            self._version += 1
+            self._scheduler._finish(self)
+
+    def pause(self) -> None:
+        if self.active:
+            self._remaining = self.remaining
+            self._version += 1
+
+    def resume(self) -> None:
+        if self.paused and not self.finished:
+            remaining, self._remaining = self._remaining, None
+            self._scheduler._push(self, self._scheduler.now + remaining)
+
+    def reset(self, remaining: float) -> None:
+        """Fire in `remaining` seconds instead, keeping the pause state."""
+        if self.finished:
+            return
+        if self.paused:
+            self._remaining = remaining
+        else:
+            self._version += 1
+            self._scheduler._push(self, self._scheduler.now + remaining)
+
+
+class TimerScheduler:
+    """Min-heap of timers keyed on absolute expiry time.
+
+    Advancing the clock only touches timers that expire, so tens of
+    thousands of pending timers cost nothing per frame. Cancelled and paused
+    timers stay in the heap until their old deadline comes up and are then
+    dropped.
+
+    Attributes:
+        now: Scheduler time in seconds, advanced by `advance`
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self._heap: list[tuple[float, int, int, TimerHandle]] = []
+        self._order = count()
+        self._by_entity: defaultdict[int, set[TimerHandle]] = defaultdict(set)
+
+    def schedule(
+        self,
+        delay: float,
+        callback: Callable,
+        repeat: bool = False,
+        entity: Optional[int] = None,
+    ) -> TimerHandle:
+        """Call `callback` after `delay` seconds (and every `delay` if repeating).
+
+        Timers bound to an `entity` are dropped once the entity is deleted.
+        """
+        if repeat and delay <= 0:
+            raise ValueError("Repeating timers need a positive delay")
+        handle = TimerHandle(
+            self, self.now + delay, callback, delay if repeat else None, entity
+        )
+        if entity is not None:
+            self._by_entity[entity].add(handle)
+        self._push(handle, handle.deadline)
+        return handle
+
+    def timers_for(self, entity: int) -> list[TimerHandle]:
+        return list(self._by_entity.get(entity, ()))
+
+    def cancel_entity(self, entity: int) -> None:
+        """Cancel every timer bound to `entity`."""
+        for handle in self._by_entity.pop(entity, ()):
+            handle._version += 1
+            handle.finished = True
+
+    def advance(self, dt: float) -> None:
+        """Move the clock forward by `dt` and fire every timer now due."""
+        self.now += dt
+        heap = self._heap
+        while heap and heap[0][0] <= self.now:
+            deadline, _, version, handle = heappop(heap)
+            if version != handle._version or handle.finished:
+                continue
+            if handle.entity is not None and not esper.entity_exists(handle.entity):
+                self.cancel_entity(handle.entity)
+                continue
+            if handle.interval is None:
+                self._finish(handle)
+            else:
+                # Reschedule from the old deadline so repeats don't drift
+                self._push(handle, deadline + handle.interval)
+            handle.callback()
+
+    def clear(self) -> None:
+        for _, _, _, handle in self._heap:
+            handle.finished = True
+        self._heap.clear()
+        self._by_entity.clear()
+
+    def _push(self, handle: TimerHandle, deadline: float) -> None:
+        handle.deadline = deadline
+        heappush(self._heap, (deadline, next(self._order), handle._version, handle))
+
+    def _finish(self, handle: TimerHandle) -> None:
+        handle.finished = True
+        if handle.entity is not None:
+            handles = self._by_entity.get(handle.entity)
+            if handles is not None:
+                handles.discard(handle)
+                if not handles:
+                    del self._by_entity[handle.entity]
+
 
 class TimerComponent:
+    """One-shot timer that removes itself from its entity once it fires.
+
+    Kept for simple cases; for repeating timers, several timers per entity
+    or cancellation, use `TimerProcessor.schedule` instead.
+    """
+
     def __init__(self, duration_s: float, callback: Callable):
         self.duration_s = duration_s
         self.callback = callback
-        self.elapsed_s = 0.0
+        self.handle: Optional[TimerHandle] = None
+        self._elapsed_s = 0.0
+
+    @property
+    def elapsed_s(self) -> float:
+        if self.handle is None:
+            return self._elapsed_s
+        return self.duration_s - self.handle.remaining
+
+    @elapsed_s.setter
+    def elapsed_s(self, value: float):
+        self._elapsed_s = value
+        if self.handle is not None:
+            self.handle.reset(self.duration_s - value)
 
 
 class TimerProcessor(esper.Processor):
+    """Fires scheduled timers and TimerComponents.
+
+    Timers live in a TimerScheduler heap, so each frame only pays for the
+    timers that expire. TimerComponents added or removed since the last
+    frame are found through a ChangeTracker; a removed TimerComponent is
+    cancelled and keeps its elapsed time if it's added again.
+
+    Attributes:
+        scheduler: Heap of pending timers
+        paused: While set, time stands still for every timer
+
+    Usage:
+        timers = esper.get_processor(TimerProcessor)
+        cooldown = timers.schedule(0.5, reload, entity=player)
+        spawner = timers.schedule(2.0, spawn_enemy, repeat=True)
+        ...
+        spawner.cancel()
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.scheduler = TimerScheduler()
+        self.paused = False
+        self._changes = ChangeTracker(TimerComponent)
+        self._timers: dict[int, TimerComponent] = {}
+
+    @property
+    def entity_count(self) -> int:
+        """Number of TimerComponents, for ProcessorProfiler."""
+        return len(self._timers)
+
+    def schedule(
+        self,
+        delay: float,
+        callback: Callable,
+        repeat: bool = False,
+        entity: Optional[int] = None,
+    ) -> TimerHandle:
+        return self.scheduler.schedule(delay, callback, repeat, entity)
+
+    def cancel_entity(self, entity: int) -> None:
+        self.scheduler.cancel_entity(entity)
+
     def process(self, dt: float):
-        for entity, timer in esper.get_component(TimerComponent):
-            timer.elapsed_s += dt
-            if timer.elapsed_s >= timer.duration_s:
-                timer.callback()
-                esper.remove_component(entity, TimerComponent)
+        if self.paused:
+            return
+        changed = self._changes.take()
+        if changed is None:
+            changed = set(self._timers)
+            changed.update(entity for entity, _ in esper.get_component(TimerComponent))
+        for entity in changed:
+            self._track(entity)
+        self.scheduler.advance(dt)
+
+    def _track(self, entity: int) -> None:
+        timer = esper._entities.get(entity, {}).get(TimerComponent)
+        old = self._timers.get(entity)
+        if timer is old:
+            return
+        if old is not None:
+            del self._timers[entity]
+            if old.handle is not None and old.handle._scheduler is self.scheduler:
+                old._elapsed_s = old.elapsed_s
+                old.handle.cancel()
+                old.handle = None
+        if timer is not None:
+            self._timers[entity] = timer
+            timer.handle = self.scheduler.schedule(
+                timer.duration_s - timer._elapsed_s,
+                partial(self._expire, entity, timer),
+                entity=entity,
+            )
+
+    @staticmethod
+    def _expire(entity: int, timer: TimerComponent) -> None:
+        if esper.try_component(entity, TimerComponent) is not timer:
+            return
+        timer.callback()
+        if esper.try_component(entity, TimerComponent) is timer:
+            esper.remove_component(entity, TimerComponent)
@@ -1,53 +1,106 @@
-from typing import Iterator, Tuple, Any
+from typing import Any, List, Tuple, Type
+
 import esper
 
+from gamelib.ecs.changes import generation
+
+T_SubclassQuery = List[Tuple[int, Tuple[Any, ...]]]
+
+# generation() when the registered types were last compared
+_seen = 0
+_is_subclass: dict[Tuple[type, type], bool] = {}
+_matching_types: dict[type, Tuple[type, ...]] = {}
+_registered_types: frozenset = frozenset()
+# Each query's result, with the generation of its matching types when built
+_query_cache: dict[Tuple[type, ...], Tuple[int, T_SubclassQuery]] = {}
+
+
+def _issubclass(registered_type: type, requested_type: type) -> bool:
+    key = (registered_type, requested_type)
+    try:
+        return _is_subclass[key]
+    except KeyError:
+        result = _is_subclass[key] = issubclass(registered_type, requested_type)
+        return result
+
+
+def _validate_cache() -> None:
+    global _seen, _registered_types
+    seen = generation()
+    if seen == _seen:
+        return
+    _seen = seen
+    if esper._components.keys() != _registered_types:
+        _registered_types = frozenset(esper._components.keys())
+        _matching_types.clear()
+        _query_cache.clear()
+
 
-def get_components_with_subclasses(
-    *component_types,
-) -> Iterator[Tuple[int, Tuple[Any, ...]]]:
+def matching_types(component_type: Type) -> Tuple[type, ...]:
+    """Get the registered component types that are `component_type` or a subclass."""
+    _validate_cache()
+    try:
+        return _matching_types[component_type]
+    except KeyError:
+        matches = tuple(
+            registered
+            for registered in _registered_types
+            if _issubclass(registered, component_type)
+        )
+        _matching_types[component_type] = matches
+        return matches
+
+
+def get_components_with_subclasses(*component_types) -> T_SubclassQuery:
     """
     Get entities with components, including subclasses of the specified types.
 
     This function wraps esper.get_components() to support querying for
     component subclasses without modifying the esper module.
 
+    Results are cached and rebuilt only after a component of a matching type
+    is added or removed (tracked by `gamelib.ecs.changes`), so repeated calls
+    in a steady world cost no more than iterating the matching entities.
+
+    Unlike esper.get_components, this returns a list rather than a generator,
+    and the list is shared between callers: do not modify it, and copy it
+    before adding or removing matching components while iterating.
+
     Args:
         *component_types: Component classes to search for (including subclasses)
 
-    Yields:
-        Tuples of (entity_id, component_tuple) where components match the
+    Returns:
+        List of (entity_id, component_tuple) where components match the
         requested types or their subclasses
     """
-    # Build a set of all component types that match (including subclasses)
-    matching_types = set()
-    for registered_type in esper._components.keys():
-        if any(issubclass(registered_type, comp_type) for comp_type in component_types):
-            matching_types.add(registered_type)
-
-    # For each entity, check if it has matching components
-    seen_entities = set()
-    for comp_type in matching_types:
-        # Get entities that have this specific component type
-        if comp_type in esper._components:
-            for entity in esper._components[comp_type]:
-                if entity not in seen_entities:
-                    # Check if entity has all required component types (or subclasses)
-                    entity_components = []
-                    has_all = True
-
-                    for requested_type in component_types:
-                        found = None
-                        # Look for a component that is a subclass of requested_type
-                        for ent_comp_type in esper._entities[entity]:
-                            if issubclass(ent_comp_type, requested_type):
-                                found = esper._entities[entity][ent_comp_type]
-                                break
-
-                        if found is None:
-                            has_all = False
-                            break
-                        entity_components.append(found)
-
-                    if has_all:
-                        seen_entities.add(entity)
-                        yield (entity, tuple(entity_components))
+    _validate_cache()
+    matches = [matching_types(requested) for requested in component_types]
+    matched = [t for types in matches for t in types]
+    stamp = generation(*matched) if matched else 0
+    cached = _query_cache.get(component_types)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    results: T_SubclassQuery = []
+    if component_types:
+        # Entities need a match for every requested type, so candidates only
+        # come from types matching the first one
+        candidates = set()
+        for registered in matches[0]:
+            candidates.update(esper._components.get(registered, ()))
+
+        for entity in candidates:
+            entity_components = esper._entities[entity]
+            found = []
+            for requested_type in component_types:
+                for ent_comp_type, component in entity_components.items():
+                    if _issubclass(ent_comp_type, requested_type):
+                        found.append(component)
+                        break
+                else:
+                    break
+            else:
+                results.append((entity, tuple(found)))
+
+    _query_cache[component_types] = (stamp, results)
+    return results
@@ -1,9 +1,16 @@
+from .assets import AssetCache, default_asset_cache
 from .game_event import GameEvent
 from .game_mixer import GameMixer
+from .game_loop import FixedStepScene, interpolate, run_game
 from .scene_base import SceneBase
 
 __all__ = [
+    "AssetCache",
+    "default_asset_cache",
     "GameEvent",
     "GameMixer",
+    "FixedStepScene",
+    "interpolate",
+    "run_game",
     "SceneBase",
 ]
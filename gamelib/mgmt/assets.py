@@ -0,0 +1,203 @@
+import os
+from typing import Hashable, Iterable, Optional, Tuple
+
+import pygame
+
+T_AssetKey = Tuple[str, bool]
+
+
+class _Entry:
+    __slots__ = ("surface", "refs")
+
+    def __init__(self, surface: pygame.Surface):
+        self.surface = surface
+        # Reference count per owner
+        self.refs: dict[Hashable, int] = {}
+
+
+class AssetCache:
+    """Cache of loaded, display-converted images, shared by path.
+
+    Each image is decoded and converted once per (path, alpha) pair, however
+    many times it's loaded. Every `load` takes a reference on behalf of an
+    `owner`, typically the scene that needs the image; `release` drops one
+    reference and `unload` drops all of an owner's references, e.g. when the
+    scene ends. An image is forgotten once nothing references it. Loads
+    without an owner are held by None, until `release` is called without
+    an owner too or until `unload(None)`.
+
+    `pack` loads many small images into shared atlas pages instead, and
+    hands out subsurfaces of those pages. Later loads of a packed path
+    return the same subsurface.
+
+    Cached surfaces are shared, so do not draw into them; copy them first.
+    Loading needs a display mode to be set, as for Surface.convert.
+
+    Attributes:
+        decodes: Number of images read from disk so far
+
+    Usage:
+        enemy = default_asset_cache.load("enemy.png", owner=scene)
+        icons = default_asset_cache.pack(icon_paths, owner=scene)
+        # when leaving the scene
+        default_asset_cache.unload(scene)
+    """
+
+    def __init__(self) -> None:
+        self.decodes = 0
+        self._entries: dict[T_AssetKey, _Entry] = {}
+        self._owned: dict[Hashable, set[T_AssetKey]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(path: str, alpha: bool = True) -> T_AssetKey:
+        return os.path.abspath(path), alpha
+
+    def is_loaded(self, path: str, alpha: bool = True) -> bool:
+        return self.key(path, alpha) in self._entries
+
+    def refcount(self, path: str, alpha: bool = True) -> int:
+        entry = self._entries.get(self.key(path, alpha))
+        return sum(entry.refs.values()) if entry is not None else 0
+
+    def load(
+        self, path: str, alpha: bool = True, owner: Optional[Hashable] = None
+    ) -> pygame.Surface:
+        """Get the image at `path`, converted with convert_alpha or convert.
+
+        Decodes the file only if it isn't cached yet.
+        """
+        key = self.key(path, alpha)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _Entry(self._decode(path, alpha))
+        self._ref(key, entry, owner)
+        return entry.surface
+
+    def release(
+        self, path: str, alpha: bool = True, owner: Optional[Hashable] = None
+    ) -> None:
+        """Drop one of `owner`'s references to an image."""
+        key = self.key(path, alpha)
+        entry = self._entries.get(key)
+        if entry is None or owner not in entry.refs:
+            raise KeyError(f"{owner!r} holds no reference to {path}")
+        entry.refs[owner] -= 1
+        if not entry.refs[owner]:
+            del entry.refs[owner]
+            self._owned[owner].discard(key)
+            if not self._owned[owner]:
+                del self._owned[owner]
+            if not entry.refs:
+                del self._entries[key]
+
+    def unload(self, owner: Optional[Hashable]) -> int:
+        """Drop every reference held by `owner`.
+
+        Returns:
+            Number of images forgotten because nothing references them now
+        """
+        freed = 0
+        for key in self._owned.pop(owner, ()):
+            entry = self._entries[key]
+            del entry.refs[owner]
+            if not entry.refs:
+                del self._entries[key]
+                freed += 1
+        return freed
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._owned.clear()
+
+    def pack(
+        self,
+        paths: Iterable[str],
+        alpha: bool = True,
+        owner: Optional[Hashable] = None,
+        page_size: int = 1024,
+        padding: int = 1,
+    ) -> dict[str, pygame.Surface]:
+        """Load images into shared atlas pages.
+
+        Images that aren't cached yet are packed, tallest first, onto pages
+        of at most `page_size` x `page_size` pixels, with `padding` pixels
+        between them. Images already cached are not packed again.
+
+        Returns:
+            Each path mapped to its surface, a subsurface of a page for
+            packed images
+        """
+        paths = list(paths)
+        images = {}
+        for path in paths:
+            key = self.key(path, alpha)
+            if key not in self._entries and key not in images:
+                images[key] = self._decode_raw(path)
+        for key, (page, rect) in pack_atlas(images, alpha, page_size, padding).items():
+            self._entries[key] = _Entry(page.subsurface(rect))
+        return {path: self.load(path, alpha, owner) for path in paths}
+
+    def _ref(self, key: T_AssetKey, entry: _Entry, owner: Optional[Hashable]) -> None:
+        entry.refs[owner] = entry.refs.get(owner, 0) + 1
+        self._owned.setdefault(owner, set()).add(key)
+
+    def _decode_raw(self, path: str) -> pygame.Surface:
+        self.decodes += 1
+        return pygame.image.load(path)
+
+    def _decode(self, path: str, alpha: bool) -> pygame.Surface:
+        image = self._decode_raw(path)
+        return image.convert_alpha() if alpha else image.convert()
+
+
+def pack_atlas(
+    images: dict[Hashable, pygame.Surface],
+    alpha: bool = True,
+    page_size: int = 1024,
+    padding: int = 1,
+) -> dict[Hashable, Tuple[pygame.Surface, pygame.Rect]]:
+    """Pack images onto as few page surfaces as possible.
+
+    A shelf packer: images are placed tallest first in rows across a page,
+    starting a new row when one is full and a new page when rows run out.
+    Pages are trimmed to the area used.
+
+    Returns:
+        Each key mapped to its page and its rect on that page
+    """
+    placements: list[list[Tuple[Hashable, pygame.Rect]]] = []
+    x = y = shelf_height = 0
+    order = sorted(images, key=lambda key: images[key].get_height(), reverse=True)
+    for key in order:
+        width, height = images[key].get_size()
+        if width > page_size or height > page_size:
+            raise ValueError(
+                f"Image {key!r} of {width}x{height} doesn't fit a {page_size} page"
+            )
+        if x + width > page_size:
+            x, y, shelf_height = 0, y + shelf_height, 0
+        if not placements or y + height > page_size:
+            placements.append([])
+            x = y = shelf_height = 0
+        placements[-1].append((key, pygame.Rect(x, y, width, height)))
+        x += width + padding
+        shelf_height = max(shelf_height, height + padding)
+
+    packed = {}
+    for rects in placements:
+        size = (max(r.right for _, r in rects), max(r.bottom for _, r in rects))
+        if alpha:
+            page = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+        else:
+            page = pygame.Surface(size).convert()
+        page.blits([(images[key], rect) for key, rect in rects], doreturn=False)
+        for key, rect in rects:
+            packed[key] = (page, rect)
+    return packed
+
+
+# Shared by RenderSurfaceComponent.from_image and SpriteSheetGrid
+default_asset_cache = AssetCache()
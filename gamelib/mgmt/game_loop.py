@@ -0,0 +1,166 @@
+from dataclasses import dataclass
+from typing import Optional, Type, TypeVar
+
+import esper
+import pygame
+from esper import Processor
+
+from .scene_base import SceneBase
+
+P = TypeVar("P", bound=Processor)
+
+
+@dataclass
+class _Scheduled:
+    processor: Processor
+    every: int
+    priority: int
+
+
+class FixedStepScene(SceneBase):
+    """Scene that advances its simulation in fixed steps.
+
+    Frame time is collected in an accumulator and spent in steps of
+    `1 / step_hz` seconds, so the simulation sees the same sequence of dts
+    regardless of the display frame rate. Processors added with a rate run on
+    every n-th step (`step_hz / hz`, rounded) and always receive
+    `n * fixed_dt`, which keeps them deterministic too. Processors added
+    without a rate run once per rendered frame with the real frame dt.
+
+    When a frame is too slow, at most `max_steps` steps are run and the rest
+    of the backlog is dropped (and counted in `dropped_time`) rather than
+    letting the game fall further and further behind.
+
+    Processors are owned by the scene; don't also register them with esper,
+    or `esper.process` would run them a second time. As `esper.process`
+    would, every step starts by deleting the entities passed to
+    `esper.delete_entity` since the last step.
+
+    Attributes:
+        fixed_dt: Length of one simulation step in seconds
+        max_steps: Maximum number of steps run per frame
+        tick: Number of steps run so far
+        alpha: How far (0..1) the current frame lies between the last step
+            and the next one, for interpolating what is drawn
+        dropped_time: Total simulation time skipped to catch up
+
+    Usage:
+        class Level(FixedStepScene):
+            def __init__(self, screen):
+                super().__init__(screen, step_hz=60)
+                self.add_processor(MoveProcessor(use_dt=True))
+                self.add_processor(CollisionProcessor(), hz=30)
+                self.add_processor(EnemyAIProcessor(), hz=10)
+                self.add_processor(RenderSurfaceProcessor(screen))
+    """
+
+    def __init__(self, screen: pygame.Surface, step_hz: float = 60, max_steps: int = 5):
+        super().__init__(screen)
+        self.step_hz = step_hz
+        self.fixed_dt = 1 / step_hz
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.tick = 0
+        self.alpha = 0.0
+        self.dropped_time = 0.0
+        self._fixed: list[_Scheduled] = []
+        self._frame: list[_Scheduled] = []
+
+    def add_processor(
+        self, processor: Processor, hz: Optional[float] = None, priority: int = 0
+    ) -> None:
+        """Schedule `processor` at `hz` steps per second, or every frame.
+
+        Rates above `step_hz` are clamped to one run per step. Within a step
+        (or a frame), processors with a higher priority run first.
+        """
+        if hz is None:
+            schedule = self._frame
+            every = 0
+        else:
+            if hz <= 0:
+                raise ValueError("hz must be positive")
+            schedule = self._fixed
+            every = max(1, round(self.step_hz / hz))
+        schedule.append(_Scheduled(processor, every, priority))
+        schedule.sort(key=lambda scheduled: scheduled.priority, reverse=True)
+
+    def remove_processor(self, processor_type: Type[Processor]) -> None:
+        for schedule in (self._fixed, self._frame):
+            schedule[:] = [
+                s for s in schedule if type(s.processor) is not processor_type
+            ]
+
+    def get_processor(self, processor_type: Type[P]) -> Optional[P]:
+        for scheduled in self._fixed + self._frame:
+            if type(scheduled.processor) is processor_type:
+                return scheduled.processor
+        return None
+
+    def update(self, events, pressed_keys, dt: float = 0) -> None:
+        self.handle_input(events, pressed_keys)
+
+        self.accumulator += dt
+        steps = 0
+        while self.accumulator >= self.fixed_dt:
+            if steps == self.max_steps:
+                # Keep the fractional remainder so alpha stays meaningful
+                dropped = self.accumulator - self.accumulator % self.fixed_dt
+                self.dropped_time += dropped
+                self.accumulator -= dropped
+                break
+            self.step()
+            self.accumulator -= self.fixed_dt
+            steps += 1
+        self.alpha = self.accumulator / self.fixed_dt
+
+        for scheduled in self._frame:
+            scheduled.processor.process(dt)
+        self.render(self.alpha)
+
+    def step(self) -> None:
+        """Advance the simulation by exactly one fixed step."""
+        esper.clear_dead_entities()
+        self.tick += 1
+        self.fixed_update(self.fixed_dt)
+        for scheduled in self._fixed:
+            if self.tick % scheduled.every == 0:
+                scheduled.processor.process(scheduled.every * self.fixed_dt)
+
+    def handle_input(self, events, pressed_keys) -> None:
+        """Called once per frame, before any simulation step."""
+
+    def fixed_update(self, dt: float) -> None:
+        """Called on every simulation step, before scheduled processors."""
+
+    def render(self, alpha: float) -> None:
+        """Called once per frame, after the frame's processors."""
+
+
+def interpolate(previous: float, current: float, alpha: float) -> float:
+    """Blend a value between the last two simulation steps for drawing."""
+    return previous + (current - previous) * alpha
+
+
+def run_game(scene: SceneBase, fps: int = 60, max_frame_time: float = 0.25) -> None:
+    """Run scenes until one terminates, flipping the display every frame.
+
+    `dt` is passed to scenes in seconds and capped at `max_frame_time`, so a
+    stall (dragging the window, a breakpoint) doesn't turn into a huge step.
+    A QUIT event terminates the current scene.
+
+    Args:
+        scene: First scene to run
+        fps: Frame rate cap passed to pygame.time.Clock.tick, 0 for none
+        max_frame_time: Largest dt handed to a scene, in seconds
+    """
+    clock = pygame.time.Clock()
+    while scene is not None:
+        dt = min(clock.tick(fps) / 1000, max_frame_time)
+        events = pygame.event.get()
+        if any(event.type == pygame.QUIT for event in events):
+            scene.terminate()
+        else:
+            scene.update(events, pygame.key.get_pressed(), dt)
+        scene = scene.next
+        pygame.display.flip()
@@ -1,42 +1,144 @@
+from functools import partial
+from typing import Callable, Hashable, Optional
+from weakref import finalize
+
 import pygame
 
+from gamelib.mgmt.assets import default_asset_cache
+
 
 class SpriteSheetGrid:
-    def __init__(self, image_path: str, cell_width: int, cell_height: int):
-        self.image = pygame.image.load(image_path).convert_alpha()
+    """Grid of equally sized sprites cut from one image.
+
+    By default every cell is copied into its own Surface up front. With
+    `lazy=True`, a cell is created on first access as a subsurface of
+    `image`: it shares the sheet's pixels, so loading costs no extra memory
+    and no copying, and drawing onto a cell draws onto the sheet. Call
+    `materialize` for cells that need pixels of their own.
+
+    The sheet image is loaded through `default_asset_cache`, so grids made
+    from the same file share one image. The reference is held by `owner`,
+    or without one by the grid until it's garbage collected; `release` drops
+    it early. Don't draw onto a shared sheet or its lazy cells: every other
+    user of the image would see it. With `shared=False`, the grid copies the
+    sheet, may draw onto it freely and holds no reference to the cache.
+    """
+
+    def __init__(
+        self,
+        image_path: str,
+        cell_width: int,
+        cell_height: int,
+        lazy: bool = False,
+        owner: Optional[Hashable] = None,
+        shared: bool = True,
+    ):
+        self.image_path = image_path
+        # Owner-less grids hold their reference through a private key, so
+        # the cache doesn't keep them alive
+        key = object() if owner is None else owner
+        self.image = default_asset_cache.load(image_path, owner=key)
+        self._release: Optional[Callable[[], None]] = None
+        if not shared:
+            self.image = self.image.copy()
+            default_asset_cache.release(image_path, owner=key)
+        elif owner is None:
+            self._release = finalize(
+                self, default_asset_cache.release, image_path, True, key
+            )
+        else:
+            self._release = partial(default_asset_cache.release, image_path, True, key)
         self.cell_width = cell_width
         self.cell_height = cell_height
+        self.lazy = lazy
 
         self.sheet_width, self.sheet_height = self.image.get_size()
         self.cols = self.sheet_width // cell_width
         self.rows = self.sheet_height // cell_height
 
-        self.sprites: list[list[pygame.Surface]] = []
-        self._slice()
+        self._sprites: list[list[Optional[pygame.Surface]]] = [
+            [None] * self.cols for _ in range(self.rows)
+        ]
+        self._complete = False
+        if not lazy:
+            self._slice()
+
+    def release(self) -> None:
+        """Drop the grid's reference to the sheet in `default_asset_cache`.
+
+        The grid keeps working; the cache may forget the image. Releasing
+        twice is harmless.
+        """
+        release, self._release = self._release, None
+        if release is not None:
+            release()
+
+    @property
+    def sprites(self) -> list[list[pygame.Surface]]:
+        """Every cell, as a 2D grid indexed [y][x].
+
+        In lazy mode, cells not accessed yet are created as subsurfaces.
+        """
+        if not self._complete:
+            for y in range(self.rows):
+                for x in range(self.cols):
+                    self.get(x, y)
+            self._complete = True
+        return self._sprites
+
+    @sprites.setter
+    def sprites(self, sprites: list[list[pygame.Surface]]):
+        self._sprites = sprites
+        self._complete = True
+
+    def _cell_rect(self, x: int, y: int) -> pygame.Rect:
+        return pygame.Rect(
+            x * self.cell_width,
+            y * self.cell_height,
+            self.cell_width,
+            self.cell_height,
+        )
 
     def _slice(self):
         """Slice the spritesheet into a 2D grid."""
-        self.sprites = []
+        sprites = []
 
         for y in range(self.rows):
             row = []
             for x in range(self.cols):
-                rect = pygame.Rect(
-                    x * self.cell_width,
-                    y * self.cell_height,
-                    self.cell_width,
-                    self.cell_height,
-                )
+                rect = self._cell_rect(x, y)
                 surface = pygame.Surface(
                     (self.cell_width, self.cell_height), pygame.SRCALPHA
                 )
                 surface.blit(self.image, (0, 0), rect)
                 row.append(surface)
-            self.sprites.append(row)
+            sprites.append(row)
+        self.sprites = sprites
 
     def get(self, x: int, y: int) -> pygame.Surface:
         """Get sprite at grid coordinate (x, y)."""
-        return self.sprites[y][x]
+        row = self._sprites[y]
+        sprite = row[x]
+        if sprite is None:
+            # Normalize negative indices, like list indexing does
+            x, y = range(self.cols)[x], range(self.rows)[y]
+            sprite = row[x] = self.image.subsurface(self._cell_rect(x, y))
+        return sprite
+
+    def materialize(self, x: Optional[int] = None, y: Optional[int] = None):
+        """Give cells their own copy of their pixels.
+
+        Materializes the cell at (x, y), or every cell when called without
+        coordinates. Cells that already own their pixels are left alone.
+        """
+        if x is None and y is None:
+            cells = [(x, y) for y in range(self.rows) for x in range(self.cols)]
+        else:
+            cells = [(x, y)]
+        for cx, cy in cells:
+            sprite = self.get(cx, cy)
+            if sprite.get_parent() is not None:
+                self._sprites[cy][cx] = sprite.copy()
 
     def get_by_index(self, index: int) -> pygame.Surface:
         """Get sprite by linear index (row-major order).
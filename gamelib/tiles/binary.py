@@ -0,0 +1,181 @@
+from array import array
+import mmap
+import struct
+import sys
+from typing import Iterable, Iterator, Optional, Sequence, Tuple, Type
+
+from gamelib.tiles.tiles import T_Mapper, TileMap, read_csv_rows
+
+# magic, version, tilesize, origin x, origin y, width, height, nodata, padding
+HEADER = struct.Struct("<4sHHiiIIi4x")
+MAGIC = b"GLTM"
+VERSION = 1
+# Stored for blank cells; never becomes a tile
+NODATA = -(2**31)
+
+_TYPECODE = "i"
+_ITEMSIZE = array(_TYPECODE).itemsize
+_SWAP = sys.byteorder != "little"
+
+
+def write_tile_grid(
+    path: str,
+    rows: Iterable[Sequence[Optional[int]]],
+    tilesize: int = 16,
+    origin: Tuple[int, int] = (0, 0),
+) -> None:
+    """Write rows of tile values (None for blank) as a binary tile grid.
+
+    Rows shorter than the longest one are padded with blanks.
+    """
+    packed = []
+    for row in rows:
+        try:
+            values = array(_TYPECODE, row)
+        except TypeError:
+            values = array(_TYPECODE, (NODATA if v is None else v for v in row))
+        packed.append(values)
+    width = max((len(values) for values in packed), default=0)
+
+    with open(path, "wb") as fh:
+        fh.write(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                tilesize,
+                origin[0],
+                origin[1],
+                width,
+                len(packed),
+                NODATA,
+            )
+        )
+        for values in packed:
+            if len(values) < width:
+                values.extend(array(_TYPECODE, [NODATA]) * (width - len(values)))
+            if _SWAP:
+                values.byteswap()
+            fh.write(values.tobytes())
+
+
+def csv_to_binary(
+    csv_path: str,
+    binary_path: str,
+    tilesize: int = 16,
+    delimiter: str = ",",
+    start_pos: Tuple[int, int] = (0, 0),
+) -> None:
+    """Convert a CSV tile map (as read by TileMap.from_csv) to a binary grid."""
+    write_tile_grid(
+        binary_path, read_csv_rows(csv_path, delimiter), tilesize, start_pos
+    )
+
+
+class TileGridFile:
+    """Memory-mapped binary tile grid.
+
+    The file is a 32 byte header followed by `width * height` little-endian
+    int32 tile values in row-major order, so any region can be read straight
+    from the mapping without parsing the rest of the file. Coordinates are
+    tile coordinates, offset by the `origin` the grid was written with.
+
+    Attributes:
+        tilesize: Tile size stored in the header
+        origin: Tile coordinate of the first value
+        width: Number of columns
+        height: Number of rows
+
+    Usage:
+        csv_to_binary("level1.csv", "level1.tiles")
+        with TileGridFile("level1.tiles") as grid:
+            tilemap = grid.to_tilemap(DenseTileMap, mapper=tiles, ignore_values={0})
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path} is not a tile grid file") from None
+        try:
+            self._read_header(path)
+        except ValueError:
+            self.close()
+            raise
+
+    def _read_header(self, path: str) -> None:
+        if len(self._mmap) < HEADER.size:
+            raise ValueError(f"{path} is not a tile grid file")
+        magic, version, tilesize, ox, oy, width, height, nodata = HEADER.unpack_from(
+            self._mmap
+        )
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a tile grid file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported tile grid version {version} in {path}")
+        if len(self._mmap) < HEADER.size + width * height * _ITEMSIZE:
+            raise ValueError(f"{path} is truncated")
+        self.tilesize = tilesize
+        self.origin = (ox, oy)
+        self.width = width
+        self.height = height
+        self.nodata = nodata
+
+    def __enter__(self) -> "TileGridFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._mmap.close()
+        self._file.close()
+
+    def region(self, x: int, y: int, width: int, height: int) -> list[array]:
+        """Read the values in a rect, one array per row.
+
+        Cells outside the grid read as `nodata`.
+        """
+        ox, oy = self.origin
+        rows = []
+        for ty in range(y, y + height):
+            row = array(_TYPECODE, [self.nodata]) * width
+            left, right = max(x, ox), min(x + width, ox + self.width)
+            if oy <= ty < oy + self.height and left < right:
+                offset = HEADER.size + ((ty - oy) * self.width + left - ox) * _ITEMSIZE
+                values = array(_TYPECODE)
+                values.frombytes(
+                    self._mmap[offset : offset + (right - left) * _ITEMSIZE]
+                )
+                if _SWAP:
+                    values.byteswap()
+                row[left - x : right - x] = values
+            rows.append(row)
+        return rows
+
+    def rows(self) -> Iterator[array]:
+        """Yield every row, reading one at a time."""
+        ox, oy = self.origin
+        for y in range(oy, oy + self.height):
+            yield self.region(ox, y, self.width, 1)[0]
+
+    def to_tilemap(
+        self,
+        cls: Type[TileMap] = TileMap,
+        mapper: Optional[T_Mapper] = None,
+        ignore_values: Optional[set[int]] = None,
+        region: Optional[Tuple[int, int, int, int]] = None,
+    ) -> TileMap:
+        """Load the grid, or an (x, y, width, height) region of it, as a map.
+
+        `mapper` and `ignore_values` work as in TileMap.from_csv.
+        """
+        ignore = {self.nodata} | set(ignore_values or ())
+        tilemap = cls(tilesize=self.tilesize)
+        if region is None:
+            tilemap.add_rows(self.rows(), self.origin, mapper, ignore)
+        else:
+            x, y, width, height = region
+            tilemap.add_rows(self.region(x, y, width, height), (x, y), mapper, ignore)
+        return tilemap
@@ -0,0 +1,136 @@
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import pygame
+
+from gamelib.tiles.tiles import TileMap
+
+T_ChunkKey = Tuple[int, int]
+
+
+class ChunkedTileRenderer:
+    """Draws a TileMap from cached, pre-rendered chunks.
+
+    The map is split into square chunks of `chunk_tiles` x `chunk_tiles`
+    tiles. A chunk is rendered the first time it becomes visible and kept in
+    an LRU cache of at most `max_chunks` surfaces, so memory follows what is
+    on screen rather than the size of the map. Changes made through
+    `TileMap.add_to_tile` re-render only the chunk holding the tile; call
+    `invalidate_tile` or `invalidate` after editing `tilemap.tiles` directly.
+
+    Tiles are placed at absolute world pixels (tile x * tilesize), unlike
+    `TileMap.generate_surface`, which shifts the map to start at (0, 0).
+
+    Attributes:
+        tilemap: Map being drawn; tiles that aren't Surfaces are skipped
+        chunk_tiles: Width and height of a chunk, in tiles
+        max_chunks: Maximum number of chunk surfaces kept. Should be at least
+            the number of chunks a viewport can overlap.
+        renders: Number of chunks rendered so far
+
+    Usage:
+        renderer = ChunkedTileRenderer(tilemap, chunk_tiles=16)
+        # every frame
+        renderer.draw(screen, camera.view_rect)
+    """
+
+    def __init__(self, tilemap: TileMap, chunk_tiles: int = 16, max_chunks: int = 64):
+        self.tilemap = tilemap
+        self.chunk_tiles = chunk_tiles
+        self.max_chunks = max_chunks
+        self.renders = 0
+        # None marks a chunk known to hold no drawable tiles
+        self._chunks: OrderedDict[T_ChunkKey, Optional[pygame.Surface]] = OrderedDict()
+        tilemap.tile_changed.add_listener(self.invalidate_tile)
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    @property
+    def chunk_size(self) -> int:
+        """Width and height of a chunk, in pixels."""
+        return self.chunk_tiles * self.tilemap.tilesize
+
+    def close(self) -> None:
+        """Stop listening to the tilemap and drop every cached chunk."""
+        self.tilemap.tile_changed.remove_listener(self.invalidate_tile)
+        self._chunks.clear()
+
+    def invalidate_tile(self, tile: Tuple[int, int]) -> None:
+        n = self.chunk_tiles
+        self._chunks.pop((tile[0] // n, tile[1] // n), None)
+
+    def invalidate(self) -> None:
+        self._chunks.clear()
+
+    def chunk_range(self, view: pygame.Rect) -> Tuple[int, int, int, int]:
+        """Inclusive (left, top, right, bottom) chunks overlapping `view`."""
+        size = self.chunk_size
+        return (
+            view.left // size,
+            view.top // size,
+            (view.right - 1) // size,
+            (view.bottom - 1) // size,
+        )
+
+    def draw(
+        self,
+        target: pygame.Surface,
+        view: pygame.Rect,
+        dest: Tuple[int, int] = (0, 0),
+    ) -> int:
+        """Draw the part of the map inside the world-pixel rect `view`.
+
+        The view's top-left corner lands on `dest` on the target.
+
+        Returns:
+            Number of chunks blitted
+        """
+        size = self.chunk_size
+        left, top, right, bottom = self.chunk_range(view)
+        offset_x, offset_y = dest[0] - view.x, dest[1] - view.y
+        blits = []
+        for cy in range(top, bottom + 1):
+            for cx in range(left, right + 1):
+                chunk = self.get_chunk((cx, cy))
+                if chunk is not None:
+                    blits.append((chunk, (cx * size + offset_x, cy * size + offset_y)))
+
+        clip = target.get_clip()
+        target.set_clip(pygame.Rect(dest, view.size).clip(clip))
+        target.blits(blits, doreturn=False)
+        target.set_clip(clip)
+        return len(blits)
+
+    def get_chunk(self, key: T_ChunkKey) -> Optional[pygame.Surface]:
+        """Get the rendered chunk at chunk coordinate `key` (None if empty)."""
+        chunks = self._chunks
+        if key in chunks:
+            chunks.move_to_end(key)
+            return chunks[key]
+
+        chunk = self._render(key)
+        chunks[key] = chunk
+        while len(chunks) > self.max_chunks:
+            chunks.popitem(last=False)
+        return chunk
+
+    def _render(self, key: T_ChunkKey) -> Optional[pygame.Surface]:
+        self.renders += 1
+        n = self.chunk_tiles
+        tilesize = self.tilemap.tilesize
+        tiles = self.tilemap.tiles
+        start_x, start_y = key[0] * n, key[1] * n
+
+        blits = []
+        for y in range(n):
+            for x in range(n):
+                tile = tiles.get((start_x + x, start_y + y))
+                if isinstance(tile, pygame.Surface):
+                    blits.append((tile, (x * tilesize, y * tilesize)))
+        if not blits:
+            return None
+
+        surface = pygame.Surface((n * tilesize, n * tilesize), pygame.SRCALPHA)
+        surface.blits(blits, doreturn=False)
+        return surface
@@ -0,0 +1,155 @@
+from collections.abc import Container
+from typing import Any, Callable, Iterable, Optional, Set, Tuple, Union
+
+import esper
+
+from gamelib.ecs.collision import ColliderComponent
+from gamelib.ecs.geometry import PositionComponent
+from gamelib.tiles.tiles import TileMap
+
+T_Tile = Tuple[int, int]
+T_TileRect = Tuple[int, int, int, int]
+T_Solid = Union[Callable[[Any], bool], Container]
+
+
+def merge_tiles(tiles: Iterable[T_Tile]) -> list[T_TileRect]:
+    """Merge tile coordinates into few (x, y, width, height) rects.
+
+    Greedy meshing: starting from the top-left remaining tile, a rect is
+    grown as far right as possible, then down for as long as every tile
+    below it is present. Every tile ends up in exactly one rect.
+    """
+    remaining = set(tiles)
+    rects = []
+    for tile in sorted(remaining, key=lambda t: (t[1], t[0])):
+        if tile not in remaining:
+            continue
+        x, y = tile
+        width = 1
+        while (x + width, y) in remaining:
+            width += 1
+        height = 1
+        while all((tx, y + height) in remaining for tx in range(x, x + width)):
+            height += 1
+        for ty in range(y, y + height):
+            for tx in range(x, x + width):
+                remaining.discard((tx, ty))
+        rects.append((x, y, width, height))
+    return rects
+
+
+class TileColliders:
+    """Static colliders covering the solid tiles of a TileMap.
+
+    Solid tiles are merged into rects with `merge_tiles`, and each rect
+    becomes one entity with a PositionComponent and a static
+    ColliderComponent, instead of one entity per tile. The map is meshed in
+    square regions of `region_tiles` tiles, so changing a tile (through
+    `TileMap.add_to_tile`) only re-meshes its region on the next `flush`.
+    Rects never cross a region edge; bigger regions give fewer colliders
+    but more work per change. Old colliders are deleted immediately, so
+    call `flush` and `build` outside `esper.process`.
+
+    Attributes:
+        tilemap: Map the colliders are built from
+        solid: Tile objects that are solid, or a predicate taking a tile
+            object
+        tags: Tags given to every collider
+        region_tiles: Width and height of a meshing region, in tiles
+
+    Usage:
+        colliders = TileColliders(tilemap, solid={wall, rock}, tags={"solid"})
+        # after editing tiles, e.g. once per frame
+        tilemap.add_to_tile((4, 2), None)
+        colliders.flush()
+    """
+
+    def __init__(
+        self,
+        tilemap: TileMap,
+        solid: T_Solid,
+        tags: Optional[Set[str]] = None,
+        region_tiles: int = 32,
+    ):
+        self.tilemap = tilemap
+        self.solid = solid
+        self.tags = tags or set()
+        self.region_tiles = region_tiles
+        self._is_solid = solid if callable(solid) else solid.__contains__
+        self._entities: dict[T_Tile, list[int]] = {}
+        self._dirty: set[T_Tile] = set()
+        self.build()
+        tilemap.tile_changed.add_listener(self.invalidate_tile)
+
+    def __len__(self) -> int:
+        return sum(map(len, self._entities.values()))
+
+    def close(self) -> None:
+        """Stop listening to the tilemap and delete every collider."""
+        self.tilemap.tile_changed.remove_listener(self.invalidate_tile)
+        for region in list(self._entities):
+            self._clear(region)
+        self._dirty.clear()
+
+    def invalidate_tile(self, tile: T_Tile) -> None:
+        n = self.region_tiles
+        self._dirty.add((tile[0] // n, tile[1] // n))
+
+    def build(self) -> None:
+        """Delete every collider and mesh the whole map again."""
+        for region in list(self._entities):
+            self._clear(region)
+        self._dirty.clear()
+
+        n = self.region_tiles
+        is_solid = self._is_solid
+        regions: dict[T_Tile, list[T_Tile]] = {}
+        for tile, obj in self.tilemap.tiles.items():
+            if is_solid(obj):
+                regions.setdefault((tile[0] // n, tile[1] // n), []).append(tile)
+        for region, tiles in regions.items():
+            self._spawn(region, merge_tiles(tiles))
+
+    def flush(self) -> int:
+        """Re-mesh the regions changed since the last flush.
+
+        Returns:
+            Number of regions re-meshed
+        """
+        dirty, self._dirty = self._dirty, set()
+        n = self.region_tiles
+        get = self.tilemap.tiles.get
+        is_solid = self._is_solid
+        for region in dirty:
+            self._clear(region)
+            start_x, start_y = region[0] * n, region[1] * n
+            tiles = [
+                (x, y)
+                for y in range(start_y, start_y + n)
+                for x in range(start_x, start_x + n)
+                if is_solid(get((x, y)))
+            ]
+            self._spawn(region, merge_tiles(tiles))
+        return len(dirty)
+
+    def _clear(self, region: T_Tile) -> None:
+        # Delete right away: the replacements are spawned right away too, and
+        # must never overlap the old colliders. This runs outside
+        # esper.process, so it can't disturb a processor's iteration.
+        for entity in self._entities.pop(region, ()):
+            if esper.entity_exists(entity):
+                esper.delete_entity(entity, immediate=True)
+
+    def _spawn(self, region: T_Tile, rects: list[T_TileRect]) -> None:
+        if not rects:
+            return
+        size = self.tilemap.tilesize
+        self._entities[region] = [
+            esper.create_entity(
+                PositionComponent(x * size, y * size),
+                ColliderComponent(
+                    width * size, height * size, tags=set(self.tags), static=True
+                ),
+            )
+            for x, y, width, height in rects
+        ]
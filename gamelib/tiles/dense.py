@@ -0,0 +1,449 @@
+from array import array
+from collections.abc import MutableMapping
+from typing import Any, Iterable, Iterator, Optional, Sequence, Tuple
+
+from gamelib.tiles.tiles import T_Mapper, TileMap, tile_resolver
+
+T_Tile = Tuple[int, int]
+T_Bounds = Tuple[int, int, int, int]
+
+# Palette id 0 always means "no tile"
+EMPTY = 0
+_TYPECODE = "I"
+
+
+class DenseTileMap(TileMap):
+    """TileMap backed by a flat grid of palette ids.
+
+    Every distinct tile object is stored once in `palette`; the map itself
+    is a row-major `array` of palette ids covering the occupied area, so a
+    1000x1000 map costs 4 MB instead of a million tuple keys. The grid grows
+    in any direction as tiles are added, and the bounds are tracked as tiles
+    change, so `min_x` and friends are O(1).
+
+    `tiles` stays available as a dict-like view for code written against
+    TileMap. Bulk operations (`fill`, `set_region`, `region_ids`) work a row
+    at a time on the underlying array.
+
+    Attributes:
+        palette: Tile objects by palette id; index 0 is the empty tile (None).
+            Hashable tiles that compare equal share an id; unhashable ones
+            get an id per object.
+    """
+
+    def __init__(self, tilesize: int = 16) -> None:
+        self.palette: list[Any] = [None]
+        self._palette_ids: dict[Any, int] = {}
+        # Unhashable tiles, by id(); the palette keeps them alive
+        self._palette_object_ids: dict[int, int] = {}
+        self._ids = array(_TYPECODE)
+        self._origin_x = 0
+        self._origin_y = 0
+        self._width = 0
+        self._height = 0
+        self._count = 0
+        self._bounds: Optional[T_Bounds] = None
+        self._bounds_stale = False
+        super().__init__(tilesize)
+
+    @classmethod
+    def from_tilemap(cls, tilemap: TileMap) -> "DenseTileMap":
+        dense = cls(tilemap.tilesize)
+        dense.tiles = tilemap.tiles
+        return dense
+
+    # ----- palette -----
+
+    def palette_id(self, tile: Any) -> int:
+        """Get the palette id of `tile`, adding it to the palette if needed."""
+        if tile is None:
+            return EMPTY
+        try:
+            ids, key = self._palette_ids, tile
+            tile_id = ids.get(key)
+        except TypeError:
+            ids, key = self._palette_object_ids, id(tile)
+            tile_id = ids.get(key)
+        if tile_id is None:
+            tile_id = ids[key] = len(self.palette)
+            self.palette.append(tile)
+        return tile_id
+
+    # ----- single tiles -----
+
+    @property
+    def tiles(self) -> "DenseTiles":
+        return DenseTiles(self)
+
+    @tiles.setter
+    def tiles(self, tiles: dict[T_Tile, Any]) -> None:
+        self.clear()
+        for tile, obj in tiles.items():
+            self.set_id(tile[0], tile[1], self.palette_id(obj))
+
+    def add_to_tile(self, tile: T_Tile, object: Any) -> "DenseTiles":
+        self.set_id(tile[0], tile[1], self.palette_id(object))
+        return self.tiles
+
+    def get(self, x: int, y: int) -> Any:
+        return self.palette[self.get_id(x, y)]
+
+    def get_id(self, x: int, y: int) -> int:
+        col, row = x - self._origin_x, y - self._origin_y
+        if 0 <= col < self._width and 0 <= row < self._height:
+            return self._ids[row * self._width + col]
+        return EMPTY
+
+    def set_id(self, x: int, y: int, tile_id: int) -> None:
+        if tile_id == EMPTY and not self._contains(x, y, 1, 1):
+            return
+        self._check_id(tile_id)
+        self._reserve(x, y, 1, 1)
+        index = (y - self._origin_y) * self._width + (x - self._origin_x)
+        old = self._ids[index]
+        self._ids[index] = tile_id
+        self._changed(x, y, 1, 1, tile_id, int(old != EMPTY), 1)
+
+    def clear(self) -> None:
+        self._ids = array(_TYPECODE)
+        self._origin_x = self._origin_y = self._width = self._height = 0
+        self._count = 0
+        self._bounds = None
+        self._bounds_stale = False
+
+    # ----- bulk operations -----
+
+    def add_rows(
+        self,
+        rows: Iterable[Sequence[Optional[int]]],
+        start_pos: Tuple[int, int] = (0, 0),
+        mapper: Optional[T_Mapper] = None,
+        ignore_values: Optional[set[int]] = None,
+    ) -> "DenseTiles":
+        """Add a grid of integer tile values, with `from_csv`'s mapping rules.
+
+        Each distinct value is resolved once, so a callable `mapper` should
+        return the same object for the same value. Rows are translated to
+        palette ids through a lookup table and copied into the grid whole,
+        after growing it once for the entire block; skipped cells keep
+        whatever tile they had.
+        """
+        ids = _PaletteLookup(self, tile_resolver(mapper, ignore_values))
+        lookup = ids.__getitem__
+        sx, sy = start_pos
+        # (y, first, ids) of each row's span from its first to last tile
+        spans = []
+        left = right = None
+        for y, row in enumerate(rows, sy):
+            row_ids = array(_TYPECODE, map(lookup, row))
+            first, last = _tile_span(row_ids)
+            if first > last:
+                continue
+            spans.append((y, sx + first, row_ids[first : last + 1]))
+            if left is None:
+                left, right = sx + first, sx + last
+            else:
+                left, right = min(left, sx + first), max(right, sx + last)
+        if not spans:
+            return self.tiles
+
+        top, bottom = spans[0][0], spans[-1][0]
+        self._reserve(left, top, right - left + 1, bottom - top + 1)
+        grid = self._ids
+        for y, x, row_ids in spans:
+            width = len(row_ids)
+            start = (y - self._origin_y) * self._width + x - self._origin_x
+            old = grid[start : start + width]
+            old_empty = old.count(EMPTY)
+            if old_empty != width and EMPTY in row_ids:
+                # Keep the tiles under skipped cells
+                row_ids = array(
+                    _TYPECODE, [new or prev for new, prev in zip(row_ids, old)]
+                )
+            grid[start : start + width] = row_ids
+            self._count += old_empty - row_ids.count(EMPTY)
+        self._grow_bounds(left, top, right, bottom)
+
+        if self.tile_changed.listeners:
+            for y, x, row_ids in spans:
+                for dx, tile_id in enumerate(row_ids):
+                    if tile_id:
+                        self.tile_changed.trigger((x + dx, y))
+        return self.tiles
+
+    def fill(self, x: int, y: int, width: int, height: int, tile: Any) -> None:
+        """Set every tile in the rect to `tile` (None clears them)."""
+        tile_id = self.palette_id(tile)
+        if tile_id == EMPTY:
+            x, y, width, height = self._clip(x, y, width, height)
+            if width <= 0 or height <= 0:
+                return
+        else:
+            self._reserve(x, y, width, height)
+        run = array(_TYPECODE, [tile_id]) * width
+        replaced = 0
+        for row in range(y - self._origin_y, y - self._origin_y + height):
+            start = row * self._width + x - self._origin_x
+            replaced += width - self._ids[start : start + width].count(EMPTY)
+            self._ids[start : start + width] = run
+        self._changed(x, y, width, height, tile_id, replaced, width * height)
+
+    def set_region(self, x: int, y: int, rows: Sequence[Sequence[int]]) -> None:
+        """Copy a 2D block of palette ids, row by row, with its top-left at x, y.
+
+        Rows may differ in length; ids of 0 clear their tile.
+        """
+        for dy, ids in enumerate(rows):
+            ids = array(_TYPECODE, ids)
+            width = len(ids)
+            if not width:
+                continue
+            if max(ids) >= len(self.palette):
+                raise ValueError(f"Unknown palette id in row {dy}")
+            self._reserve(x, y + dy, width, 1)
+            start = (y + dy - self._origin_y) * self._width + x - self._origin_x
+            replaced = width - self._ids[start : start + width].count(EMPTY)
+            self._ids[start : start + width] = ids
+            added = width - ids.count(EMPTY)
+            self._count += added - replaced
+            if added:
+                self._grow_bounds(x, y + dy, x + width - 1, y + dy)
+            if replaced and added < width:
+                # Some of the written zeros may have cleared an edge tile
+                self._bounds_stale = True
+            if self.tile_changed.listeners:
+                for dx in range(width):
+                    self.tile_changed.trigger((x + dx, y + dy))
+
+    def region_ids(self, x: int, y: int, width: int, height: int) -> list[array]:
+        """Get the palette ids in a rect as one array per row (0 = empty)."""
+        rows = []
+        for ty in range(y, y + height):
+            row = array(_TYPECODE, [EMPTY]) * width
+            cx, cy, cw, ch = self._clip(x, ty, width, 1)
+            if cw > 0 and ch > 0:
+                start = (cy - self._origin_y) * self._width + cx - self._origin_x
+                row[cx - x : cx - x + cw] = self._ids[start : start + cw]
+            rows.append(row)
+        return rows
+
+    # ----- bounds -----
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def bounds(self) -> T_Bounds:
+        """(min_x, min_y, max_x, max_y) of the occupied tiles."""
+        if self._bounds_stale:
+            self._bounds = self._scan_bounds()
+            self._bounds_stale = False
+        if self._bounds is None:
+            raise ValueError("DenseTileMap is empty")
+        return self._bounds
+
+    @property
+    def min_x(self) -> int:
+        return self.bounds[0]
+
+    @property
+    def min_y(self) -> int:
+        return self.bounds[1]
+
+    @property
+    def max_x(self) -> int:
+        return self.bounds[2]
+
+    @property
+    def max_y(self) -> int:
+        return self.bounds[3]
+
+    # ----- internals -----
+
+    def _check_id(self, tile_id: int) -> None:
+        if not 0 <= tile_id < len(self.palette):
+            raise ValueError(f"Unknown palette id: {tile_id}")
+
+    def _contains(self, x: int, y: int, width: int, height: int) -> bool:
+        return (
+            x >= self._origin_x
+            and y >= self._origin_y
+            and x + width <= self._origin_x + self._width
+            and y + height <= self._origin_y + self._height
+        )
+
+    def _clip(self, x: int, y: int, width: int, height: int) -> T_Bounds:
+        left = max(x, self._origin_x)
+        top = max(y, self._origin_y)
+        right = min(x + width, self._origin_x + self._width)
+        bottom = min(y + height, self._origin_y + self._height)
+        return left, top, right - left, bottom - top
+
+    def _reserve(self, x: int, y: int, width: int, height: int) -> None:
+        """Grow the grid to cover the rect, with slack for further growth."""
+        if self._contains(x, y, width, height):
+            return
+        if not self._width:
+            left, top, right, bottom = x, y, x + width, y + height
+        else:
+            left = min(x, self._origin_x)
+            top = min(y, self._origin_y)
+            right = max(x + width, self._origin_x + self._width)
+            bottom = max(y + height, self._origin_y + self._height)
+            # Grow by at least half the current size on the side that grew,
+            # so repeated growth costs amortized O(1) per tile
+            slack_x, slack_y = self._width // 2, self._height // 2
+            if left < self._origin_x:
+                left = min(left, self._origin_x - slack_x)
+            if right > self._origin_x + self._width:
+                right = max(right, self._origin_x + self._width + slack_x)
+            if top < self._origin_y:
+                top = min(top, self._origin_y - slack_y)
+            if bottom > self._origin_y + self._height:
+                bottom = max(bottom, self._origin_y + self._height + slack_y)
+
+        new_width, new_height = right - left, bottom - top
+        ids = array(_TYPECODE, [EMPTY]) * (new_width * new_height)
+        for row in range(self._height):
+            src = row * self._width
+            dst = (row + self._origin_y - top) * new_width + self._origin_x - left
+            ids[dst : dst + self._width] = self._ids[src : src + self._width]
+        self._ids = ids
+        self._origin_x, self._origin_y = left, top
+        self._width, self._height = new_width, new_height
+
+    def _changed(
+        self,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        tile_id: int,
+        replaced: int,
+        area: int,
+    ) -> None:
+        if tile_id == EMPTY:
+            self._count -= replaced
+            if replaced:
+                self._bounds_stale = True
+        else:
+            self._count += area - replaced
+            self._grow_bounds(x, y, x + width - 1, y + height - 1)
+        if self.tile_changed.listeners:
+            for ty in range(y, y + height):
+                for tx in range(x, x + width):
+                    self.tile_changed.trigger((tx, ty))
+
+    def _grow_bounds(self, left: int, top: int, right: int, bottom: int) -> None:
+        if self._bounds_stale:
+            return
+        if self._bounds is None:
+            self._bounds = left, top, right, bottom
+        else:
+            min_x, min_y, max_x, max_y = self._bounds
+            self._bounds = (
+                min(min_x, left),
+                min(min_y, top),
+                max(max_x, right),
+                max(max_y, bottom),
+            )
+
+    def _scan_bounds(self) -> Optional[T_Bounds]:
+        if not self._count:
+            return None
+        width = self._width
+        min_x = min_y = max_x = max_y = None
+        for row in range(self._height):
+            ids = self._ids[row * width : (row + 1) * width]
+            if ids.count(EMPTY) == width:
+                continue
+            first = next(i for i, tile_id in enumerate(ids) if tile_id)
+            last = (
+                width
+                - 1
+                - next(i for i, tile_id in enumerate(reversed(ids)) if tile_id)
+            )
+            if min_y is None:
+                min_y, min_x, max_x = row, first, last
+            else:
+                min_x, max_x = min(min_x, first), max(max_x, last)
+            max_y = row
+        ox, oy = self._origin_x, self._origin_y
+        return min_x + ox, min_y + oy, max_x + ox, max_y + oy
+
+
+def _tile_span(ids: array) -> Tuple[int, int]:
+    """Get the indices of the first and last non-empty ids, first > last if
+    there are none."""
+    data = ids.tobytes()
+    size = ids.itemsize
+    # An id is non-empty if any of its bytes is, so the first and last
+    # non-zero bytes fall in the first and last non-empty ids
+    leading = len(data) - len(data.lstrip(b"\0"))
+    trailing = len(data) - len(data.rstrip(b"\0"))
+    return leading // size, len(ids) - 1 - trailing // size
+
+
+class _PaletteLookup(dict):
+    """Maps raw tile values to palette ids, resolving each value once."""
+
+    def __init__(self, tilemap: DenseTileMap, resolve):
+        super().__init__({None: EMPTY})
+        self._tilemap = tilemap
+        self._resolve = resolve
+
+    def __missing__(self, value: int) -> int:
+        tile_id = self[value] = self._tilemap.palette_id(self._resolve(value))
+        return tile_id
+
+
+class DenseTiles(MutableMapping):
+    """Dict-like view of a DenseTileMap, mapping (x, y) to tile objects."""
+
+    def __init__(self, tilemap: DenseTileMap):
+        self._map = tilemap
+
+    def __getitem__(self, tile: T_Tile) -> Any:
+        tile_id = self._map.get_id(tile[0], tile[1])
+        if tile_id == EMPTY:
+            raise KeyError(tile)
+        return self._map.palette[tile_id]
+
+    def get(self, tile: T_Tile, default: Any = None) -> Any:
+        tile_id = self._map.get_id(tile[0], tile[1])
+        return default if tile_id == EMPTY else self._map.palette[tile_id]
+
+    def __contains__(self, tile: object) -> bool:
+        return self._map.get_id(*tile) != EMPTY
+
+    def __setitem__(self, tile: T_Tile, obj: Any) -> None:
+        self._map.add_to_tile(tile, obj)
+
+    def __delitem__(self, tile: T_Tile) -> None:
+        if tile not in self:
+            raise KeyError(tile)
+        self._map.set_id(tile[0], tile[1], EMPTY)
+
+    def __len__(self) -> int:
+        return len(self._map)
+
+    def __iter__(self) -> Iterator[T_Tile]:
+        for tile, _ in self._iter_ids():
+            yield tile
+
+    def items(self) -> Iterator[Tuple[T_Tile, Any]]:
+        palette = self._map.palette
+        for tile, tile_id in self._iter_ids():
+            yield tile, palette[tile_id]
+
+    def _iter_ids(self) -> Iterator[Tuple[T_Tile, int]]:
+        tilemap = self._map
+        width = tilemap._width
+        for row in range(tilemap._height):
+            ids = tilemap._ids[row * width : (row + 1) * width]
+            if ids.count(EMPTY) == width:
+                continue
+            y = row + tilemap._origin_y
+            for col, tile_id in enumerate(ids):
+                if tile_id:
+                    yield (col + tilemap._origin_x, y), tile_id
@@ -0,0 +1,353 @@
+from array import array
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from concurrent import futures
+from typing import Any, Iterator, Optional, Tuple
+
+import pygame
+
+from gamelib.tiles.binary import TileGridFile
+from gamelib.tiles.tiles import T_Mapper, TileMap, tile_resolver
+
+T_Tile = Tuple[int, int]
+T_ChunkKey = Tuple[int, int]
+T_ChunkRange = Tuple[int, int, int, int]
+
+
+class StreamingTileMap(TileMap):
+    """TileMap that pages chunks of a binary tile grid in and out of memory.
+
+    Only the chunks around the focus passed to `update` are kept in memory.
+    Missing chunks are read from the TileGridFile on a background thread and
+    added on a later `update`, so the frame loop never waits on the disk;
+    tiles of a chunk that hasn't arrived yet read as empty. Chunks further
+    ahead in the direction the focus is moving are requested early, and once
+    more than `max_chunks` are loaded the least recently used chunks outside
+    the focus area are dropped. A loaded chunk costs about
+    `chunk_tiles * chunk_tiles * 4` bytes.
+
+    Values are resolved to tile objects with `mapper` and `ignore_values`, as
+    in `TileMap.from_csv`; each distinct value is resolved once, so a callable
+    `mapper` should return the same object for the same value. Tiles set
+    with `add_to_tile` are kept separately and survive their chunk being
+    dropped.
+
+    `tile_changed` is triggered for every tile of a chunk that is added or
+    dropped, so a ChunkedTileRenderer drawing this map stays up to date.
+
+    Attributes:
+        grid: File the chunks are read from. It must stay open until the
+            map is closed.
+        chunk_tiles: Width and height of a chunk, in tiles
+        max_chunks: Maximum number of chunks kept in memory, unless more are
+            needed to cover the focus area
+        margin: Chunks loaded around the focus area in every direction
+        prefetch: Chunks loaded ahead of the focus area while it moves
+        loads: Number of chunks read so far
+
+    Usage:
+        grid = TileGridFile("world.tiles")
+        world = StreamingTileMap(grid, mapper=tiles, ignore_values={0})
+        renderer = ChunkedTileRenderer(world)
+        # every frame
+        world.update(camera.view_rect)
+        renderer.draw(screen, camera.view_rect)
+    """
+
+    def __init__(
+        self,
+        grid: TileGridFile,
+        mapper: Optional[T_Mapper] = None,
+        ignore_values: Optional[set[int]] = None,
+        chunk_tiles: int = 32,
+        max_chunks: int = 64,
+        margin: int = 1,
+        prefetch: int = 2,
+    ) -> None:
+        self.grid = grid
+        self.chunk_tiles = chunk_tiles
+        self.max_chunks = max_chunks
+        self.margin = margin
+        self.prefetch = prefetch
+        self.loads = 0
+        self._resolve = tile_resolver(mapper, {grid.nodata} | set(ignore_values or ()))
+        self._values: dict[int, Any] = {}
+        self._chunks: OrderedDict[T_ChunkKey, list[array]] = OrderedDict()
+        self._pending: dict[T_ChunkKey, futures.Future] = {}
+        self._edits: dict[T_Tile, Any] = {}
+        self._focus: Optional[Tuple[float, float]] = None
+        self._keep: Optional[T_ChunkRange] = None
+        self._executor = futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="tile-stream"
+        )
+        super().__init__(grid.tilesize)
+
+    def __enter__(self) -> "StreamingTileMap":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the loader thread and drop every loaded chunk."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._pending.clear()
+        self._chunks.clear()
+
+    @property
+    def tiles(self) -> "StreamingTiles":
+        return StreamingTiles(self)
+
+    @tiles.setter
+    def tiles(self, tiles: dict[T_Tile, Any]) -> None:
+        self._edits.clear()
+        for tile, obj in tiles.items():
+            self.add_to_tile(tile, obj)
+
+    # ----- tiles -----
+
+    def get(self, x: int, y: int) -> Any:
+        """Get the tile at x, y, or None if it's empty or not loaded."""
+        if self._edits and (x, y) in self._edits:
+            return self._edits[x, y]
+        n = self.chunk_tiles
+        rows = self._chunks.get((x // n, y // n))
+        if rows is None:
+            return None
+        return self._value(rows[y % n][x % n])
+
+    def add_to_tile(self, tile: T_Tile, object: Any) -> "StreamingTiles":
+        """Set a tile, overriding the file; None clears it."""
+        self._edits[tile] = object
+        if self.tile_changed.listeners:
+            self.tile_changed.trigger(tile)
+        return self.tiles
+
+    def is_loaded(self, key: T_ChunkKey) -> bool:
+        return key in self._chunks
+
+    @property
+    def pending(self) -> int:
+        """Number of chunks requested but not added yet."""
+        return len(self._pending)
+
+    @property
+    def loaded_chunks(self) -> int:
+        return len(self._chunks)
+
+    # The map extends over the whole file, loaded or not
+    @property
+    def min_x(self) -> int:
+        return self.grid.origin[0]
+
+    @property
+    def min_y(self) -> int:
+        return self.grid.origin[1]
+
+    @property
+    def max_x(self) -> int:
+        return self.grid.origin[0] + self.grid.width - 1
+
+    @property
+    def max_y(self) -> int:
+        return self.grid.origin[1] + self.grid.height - 1
+
+    # ----- streaming -----
+
+    def chunk_range(self, view: pygame.Rect) -> T_ChunkRange:
+        """Inclusive (left, top, right, bottom) chunks overlapping `view`."""
+        size = self.chunk_tiles * self.tilesize
+        return (
+            view.left // size,
+            view.top // size,
+            (view.right - 1) // size,
+            (view.bottom - 1) // size,
+        )
+
+    def update(self, view: pygame.Rect) -> None:
+        """Page chunks in and out around the world-pixel rect `view`.
+
+        Adds the chunks that finished loading since the last call, requests
+        the ones that are missing, nearest first, and drops chunks over
+        the budget.
+        """
+        self._collect()
+
+        left, top, right, bottom = self.chunk_range(view)
+        margin = self.margin
+        keep = self._keep = (
+            left - margin,
+            top - margin,
+            right + margin,
+            bottom + margin,
+        )
+
+        # Extend the wanted area in the direction of travel
+        ahead = keep
+        center = view.center
+        if self._focus is not None and self.prefetch:
+            dx = center[0] - self._focus[0]
+            dy = center[1] - self._focus[1]
+            ahead = (
+                keep[0] - self.prefetch * (dx < 0),
+                keep[1] - self.prefetch * (dy < 0),
+                keep[2] + self.prefetch * (dx > 0),
+                keep[3] + self.prefetch * (dy > 0),
+            )
+        self._focus = center
+
+        chunks = self._chunks
+        for key in _keys(keep):
+            if key in chunks:
+                chunks.move_to_end(key)
+
+        # Requests the focus has moved away from are no longer worth reading
+        reach = self.margin + self.prefetch
+        reach = (left - reach, top - reach, right + reach, bottom + reach)
+        for key, future in list(self._pending.items()):
+            if not _contains(reach, key) and future.cancel():
+                del self._pending[key]
+
+        mid_x, mid_y = (left + right) / 2, (top + bottom) / 2
+        wanted = [
+            key
+            for key in _keys(ahead)
+            if key not in chunks and key not in self._pending and self._in_grid(key)
+        ]
+        wanted.sort(
+            key=lambda k: (
+                not _contains(keep, k),
+                abs(k[0] - mid_x) + abs(k[1] - mid_y),
+            )
+        )
+        for key in wanted:
+            self._pending[key] = self._executor.submit(self._read, key)
+
+        self._evict()
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Block until every requested chunk is loaded, then add them.
+
+        Useful behind a loading screen, before the first frame.
+        """
+        futures.wait(list(self._pending.values()), timeout)
+        self._collect()
+        self._evict()
+
+    def _read(self, key: T_ChunkKey) -> list[array]:
+        n = self.chunk_tiles
+        return self.grid.region(key[0] * n, key[1] * n, n, n)
+
+    def _in_grid(self, key: T_ChunkKey) -> bool:
+        n = self.chunk_tiles
+        return (
+            key[0] * n <= self.max_x
+            and key[0] * n + n > self.min_x
+            and key[1] * n <= self.max_y
+            and key[1] * n + n > self.min_y
+        )
+
+    def _collect(self) -> None:
+        for key, future in list(self._pending.items()):
+            if not future.done():
+                continue
+            del self._pending[key]
+            if future.cancelled():
+                continue
+            self._chunks[key] = future.result()
+            self.loads += 1
+            self._notify(key)
+
+    def _evict(self) -> None:
+        chunks = self._chunks
+        keep = self._keep
+        if keep is None or len(chunks) <= self.max_chunks:
+            return
+        for key in list(chunks):
+            if len(chunks) <= self.max_chunks:
+                break
+            if not _contains(keep, key):
+                self._notify(key)
+                del chunks[key]
+
+    def _notify(self, key: T_ChunkKey) -> None:
+        if not self.tile_changed.listeners:
+            return
+        for tile, _ in self._chunk_items(key, self._chunks[key]):
+            self.tile_changed.trigger(tile)
+
+    def _value(self, value: int) -> Any:
+        try:
+            return self._values[value]
+        except KeyError:
+            tile = self._values[value] = self._resolve(value)
+            return tile
+
+    def _chunk_items(
+        self, key: T_ChunkKey, rows: list[array]
+    ) -> Iterator[Tuple[T_Tile, Any]]:
+        n = self.chunk_tiles
+        start_x, start_y = key[0] * n, key[1] * n
+        for dy, row in enumerate(rows):
+            for dx, value in enumerate(row):
+                tile = self._value(value)
+                if tile is not None:
+                    yield (start_x + dx, start_y + dy), tile
+
+
+def _keys(chunk_range: T_ChunkRange) -> Iterator[T_ChunkKey]:
+    left, top, right, bottom = chunk_range
+    for cy in range(top, bottom + 1):
+        for cx in range(left, right + 1):
+            yield cx, cy
+
+
+def _contains(chunk_range: T_ChunkRange, key: T_ChunkKey) -> bool:
+    left, top, right, bottom = chunk_range
+    return left <= key[0] <= right and top <= key[1] <= bottom
+
+
+class StreamingTiles(MutableMapping):
+    """Dict-like view of the loaded tiles of a StreamingTileMap."""
+
+    def __init__(self, tilemap: StreamingTileMap):
+        self._map = tilemap
+
+    def __getitem__(self, tile: T_Tile) -> Any:
+        obj = self._map.get(tile[0], tile[1])
+        if obj is None:
+            raise KeyError(tile)
+        return obj
+
+    def get(self, tile: T_Tile, default: Any = None) -> Any:
+        obj = self._map.get(tile[0], tile[1])
+        return default if obj is None else obj
+
+    def __contains__(self, tile: object) -> bool:
+        return self._map.get(*tile) is not None
+
+    def __setitem__(self, tile: T_Tile, obj: Any) -> None:
+        self._map.add_to_tile(tile, obj)
+
+    def __delitem__(self, tile: T_Tile) -> None:
+        if tile not in self:
+            raise KeyError(tile)
+        self._map.add_to_tile(tile, None)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __iter__(self) -> Iterator[T_Tile]:
+        for tile, _ in self.items():
+            yield tile
+
+    def items(self) -> Iterator[Tuple[T_Tile, Any]]:
+        tilemap = self._map
+        edits = tilemap._edits
+        for key, rows in list(tilemap._chunks.items()):
+            for tile, obj in tilemap._chunk_items(key, rows):
+                if tile not in edits:
+                    yield tile, obj
+        for tile, obj in edits.items():
+            if obj is not None:
+                yield tile, obj
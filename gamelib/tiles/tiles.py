@@ -1,22 +1,76 @@
-from typing import Any, Tuple, Callable, Optional, Union
+from typing import Any, Iterable, Iterator, Sequence, Tuple, Callable, Optional, Union
 import csv
 
 import pygame
 
+from gamelib.mgmt.game_event import GameEvent
+
 T_TileMap = dict[Tuple[int, int], Any]
+T_Mapper = Union[dict[int, Any], Callable[[int], Any]]
+
+
+def _parse_cell(cell: str) -> Optional[int]:
+    cell = cell.strip()
+    if cell == "":
+        return None
+    try:
+        return int(cell)
+    except ValueError:
+        return None
+
+
+def read_csv_rows(csv_path: str, delimiter: str = ",") -> Iterator[list[Optional[int]]]:
+    """Yield each CSV row as a list of ints, None marking blank or bad cells.
+
+    Whole rows are converted at once with `map(int, ...)`; only rows with
+    blank or non-integer cells fall back to cell-by-cell parsing, and only
+    quoted rows go through the csv module.
+    """
+    with open(csv_path, newline="") as fh:
+        for line in fh:
+            line = line.rstrip("\r\n")
+            if not line:
+                yield []
+                continue
+            if '"' in line:
+                cells = next(csv.reader([line], delimiter=delimiter))
+            else:
+                cells = line.split(delimiter)
+            try:
+                yield list(map(int, cells))
+            except ValueError:
+                yield [_parse_cell(cell) for cell in cells]
+
+
+def tile_resolver(
+    mapper: Optional[T_Mapper], ignore_values: Optional[set[int]] = None
+) -> Callable[[int], Any]:
+    """Build the value -> tile function used when loading maps.
+
+    The function returns None for values that should not become tiles.
+    """
+    ignore = ignore_values or ()
+    if mapper is None:
+        return lambda val: None if val in ignore else val
+    if callable(mapper):
+        return lambda val: None if val in ignore else mapper(val)
+    # dict-like
+    return lambda val: None if val in ignore else mapper.get(val)
 
 
 class TileMap:
     def __init__(self, tilesize: int = 16) -> None:
         self.tilesize = tilesize
         self.tiles: dict[Tuple[int, int], Any] = {}
+        # Triggered with the tile coordinate whenever add_to_tile changes it
+        self.tile_changed = GameEvent()
 
     @classmethod
     def from_csv(
         cls,
         csv_path: str,
         tilesize: int = 16,
-        mapper: Optional[Union[dict[int, Any], Callable[[int], Any]]] = None,
+        mapper: Optional[T_Mapper] = None,
         delimiter: str = ",",
         start_pos: Tuple[int, int] = (0, 0),
         ignore_values: Optional[set[int]] = None,
@@ -31,43 +85,40 @@ class TileMap:
         - `ignore_values` can be used to skip specific integer values (e.g. {0}).
         Returns the internal tiles dict.
         """
-        sx, sy = start_pos
         tilemap = cls(tilesize=tilesize)
-        with open(csv_path, newline="") as fh:
-            reader = csv.reader(fh, delimiter=delimiter)
-            for y, row in enumerate(reader):
-                for x, cell in enumerate(row):
-                    cell = cell.strip()
-                    if cell == "":
-                        continue
-                    try:
-                        val = int(cell)
-                    except ValueError:
-                        continue
-                    if ignore_values and val in ignore_values:
-                        continue
-
-                    obj: Any
-                    if mapper is None:
-                        obj = val
-                    elif callable(mapper):
-                        obj = mapper(val)
-                    else:
-                        # dict-like
-                        if val not in mapper:
-                            continue
-                        obj = mapper[val]
-
-                    if obj is None:
-                        continue
-
-                    coord = (sx + x, sy + y)
-                    tilemap.add_to_tile(coord, obj)
-
+        tilemap.add_rows(
+            read_csv_rows(csv_path, delimiter), start_pos, mapper, ignore_values
+        )
         return tilemap
 
+    def add_rows(
+        self,
+        rows: Iterable[Sequence[Optional[int]]],
+        start_pos: Tuple[int, int] = (0, 0),
+        mapper: Optional[T_Mapper] = None,
+        ignore_values: Optional[set[int]] = None,
+    ) -> T_TileMap:
+        """Add a grid of integer tile values, with `from_csv`'s mapping rules.
+
+        None values (blank cells) are skipped, like values that are ignored
+        or that `mapper` maps to nothing.
+        """
+        sx, sy = start_pos
+        resolve = tile_resolver(mapper, ignore_values)
+        add = self.add_to_tile
+        for y, row in enumerate(rows, sy):
+            for x, val in enumerate(row, sx):
+                if val is None:
+                    continue
+                obj = resolve(val)
+                if obj is not None:
+                    add((x, y), obj)
+        return self.tiles
+
     def add_to_tile(self, tile: Tuple[int, int], object: Any) -> T_TileMap:
         self.tiles[tile] = object
+        if self.tile_changed.listeners:
+            self.tile_changed.trigger(tile)
         return self.tiles
 
     def add_to_tiles(self, tiles: list[Tuple[int, int]], object: Any) -> T_TileMap:
@@ -108,12 +159,13 @@ class TileMap:
         surface = pygame.Surface(
             (self.tilesize * width, self.tilesize * height), pygame.SRCALPHA
         )
+        min_x, min_y = self.min_x, self.min_y
         for coords, tile_sprite in self.tiles.items():
             if not isinstance(tile_sprite, pygame.Surface):
                 continue
             pos = (
-                (coords[0] - self.min_x) * self.tilesize,
-                (coords[1] - self.min_y) * self.tilesize,
+                (coords[0] - min_x) * self.tilesize,
+                (coords[1] - min_y) * self.tilesize,
             )
             surface.blit(tile_sprite, pos)
         return surface
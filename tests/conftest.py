@@ -0,0 +1,17 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import esper  # noqa: E402
+import pytest  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def clean_world():
+    """Give every test an empty esper world without processors."""
+    esper.clear_database()
+    esper._processors.clear()
+    yield
+    esper.clear_database()
+    esper._processors.clear()
@@ -0,0 +1,74 @@
+import pygame
+import pytest
+
+from gamelib.ecs.rendering import RenderSurfaceComponent
+from gamelib.mgmt.assets import AssetCache, default_asset_cache, pack_atlas
+
+
+def _image(path, size, color):
+    pygame.display.set_mode((1, 1))
+    image = pygame.Surface(size, pygame.SRCALPHA)
+    image.fill(color)
+    pygame.image.save(image, str(path))
+    return str(path)
+
+
+def test_asset_cache_shares_and_unloads_by_owner(tmp_path):
+    """Images are decoded once per path and mode and refcounted per owner.
+
+    - Loading the same path again returns the same surface
+    - Alpha and opaque conversions are cached separately
+    - unload drops an owner's references; shared images stay cached
+    """
+    path = _image(tmp_path / "enemy.png", (4, 4), (255, 0, 0, 128))
+    cache = AssetCache()
+    first = cache.load(path, owner="level1")
+    assert cache.load(path, owner="level1") is first
+    assert cache.load(path, owner="level2") is first
+    assert cache.decodes == 1 and cache.refcount(path) == 3
+
+    opaque = cache.load(path, alpha=False, owner="level1")
+    assert opaque is not first and cache.decodes == 2
+
+    assert cache.unload("level1") == 1  # only the opaque image is unused now
+    assert cache.is_loaded(path) and not cache.is_loaded(path, alpha=False)
+    cache.release(path, owner="level2")
+    assert len(cache) == 0
+    with pytest.raises(KeyError):
+        cache.release(path, owner="level2")
+
+    component = RenderSurfaceComponent.from_image(path, transparent_pixels=True)
+    assert RenderSurfaceComponent.from_image(path, True).surface is component.surface
+    default_asset_cache.unload(None)
+    private = RenderSurfaceComponent.from_image(path, True, shared=False)
+    assert private.surface.get_at((0, 0)) == (255, 0, 0, 128)
+    assert not default_asset_cache.is_loaded(path, True)
+
+
+def test_pack_returns_subsurfaces_of_shared_pages(tmp_path):
+    colors = [(255, 0, 0, 255), (0, 255, 0, 128), (0, 0, 255, 255)]
+    paths = [
+        _image(tmp_path / f"icon{i}.png", (10 + i, 10), color)
+        for i, color in enumerate(colors)
+    ]
+    cache = AssetCache()
+    icons = cache.pack(paths + paths[:1], owner="hud")
+    pages = {icon.get_parent() for icon in icons.values()}
+    assert len(pages) == 1 and None not in pages
+    for path, color in zip(paths, colors):
+        assert icons[path].get_at((5, 5)) == color
+    assert cache.load(paths[1]) is icons[paths[1]]
+    assert cache.decodes == 3 and cache.refcount(paths[0]) == 2
+
+    images = {i: pygame.Surface((30, 20)) for i in range(7)}  # 6 fit a page
+    packed = pack_atlas(images, alpha=False, page_size=64, padding=2)
+    assert len({id(page) for page, _ in packed.values()}) == 2
+    for key, (page, rect) in packed.items():
+        assert page.get_rect().contains(rect)
+        assert not any(
+            rect.colliderect(other)
+            for other_key, (other_page, other) in packed.items()
+            if other_key != key and other_page is page
+        )
+    with pytest.raises(ValueError):
+        pack_atlas({"big": pygame.Surface((65, 1))}, page_size=64)
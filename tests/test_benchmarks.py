@@ -0,0 +1,13 @@
+import json
+
+from benchmarks import compare, run
+
+
+def test_benchmarks_run_and_compare(tmp_path):
+    """Every case runs at the smallest size and two runs can be compared."""
+    output = tmp_path / "results.json"
+    assert run.main(["--sizes", "100", "--repeats", "1", "--output", str(output)]) == 0
+
+    results = json.loads(output.read_text())["results"]
+    assert {r["case"] for r in results} == set(run.CASES)
+    assert compare.main([str(output), str(output)]) == 0
@@ -0,0 +1,53 @@
+import esper
+import pygame
+
+from gamelib.ecs.camera import CameraComponent, CameraProcessor
+from gamelib.ecs.geometry import PositionComponent
+from gamelib.ecs.rendering import RenderSurfaceComponent, RenderSurfaceProcessor
+
+
+def test_camera_follows_target_within_bounds():
+    player = esper.create_entity(PositionComponent(50, 50))
+    camera = CameraComponent(100, 80, bounds=pygame.Rect(0, 0, 400, 300), target=player)
+    esper.create_entity(camera)
+
+    CameraProcessor().process(1 / 60)
+    assert (camera.x, camera.y) == (0, 10)
+
+    esper.component_for_entity(player, PositionComponent).x = 200
+    CameraProcessor().process(1 / 60)
+    assert camera.view_rect == pygame.Rect(150, 10, 100, 80)
+    assert camera.screen_to_world(*camera.world_to_screen(7, 9)) == (7, 9)
+
+
+def test_render_processor_culls_and_transforms_through_camera():
+    """Only sprites inside the viewport are drawn, at camera-relative spots.
+
+    - Static sprites are found through the grid, moving ones by rect test
+    - Zoom scales both positions and surfaces
+    """
+    screen = pygame.Surface((100, 100))
+    camera = CameraComponent(100, 100, x=1000, y=1000)
+    processor = RenderSurfaceProcessor(screen, camera=camera, cell_size=64)
+    sprite = pygame.Surface((10, 10))
+    sprite.fill((255, 0, 0))
+    for i in range(50):
+        esper.create_entity(
+            PositionComponent(i * 40, 0), RenderSurfaceComponent(sprite, static=True)
+        )
+    esper.create_entity(PositionComponent(1010, 1010), RenderSurfaceComponent(sprite))
+    esper.create_entity(
+        PositionComponent(1050, 1020), RenderSurfaceComponent(sprite, static=True)
+    )
+
+    processor.process(0)
+    assert processor.visible_count == 2
+    assert screen.get_at((15, 15)) == pygame.Color(255, 0, 0)
+    assert screen.get_at((55, 25)) == pygame.Color(255, 0, 0)
+
+    screen.fill((0, 0, 0))
+    camera.zoom = 2
+    processor.process(0)
+    assert processor.visible_count == 1
+    assert screen.get_at((39, 39)) == pygame.Color(255, 0, 0)
+    assert screen.get_at((41, 41)) == pygame.Color(0, 0, 0)
@@ -0,0 +1,244 @@
+import esper
+
+from gamelib.ecs.broadphase import SweepAndPruneBroadPhase, signature_of
+from gamelib.ecs.collision import (
+    ColliderComponent,
+    CollisionProcessor,
+    SpatialHashProcessor,
+)
+from gamelib.ecs.geometry import PositionComponent
+from gamelib.ecs.layers import CollisionMatrix
+
+
+def _spawn(x, y, size=10, **kwargs):
+    return esper.create_entity(
+        PositionComponent(x, y), ColliderComponent(size, size, **kwargs)
+    )
+
+
+def _collect(processor):
+    hits = set()
+    processor.add_listener(
+        lambda event: hits.add(frozenset((event.entity_a, event.entity_b)))
+    )
+    return hits
+
+
+def test_spatial_hash_matches_brute_force():
+    """Spatial hash reports the same pairs as the brute force processor,
+    including pairs that share several cells."""
+    for i in range(40):
+        _spawn((i * 37) % 300, (i * 53) % 300, size=20 + i % 50)
+
+    brute = CollisionProcessor()
+    hashed = SpatialHashProcessor(cell_size=32)
+    brute_hits = _collect(brute)
+    hashed_hits = _collect(hashed)
+    brute.process(0)
+    hashed.process(0)
+
+    assert brute_hits
+    assert hashed_hits == brute_hits
+
+
+def test_spatial_hash_grid_persists_and_tracks_changes():
+    """The grid survives between frames, re-buckets movers and drops removed
+    colliders."""
+    processor = SpatialHashProcessor(cell_size=16)
+    hits = _collect(processor)
+    a = _spawn(0, 0)
+    b = _spawn(100, 100)
+
+    processor.process(0)
+    grid = processor.broad_phase.grids[(0, 0)].cells
+    assert not hits
+    assert a in grid[(0, 0)]
+
+    esper.component_for_entity(b, PositionComponent).x = 5
+    esper.component_for_entity(b, PositionComponent).y = 5
+    processor.process(0)
+    assert processor.broad_phase.grids[(0, 0)].cells is grid
+    assert hits == {frozenset((a, b))}
+    assert all(b not in cell for (x, _), cell in grid.items() if x > 1)
+
+    esper.remove_component(a, ColliderComponent)
+    processor.process(0)
+    assert all(a not in cell for cell in grid.values())
+
+
+def test_sweep_and_prune_matches_brute_force_across_frames():
+    """Sweep and prune keeps its order between frames and still reports the
+    same pairs as brute force while colliders move, appear and disappear."""
+    entities = [
+        _spawn((i * 37) % 300, (i * 53) % 300, size=20 + i % 50) for i in range(40)
+    ]
+    brute = CollisionProcessor()
+    swept = CollisionProcessor(broad_phase=SweepAndPruneBroadPhase())
+    brute_hits = _collect(brute)
+    swept_hits = _collect(swept)
+
+    for frame in range(5):
+        for i, entity in enumerate(entities):
+            position = esper.component_for_entity(entity, PositionComponent)
+            position.x += (i % 7 - 3) * 4
+            position.y -= (i % 5 - 2) * 4
+        if frame == 2:
+            esper.delete_entity(entities.pop(), immediate=True)
+            entities.append(_spawn(150, 150, size=60))
+        brute_hits.clear()
+        swept_hits.clear()
+        brute.process(0)
+        swept.process(0)
+        assert swept_hits == brute_hits
+
+    order = swept.broad_phase.orders[(0, 0)]
+    lefts = [collider.rect.left for _, collider in order]
+    assert lefts == sorted(lefts)
+    assert len(order) == len(entities)
+
+
+def test_sweep_and_prune_moves_retagged_colliders_out_of_populated_buckets():
+    """A retagged collider leaves its old bucket even when that bucket keeps
+    other members, so it is neither paired with itself nor with colliders
+    that ignore its new tag."""
+    a = _spawn(0, 0, tags={"player"})
+    _spawn(5, 5, tags={"wall"}, ignore_tags={"enemy"})
+    c = _spawn(100, 100, tags={"player"})
+    processor = CollisionProcessor(broad_phase=SweepAndPruneBroadPhase())
+    hits = []
+    processor.add_listener(lambda e: hits.append((e.entity_a, e.entity_b)))
+    processor.process(0)
+    assert len(hits) == 1
+
+    esper.component_for_entity(a, ColliderComponent).tags = {"enemy"}
+    hits.clear()
+    processor.process(0)
+    assert hits == []
+    orders = processor.broad_phase.orders
+    player_signature = signature_of(esper.component_for_entity(c, ColliderComponent))
+    assert [entity for entity, _ in orders[player_signature]] == [c]
+    assert sum(len(order) for order in orders.values()) == 3
+
+
+def test_layer_matrix_and_ignore_tags_skip_pairs_before_enumeration():
+    """Buckets that cannot interact are never paired by any broad phase, and
+    reassigning tags moves a collider to its new bucket."""
+    bullet = _spawn(0, 0, tags={"enemy_bullet"})
+    enemy = _spawn(0, 0, tags={"enemy"})
+    player = _spawn(0, 0, tags={"player"}, ignore_tags={"wall"})
+    wall = _spawn(0, 0, tags={"wall"})
+    matrix = CollisionMatrix()
+    matrix.ignore("enemy_bullet", "enemy")
+
+    for broad_phase in (
+        SpatialHashProcessor(layer_matrix=matrix).broad_phase,
+        SweepAndPruneBroadPhase(),
+        None,
+    ):
+        processor = CollisionProcessor(broad_phase=broad_phase, layer_matrix=matrix)
+        hits = _collect(processor)
+        processor.process(0)
+        assert frozenset((bullet, enemy)) not in hits
+        assert frozenset((player, wall)) not in hits
+        assert frozenset((bullet, player)) in hits
+        assert len(hits) == 4
+
+    collider = esper.component_for_entity(enemy, ColliderComponent)
+    collider.tags = {"ally"}
+    hits.clear()
+    processor.process(0)
+    assert frozenset((bullet, enemy)) in hits
+
+
+def test_contact_cache_reports_transitions_and_recycles_events():
+    """A resting contact begins once, persists, ends once, and its event
+    object is reused for the next contact."""
+    processor = CollisionProcessor(transitions_only=True)
+    every_frame, began, ended, separated = [], [], [], []
+    processor.add_listener(lambda event: every_frame.append(event.phase))
+    processor.on_collision_begin(began.append)
+    processor.on_collision_end(ended.append)
+    a = _spawn(0, 0, on_collision_end=lambda *args: separated.append(args))
+    b = _spawn(5, 5)
+
+    for _ in range(3):
+        processor.process(0)
+    assert every_frame == ["begin"]
+    assert len(began) == 1 and not ended
+    assert processor.contacts[(a, b)].phase == "persist"
+
+    esper.component_for_entity(b, PositionComponent).x = 100
+    processor.process(0)
+    assert len(ended) == 1 and ended[0].phase == "end"
+    assert separated == [(a, b, set())]
+    assert not processor.contacts
+
+    esper.component_for_entity(b, PositionComponent).x = 0
+    processor.process(0)
+    assert began[1] is began[0]
+
+
+def test_static_colliders_are_indexed_once_and_never_paired_together():
+    """Statics keep the rect they were indexed with, never collide with each
+    other, and are still hit by dynamic colliders."""
+    processor = SpatialHashProcessor(cell_size=16)
+    hits = _collect(processor)
+    wall_a = _spawn(0, 0, size=40, static=True)
+    wall_b = _spawn(20, 20, size=40, static=True)
+    player = _spawn(100, 100)
+
+    processor.process(0)
+    assert not hits
+    assert set(processor.static_index.colliders) == {wall_a, wall_b}
+    assert set(processor.broad_phase.colliders) == {player}
+
+    # Moving a static's position is not picked up; moving the player is
+    esper.component_for_entity(wall_a, PositionComponent).x = 100
+    esper.component_for_entity(player, PositionComponent).x = 50
+    esper.component_for_entity(player, PositionComponent).y = 50
+    processor.process(0)
+    assert hits == {frozenset((player, wall_b))}
+
+
+def test_colliders_are_only_resplit_when_they_change(monkeypatch):
+    """esper.process() clears esper's query cache every frame; the processor
+    still only re-splits colliders after one is added or removed."""
+    processor = CollisionProcessor()
+    splits = []
+    split = processor._split_static
+    monkeypatch.setattr(processor, "_split_static", lambda c: splits.append(split(c)))
+    hits = _collect(processor)
+    esper.add_processor(processor)
+    try:
+        wall = _spawn(0, 0, size=40, static=True)
+        for _ in range(5):
+            esper.process(0)
+        assert len(splits) == 1
+
+        player = _spawn(10, 10)
+        esper.process(0)
+        esper.process(0)
+        assert len(splits) == 2 and hits == {frozenset((player, wall))}
+
+        esper.delete_entity(player)
+        esper.process(0)
+        esper.process(0)
+        assert len(splits) == 3
+        assert set(processor.broad_phase.colliders) == set()
+    finally:
+        esper.remove_processor(CollisionProcessor)
+
+
+def test_spatial_hash_processor_forwards_collision_options():
+    processor = SpatialHashProcessor(
+        cell_size=16, contact_details=True, static_cell_size=128
+    )
+    assert processor.contact_details and processor.static_index.cell_size == 128
+    events = []
+    processor.add_listener(events.append)
+    _spawn(0, 0)
+    _spawn(6, 0)
+    processor.process(0)
+    (event,) = events
+    assert event.overlap_area == 40
+    assert event.overlap_center == (8.0, 5.0)
@@ -0,0 +1,56 @@
+import esper
+import pygame
+import pytest
+from esper import Processor
+
+from gamelib.ecs.geometry import PositionComponent
+from gamelib.mgmt import FixedStepScene
+
+
+class RecordingProcessor(Processor):
+    def __init__(self):
+        super().__init__()
+        self.dts = []
+
+    def process(self, dt):
+        self.dts.append(dt)
+
+
+def test_fixed_step_scene_schedules_processors():
+    """Fixed steps are independent of frame timing.
+
+    - A 60 Hz processor runs once per step, a 20 Hz one every third step
+    - A processor without a rate runs once per frame with the frame dt
+    - Backlog beyond max_steps is dropped and alpha reflects the remainder
+    """
+    scene = FixedStepScene(pygame.Surface((1, 1)), step_hz=60, max_steps=4)
+    every_step, slow, frame = (RecordingProcessor() for _ in range(3))
+    scene.add_processor(every_step, hz=60)
+    scene.add_processor(slow, hz=20)
+    scene.add_processor(frame)
+
+    for dt in (1 / 30, 1 / 120, 1 / 120, 1 / 60, 1 / 30):
+        scene.update([], None, dt)
+
+    assert scene.tick == 6
+    assert every_step.dts == pytest.approx([1 / 60] * 6)
+    assert slow.dts == pytest.approx([1 / 20] * 2)
+    assert frame.dts == pytest.approx([1 / 30, 1 / 120, 1 / 120, 1 / 60, 1 / 30])
+    assert scene.get_processor(RecordingProcessor) is every_step
+
+    scene.update([], None, 0.1 + 1 / 240)
+    assert scene.tick == 10
+    assert scene.dropped_time == pytest.approx(2 / 60)
+    assert scene.alpha == pytest.approx(0.25)
+
+
+def test_fixed_step_scene_applies_deferred_deletes():
+    """Entities deleted without `immediate` are gone after the next step."""
+    scene = FixedStepScene(pygame.Surface((1, 1)), step_hz=60)
+    entity = esper.create_entity(PositionComponent(0, 0))
+    esper.delete_entity(entity)
+
+    scene.update([], None, 1 / 120)
+    assert esper.component_for_entity(entity, PositionComponent)
+    scene.update([], None, 1 / 120)
+    assert esper.get_component(PositionComponent) == []
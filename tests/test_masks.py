@@ -0,0 +1,64 @@
+import esper
+import pygame
+
+from gamelib.ecs.collision import ColliderComponent, CollisionProcessor
+from gamelib.ecs.geometry import PositionComponent
+from gamelib.ecs.masks import MaskCache
+
+
+def _disc(radius=8):
+    surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    pygame.draw.circle(surface, (255, 255, 255), (radius, radius), radius)
+    return surface
+
+
+def test_mask_cache_shares_masks_by_identity_and_key():
+    """Colliders from the same surface share one mask; explicit keys share
+    masks across identical surfaces; LRU evicts beyond max_size."""
+    cache = MaskCache(max_size=2)
+    surface = _disc()
+    first = ColliderComponent.from_surface(surface, use_mask=True, mask_cache=cache)
+    second = ColliderComponent.from_surface(surface, use_mask=True, mask_cache=cache)
+    assert first.mask is second.mask
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    copy = surface.copy()
+    assert cache.get(copy, MaskCache.content_key(copy)) is cache.get(
+        surface.copy(), MaskCache.content_key(surface)
+    )
+
+    cache.get(_disc(4), "small")
+    assert len(cache) == 2
+
+    del surface, first, second
+    cache.get(copy, "other")
+    assert len(cache) <= 2
+
+
+def test_pixel_perfect_contact_details():
+    """Pixel-perfect hits report area and a normal from one overlap call and
+    bounding-box-only overlaps of the discs are rejected."""
+    processor = CollisionProcessor(pixel_perfect=True, contact_details=True)
+    events = []
+    processor.add_listener(
+        lambda e: events.append((e.overlap_area, e.normal, e.overlap_center))
+    )
+    disc = _disc()
+    esper.create_entity(
+        PositionComponent(0, 0), ColliderComponent.from_surface(disc, use_mask=True)
+    )
+    other = esper.create_entity(
+        PositionComponent(14, 14), ColliderComponent.from_surface(disc, use_mask=True)
+    )
+
+    processor.process(0)
+    assert not events
+
+    esper.component_for_entity(other, PositionComponent).x = 10
+    esper.component_for_entity(other, PositionComponent).y = 0
+    processor.process(0)
+    ((area, normal, center),) = events
+    assert area > 0
+    assert normal[0] > 0.9
+    assert center[0] > 8
+    assert next(iter(processor.contacts.values())).overlap_point is None
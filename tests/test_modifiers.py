@@ -0,0 +1,125 @@
+import esper
+
+from gamelib.ecs.geometry import VelocityComponent
+from gamelib.ecs.modifiers.modifier import (
+    Modifier,
+    ModifierContainer,
+    ModifierProcessor,
+    add_modifier,
+    get_active_modifiers,
+    modifier_events,
+    remove_modifier,
+)
+from gamelib.ecs.modifiers.speed_modifier import SpeedModifier
+
+
+class Regeneration(Modifier):
+    def __init__(self):
+        super().__init__("Regeneration", -1)
+        self.ticks = 0
+
+    def on_update(self, entity, dt):
+        self.ticks += 1
+        return self.ticks < 3
+
+
+def test_modifiers_expire_on_schedule_and_report_events():
+    """Modifiers are indexed by name and expire without polling.
+
+    - Timed modifiers expire after their duration, refreshes extend them
+    - Only modifiers overriding on_update are updated every frame
+    - Every change is reported through modifier_events
+    """
+    events = []
+
+    def listener(event, entity, modifier):
+        events.append((event, modifier.name))
+
+    modifier_events.add_listener(listener)
+    try:
+        processor = ModifierProcessor()
+        esper.add_processor(processor)
+        player = esper.create_entity(VelocityComponent((1, 0)))
+
+        add_modifier(player, SpeedModifier(duration=1.0, multiplier=3))
+        add_modifier(player, Regeneration())
+        add_modifier(player, Modifier("Shield", -1))
+        assert esper.component_for_entity(player, VelocityComponent).multiplier == 3
+
+        processor.process(0.75)
+        assert list(processor._updating) == [(player, "Regeneration")]
+        add_modifier(player, SpeedModifier(duration=1.0))
+        processor.process(0.75)
+        assert get_active_modifiers(player)[0]["time_remaining"] == 0.25
+
+        processor.process(0.5)
+        names = {m["name"] for m in get_active_modifiers(player)}
+        assert names == {"Shield"}
+        assert esper.component_for_entity(player, VelocityComponent).multiplier == 1
+
+        remove_modifier(player, "Shield")
+        assert events == [
+            ("applied", "Speed Boost"),
+            ("applied", "Regeneration"),
+            ("applied", "Shield"),
+            ("refreshed", "Speed Boost"),
+            ("expired", "Speed Boost"),
+            ("expired", "Regeneration"),
+            ("removed", "Shield"),
+        ]
+    finally:
+        modifier_events.remove_listener(listener)
+        esper.remove_processor(ModifierProcessor)
+
+
+def test_modifier_containers_are_tracked_through_esper_process():
+    """Containers are only scanned when they are added or removed.
+
+    - Frames without changes don't re-track any modifier
+    - A removed container's modifiers stop expiring until it's added back
+    """
+    processor = ModifierProcessor()
+    tracked = []
+    track = processor.track
+    processor.track = lambda ent, modifier: (
+        tracked.append(modifier.name),
+        track(ent, modifier),
+    )
+    player = esper.create_entity(VelocityComponent((1, 0)))
+    add_modifier(player, SpeedModifier(duration=1.0, multiplier=3))
+    esper.add_processor(processor)
+    try:
+        esper.process(0.25)
+        esper.process(0.25)
+        assert tracked == ["Speed Boost"]
+
+        container = esper.component_for_entity(player, ModifierContainer)
+        esper.remove_component(player, ModifierContainer)
+        esper.process(1)
+        assert "Speed Boost" in container.by_name
+
+        esper.add_component(player, container)
+        esper.process(0.25)
+        assert get_active_modifiers(player)[0]["time_remaining"] == 0.25
+        esper.process(0.25)
+        assert get_active_modifiers(player) == []
+        assert tracked == ["Speed Boost", "Speed Boost"]
+    finally:
+        esper.remove_processor(ModifierProcessor)
+
+
+def test_unregistered_processor_schedules_modifiers_added_later():
+    """A processor run by hand, as a FixedStepScene does, picks up modifiers
+    added to a container it already knows."""
+    processor = ModifierProcessor()
+    player = esper.create_entity()
+    add_modifier(player, Modifier("Shield", 1.0))
+    processor.process(0.5)
+
+    add_modifier(player, Modifier("Haste", 1.0))
+    container = esper.component_for_entity(player, ModifierContainer)
+    assert [m.name for m in container.modifiers] == ["Shield", "Haste"]
+    processor.process(0.25)
+    assert [m["time_remaining"] for m in get_active_modifiers(player)] == [0.25, 0.75]
+    processor.process(1)
+    assert get_active_modifiers(player) == []
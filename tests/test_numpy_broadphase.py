@@ -0,0 +1,52 @@
+import esper
+import pytest
+
+from gamelib.ecs.collision import ColliderComponent, CollisionProcessor
+from gamelib.ecs.geometry import PositionComponent
+
+pytest.importorskip("numpy")
+
+from gamelib.ecs.numpy_broadphase import NumpyBroadPhase  # noqa: E402
+
+
+def test_numpy_broad_phase_matches_brute_force():
+    """The vectorized engine reports exactly the hits brute force reports,
+    tag filtering included, even when swept in several small batches."""
+    for i in range(120):
+        tags = {"bullet"} if i % 3 == 0 else {"enemy"}
+        ignore = {"bullet"} if i % 3 == 0 else set()
+        esper.create_entity(
+            PositionComponent((i * 37) % 400, (i * 53) % 400),
+            ColliderComponent(10 + i % 40, 10 + i % 30, tags=tags, ignore_tags=ignore),
+        )
+
+    brute = CollisionProcessor()
+    vectorized = CollisionProcessor(broad_phase=NumpyBroadPhase(max_pairs=16))
+    brute_hits, vectorized_hits = set(), set()
+    brute.add_listener(lambda e: brute_hits.add(frozenset((e.entity_a, e.entity_b))))
+    vectorized.add_listener(
+        lambda e: vectorized_hits.add(frozenset((e.entity_a, e.entity_b)))
+    )
+    brute.process(0)
+    vectorized.process(0)
+
+    assert brute_hits
+    assert vectorized_hits == brute_hits
+
+
+def test_numpy_broad_phase_skips_empty_rects_like_pygame():
+    """Exact pairs must match colliderect, which rejects empty rects."""
+    esper.create_entity(PositionComponent(0, 0), ColliderComponent(53, 51))
+    esper.create_entity(PositionComponent(10, 10), ColliderComponent(0, 11))
+    esper.create_entity(PositionComponent(10, 10), ColliderComponent(11, 0))
+    esper.create_entity(PositionComponent(5, 5), ColliderComponent(4, 4))
+
+    brute = CollisionProcessor()
+    vectorized = CollisionProcessor(broad_phase=NumpyBroadPhase())
+    brute_hits, vectorized_hits = [], []
+    brute.add_listener(lambda e: brute_hits.append({e.entity_a, e.entity_b}))
+    vectorized.add_listener(lambda e: vectorized_hits.append({e.entity_a, e.entity_b}))
+    brute.process(0)
+    vectorized.process(0)
+
+    assert brute_hits == vectorized_hits == [{1, 4}]
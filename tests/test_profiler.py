@@ -0,0 +1,65 @@
+import esper
+import pygame
+
+from gamelib.ecs.collision import ColliderComponent, CollisionProcessor
+from gamelib.ecs.geometry import MoveProcessor, PositionComponent, VelocityComponent
+from gamelib.ecs.profiler import ProcessorProfiler
+from gamelib.ecs.timer import TimerProcessor
+
+
+def test_profiler_records_and_unwraps():
+    """Profiling wraps processors only while enabled.
+
+    - Each frame records a time and a queried-entity count per processor
+    - The overlay renders to a blittable surface
+    - Disabling restores the original process methods and esper queries
+    """
+    for i in range(5):
+        esper.create_entity(PositionComponent(i, i), VelocityComponent((1, 0)))
+    esper.add_processor(MoveProcessor())
+    esper.add_processor(TimerProcessor())
+    try:
+        get_components = esper.get_components
+
+        profiler = ProcessorProfiler(history=3)
+        profiler.enable()
+        for _ in range(5):
+            esper.process(1)
+            profiler.end_frame(1 / 60)
+
+        assert len(profiler.timings["MoveProcessor"]) == 3
+        stats = {s.name: s for s in profiler.stats()}
+        assert stats["MoveProcessor"].entities == 5
+        assert stats["TimerProcessor"].entities == 0
+        assert stats["MoveProcessor"].p50 <= stats["MoveProcessor"].p99
+        pygame.font.init()
+        assert isinstance(profiler.overlay(pygame.font.Font(None, 14)), pygame.Surface)
+
+        profiler.disable()
+        assert esper.get_components is get_components
+        assert "process" not in vars(esper.get_processor(MoveProcessor))
+        esper.process(1)
+        profiler.end_frame()
+        assert profiler.timings["MoveProcessor"][-1] == 0
+    finally:
+        esper.remove_processor(MoveProcessor)
+        esper.remove_processor(TimerProcessor)
+
+
+def test_profiler_counts_cached_working_sets():
+    """Processors that cache their queries report their entity_count, so
+    the count doesn't drop to 0 once their cache is warm."""
+    for i in range(4):
+        esper.create_entity(PositionComponent(i * 10, 0), ColliderComponent(4, 4))
+    esper.add_processor(CollisionProcessor())
+    try:
+        profiler = ProcessorProfiler(history=5)
+        profiler.enable()
+        for _ in range(5):
+            esper.process(1)
+            profiler.end_frame()
+        assert list(profiler.entity_counts["CollisionProcessor"]) == [4] * 5
+        assert profiler.stats()[0].entities == 4
+        profiler.disable()
+    finally:
+        esper.remove_processor(CollisionProcessor)
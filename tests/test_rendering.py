@@ -0,0 +1,113 @@
+import esper
+import pygame
+
+from gamelib.ecs.geometry import PositionComponent, VelocityComponent
+from gamelib.ecs.rendering import (
+    RectSpriteComponent,
+    RenderRectProcessor,
+    RenderSurfaceComponent,
+    RenderSurfaceProcessor,
+)
+
+
+def _solid(color):
+    surface = pygame.Surface((4, 4))
+    surface.fill(color)
+    return surface
+
+
+def test_render_surface_processor_draws_layers_in_order():
+    """Higher layers are drawn on top, and layer changes are picked up.
+
+    - Overlapping sprites on layers 2 and -1 are created out of order
+    - The higher layer wins; swapping layers swaps the visible sprite
+    """
+    screen = pygame.Surface((8, 8))
+    processor = RenderSurfaceProcessor(screen)
+    top = RenderSurfaceComponent(_solid((255, 0, 0)), layer=2)
+    bottom = RenderSurfaceComponent(_solid((0, 0, 255)), layer=-1)
+    esper.create_entity(PositionComponent(0, 0), top)
+    esper.create_entity(PositionComponent(0, 0), bottom)
+
+    processor.process(0)
+    assert processor.layers == [-1, 2]
+    assert screen.get_at((1, 1)) == pygame.Color(255, 0, 0)
+
+    bottom.layer = 3
+    processor.process(0)
+    assert processor.layers == [2, 3]
+    assert screen.get_at((1, 1)) == pygame.Color(0, 0, 255)
+
+
+def test_render_surface_processor_rebuckets_only_on_changes():
+    """Frames run through esper.process() reuse the buckets until a
+    renderable is added or removed, even when esper's cache is cleared."""
+    processor = RenderSurfaceProcessor(pygame.Surface((8, 8)))
+    esper.add_processor(processor)
+    try:
+        entity = esper.create_entity(
+            PositionComponent(0, 0), RenderSurfaceComponent(_solid((255, 0, 0)))
+        )
+        unrelated = esper.create_entity(VelocityComponent((1, 0)))
+        esper.process(0)
+        buckets = processor._buckets
+        esper.delete_entity(unrelated)
+        esper.process(0)
+        assert processor._buckets is buckets
+
+        esper.create_entity(
+            PositionComponent(4, 4), RenderSurfaceComponent(_solid((0, 0, 255)))
+        )
+        esper.delete_entity(entity)
+        esper.process(0)
+        assert processor._buckets is not buckets
+        assert processor.visible_count == 1
+    finally:
+        esper.remove_processor(RenderSurfaceProcessor)
+
+
+def test_dirty_rect_mode_redraws_only_damage():
+    """Dirty-rect mode restores the background only where sprites changed.
+
+    - The first frame redraws the whole screen
+    - A static sprite causes no damage; a moved one damages old and new rects
+    - Overlapping damage is merged and the old spot shows the background
+    """
+    screen = pygame.Surface((64, 64))
+    background = _solid((0, 255, 0))
+    background = pygame.transform.scale(background, (64, 64))
+    processor = RenderSurfaceProcessor(screen, background=background)
+    moving = PositionComponent(0, 0)
+    esper.create_entity(moving, RenderSurfaceComponent(_solid((255, 0, 0))))
+    esper.create_entity(
+        PositionComponent(40, 40), RenderSurfaceComponent(_solid((0, 0, 255)))
+    )
+
+    assert processor.process(0) == [pygame.Rect(0, 0, 64, 64)]
+    assert processor.process(0) == []
+
+    moving.x = 2
+    assert processor.process(0) == [pygame.Rect(0, 0, 6, 4)]
+    assert screen.get_at((0, 0)) == pygame.Color(0, 255, 0)
+    assert screen.get_at((3, 1)) == pygame.Color(255, 0, 0)
+    assert screen.get_at((41, 41)) == pygame.Color(0, 0, 255)
+
+
+def test_rect_dirty_rect_mode_erases_the_last_sprite():
+    """Removing the last RectSpriteComponent on a surface restores the
+    background under it."""
+    screen = pygame.Surface((16, 16))
+    background = pygame.Surface((16, 16))
+    background.fill((0, 255, 0))
+    processor = RenderRectProcessor(background=background)
+    entity = esper.create_entity(
+        PositionComponent(4, 4),
+        RectSpriteComponent(screen, pygame.Rect(0, 0, 4, 4), (255, 0, 0)),
+    )
+    processor.process(0)
+    assert screen.get_at((4, 4)) == pygame.Color(255, 0, 0)
+
+    esper.delete_entity(entity, immediate=True)
+    assert processor.process(0) == [pygame.Rect(2, 2, 4, 4)]
+    assert screen.get_at((4, 4)) == pygame.Color(0, 255, 0)
+    assert processor.process(0) == []
@@ -0,0 +1,94 @@
+import esper
+import pytest
+
+pytest.importorskip("numpy")
+
+from gamelib.ecs.geometry import (  # noqa: E402
+    MoveProcessor,
+    PositionComponent,
+    VelocityComponent,
+)
+from gamelib.ecs.soa_motion import MotionArrays, VectorizedMoveProcessor  # noqa: E402
+
+
+def test_vectorized_move_matches_move_processor():
+    """Array-backed movers follow the same path as MoveProcessor.
+
+    - Plain and array-backed entities get identical speeds and multipliers
+    - Both processors run with dt scaling for a few frames
+    - Deleting an array-backed entity frees its slot and keeps others intact
+    - Array views read and write through to the store
+    """
+    speeds = [((3, -1), 1), ((0, 2), 0.5), ((-4, 4), 2), ((1, 1), 1)]
+
+    plain = [
+        esper.create_entity(PositionComponent(10, 20), VelocityComponent(s, m))
+        for s, m in speeds
+    ]
+    move = MoveProcessor(use_dt=True)
+    for _ in range(3):
+        move.process(0.5)
+    expected = [
+        (
+            esper.component_for_entity(e, PositionComponent).x,
+            esper.component_for_entity(e, PositionComponent).y,
+        )
+        for e in plain
+    ]
+
+    esper.clear_database()
+    motion = MotionArrays(capacity=2)
+    movers = [motion.spawn(10, 20, s, m) for s, m in speeds]
+    processor = VectorizedMoveProcessor(motion, use_dt=True)
+    for _ in range(3):
+        processor.process(0.5)
+
+    for entity, (x, y) in zip(movers, expected):
+        pos = esper.component_for_entity(entity, PositionComponent)
+        assert (pos.x, pos.y) == pytest.approx((x, y))
+
+    esper.delete_entity(movers[0], immediate=True)
+    processor.process(0)
+    assert len(motion) == 3 and movers[0] not in motion
+
+    vel = esper.component_for_entity(movers[3], VelocityComponent)
+    vel.base_speed = (10, 0)
+    vel.multiplier = 1
+    before = esper.component_for_entity(movers[3], PositionComponent).x
+    processor.process(1)
+    after = esper.component_for_entity(movers[3], PositionComponent).x
+    assert after - before == pytest.approx(10)
+
+
+def test_vectorized_move_through_esper_process_only_rescans_changes():
+    """esper.process() drops esper's query cache every frame; the processor
+    still only looks at entities that were added or removed."""
+    motion = MotionArrays()
+    movers = [motion.spawn(0, 0, (1, 0)) for _ in range(3)]
+    plain = esper.create_entity(PositionComponent(0, 0), VelocityComponent((0, 1), 1))
+    processor = VectorizedMoveProcessor(motion)
+    esper.add_processor(processor)
+    try:
+        syncs = []
+        sync = motion.sync
+        motion.sync = lambda entities=None: syncs.append(entities) or sync(entities)
+        for _ in range(3):
+            esper.process(0)
+        assert syncs == [None]
+
+        esper.delete_entity(movers[0])
+        esper.delete_entity(plain)
+        extra = esper.create_entity(
+            PositionComponent(0, 0), VelocityComponent((2, 0), 1)
+        )
+        esper.process(0)
+        # Deferred deletes are applied at the start of the same process()
+        assert syncs[1] == {movers[0], plain, extra}
+        assert len(motion) == 2 and movers[0] not in motion
+        esper.process(0)
+        assert len(syncs) == 2
+
+        assert esper.component_for_entity(movers[1], PositionComponent).x == 5
+        assert esper.component_for_entity(extra, PositionComponent).x == 4
+    finally:
+        esper.remove_processor(VectorizedMoveProcessor)
@@ -0,0 +1,62 @@
+import esper
+
+from gamelib.ecs.broadphase import SweepAndPruneBroadPhase
+from gamelib.ecs.collision import (
+    ColliderComponent,
+    CollisionProcessor,
+    SpatialHashProcessor,
+)
+from gamelib.ecs.geometry import PositionComponent
+from gamelib.ecs.spatial_query import SpatialQuery
+
+
+def _spawn(x, y, size=10, **kwargs):
+    return esper.create_entity(
+        PositionComponent(x, y), ColliderComponent(size, size, **kwargs)
+    )
+
+
+def test_queries_agree_across_indices():
+    """Point, rect and circle queries give the same answers whether backed by
+    a grid, a sweep-and-prune list or the static index."""
+    near = _spawn(0, 0)
+    far = _spawn(200, 0, tags={"enemy"})
+    wall = _spawn(100, 100, size=32, tags={"wall"}, static=True)
+
+    for processor in (
+        SpatialHashProcessor(cell_size=16),
+        CollisionProcessor(broad_phase=SweepAndPruneBroadPhase()),
+    ):
+        processor.process(0)
+        queries = SpatialQuery(processor)
+
+        assert [e for e, _ in queries.query_point((5, 5))] == [near]
+        assert [e for e, _ in queries.query_point((110, 110))] == [wall]
+        # Just left of `near`, not inside its first column
+        assert queries.query_point((-0.5, 5)) == []
+        found = {e for e, _ in queries.query_rect((0, 0, 300, 300))}
+        assert found == {near, far, wall}
+        found = {e for e, _ in queries.query_rect((0, 0, 300, 300), layers={"enemy"})}
+        assert found == {far}
+        assert {e for e, _ in queries.query_circle((5, 5), 20)} == {near}
+        assert {e for e, _ in queries.query_circle((90, 90), 15)} == {wall}
+
+
+def test_raycast_first_and_all_hits():
+    """The DDA raycast returns the closest hit first and respects layers."""
+    first = _spawn(50, 0, tags={"crate"})
+    second = _spawn(100, 0, tags={"wall"}, static=True)
+    _spawn(50, 50, tags={"wall"})
+    processor = SpatialHashProcessor(cell_size=16)
+    processor.process(0)
+    queries = SpatialQuery(processor)
+
+    hit = queries.raycast((0, 5), (300, 5))
+    assert hit.entity == first
+    assert hit.point == (50, 5)
+    assert hit.distance == 50
+
+    assert queries.raycast((0, 5), (300, 5), layers={"wall"}).entity == second
+    hits = queries.raycast((0, 5), (300, 5), all_hits=True)
+    assert [h.entity for h in hits] == [first, second]
+    assert queries.raycast((0, 30), (300, 30)) is None
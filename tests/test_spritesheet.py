@@ -0,0 +1,69 @@
+import gc
+
+import pygame
+
+from gamelib.mgmt.assets import default_asset_cache
+from gamelib.sprite.spritesheet_grid import SpriteSheetGrid
+
+
+def _sheet(path):
+    pygame.display.set_mode((1, 1))
+    sheet = pygame.Surface((32, 16), pygame.SRCALPHA)
+    sheet.fill((255, 0, 0, 255), (0, 0, 16, 16))
+    sheet.fill((0, 0, 255, 128), (16, 0, 16, 16))
+    pygame.image.save(sheet, str(path))
+    return str(path)
+
+
+def test_lazy_grid_shares_sheet_pixels(tmp_path):
+    """Lazy cells are subsurfaces created on first access.
+
+    - Cells match the eager grid's pixels
+    - Drawing onto a view changes the grid's private sheet, not the cached
+      one; a materialized cell changes neither
+    - Releasing both grids drops the sheet from the global cache
+    """
+    path = _sheet(tmp_path / "sheet.png")
+    eager = SpriteSheetGrid(path, 16, 16)
+    lazy = SpriteSheetGrid(path, 16, 16, lazy=True, shared=False)
+    cached = default_asset_cache.load(path, owner=eager)
+    default_asset_cache.release(path, owner=eager)
+    assert lazy.image is not cached and eager.image is cached
+    assert lazy._sprites == [[None, None]]
+
+    cell = lazy.get_by_index(1)
+    assert cell.get_parent() is lazy.image
+    assert lazy.get(1, 0) is cell and lazy.get(-1, -1) is cell
+    assert cell.get_at((3, 3)) == eager.get(1, 0).get_at((3, 3))
+    assert [len(row) for row in lazy.sprites] == [2]
+
+    cell.fill((0, 255, 0))
+    assert lazy.image.get_at((20, 5)) == (0, 255, 0, 255)
+    assert cached.get_at((20, 5)) == (0, 0, 255, 128)
+
+    lazy.materialize(0, 0)
+    first = lazy.get(0, 0)
+    assert first.get_parent() is None
+    first.fill((0, 0, 0))
+    assert lazy.image.get_at((5, 5)) == (255, 0, 0, 255)
+
+    lazy.materialize()
+    assert lazy.get(0, 0) is first
+    assert lazy.get(1, 0).get_parent() is None
+
+    eager.release()
+    lazy.release()
+    lazy.release()
+    assert not default_asset_cache.is_loaded(path)
+
+
+def test_grids_without_owner_release_the_sheet_when_collected(tmp_path):
+    path = _sheet(tmp_path / "sheet.png")
+    grids = [SpriteSheetGrid(path, 16, 16) for _ in range(3)]
+    assert default_asset_cache.refcount(path) == 3
+
+    grids[0].release()
+    assert default_asset_cache.refcount(path) == 2
+    del grids
+    gc.collect()
+    assert not default_asset_cache.is_loaded(path)
@@ -0,0 +1,230 @@
+import esper
+import pygame
+
+from gamelib.tiles.binary import TileGridFile, csv_to_binary, write_tile_grid
+from gamelib.ecs.collision import ColliderComponent, CollisionProcessor
+from gamelib.ecs.geometry import PositionComponent
+from gamelib.tiles.colliders import TileColliders, merge_tiles
+from gamelib.tiles.chunks import ChunkedTileRenderer
+from gamelib.tiles.dense import DenseTileMap
+from gamelib.tiles.streaming import StreamingTileMap
+from gamelib.tiles.tiles import TileMap
+
+
+def _tile(color):
+    surface = pygame.Surface((4, 4))
+    surface.fill(color)
+    return surface
+
+
+def test_chunked_renderer_draws_visible_chunks_and_invalidates():
+    """Only visible chunks are rendered, and edits re-render one chunk.
+
+    - A 64x64 map in 8x8-tile chunks renders just the chunks under the view
+    - add_to_tile invalidates only the chunk holding that tile
+    - The LRU keeps at most max_chunks surfaces
+    """
+    red, blue = _tile((255, 0, 0)), _tile((0, 0, 255))
+    tilemap = TileMap(tilesize=4)
+    tilemap.add_to_tiles([(x, y) for x in range(64) for y in range(64)], red)
+    renderer = ChunkedTileRenderer(tilemap, chunk_tiles=8, max_chunks=6)
+
+    screen = pygame.Surface((40, 40))
+    assert renderer.draw(screen, pygame.Rect(20, 20, 40, 40)) == 4
+    assert renderer.renders == 4
+    assert screen.get_at((39, 39)) == pygame.Color(255, 0, 0)
+
+    tilemap.add_to_tile((10, 10), blue)
+    renderer.draw(screen, pygame.Rect(20, 20, 40, 40))
+    assert renderer.renders == 5
+    assert screen.get_at((40 - 20 + 1, 40 - 20 + 1)) == pygame.Color(0, 0, 255)
+
+    renderer.draw(screen, pygame.Rect(200, 200, 40, 40))
+    assert len(renderer) == 6
+
+
+def test_dense_tilemap_matches_dict_tilemap():
+    """DenseTileMap behaves like TileMap while storing palette ids.
+
+    - Tiles can be added at negative coordinates, growing the grid
+    - Bounds follow additions and removals
+    - fill, set_region and region_ids work on whole rows
+    """
+    red, blue = _tile((255, 0, 0)), _tile((0, 0, 255))
+    sparse = TileMap(tilesize=4)
+    dense = DenseTileMap(tilesize=4)
+    for tilemap in (sparse, dense):
+        tilemap.add_to_tiles([(x, -2) for x in range(-3, 5)], red)
+        tilemap.add_to_tile((7, 9), blue)
+
+    assert dict(dense.tiles.items()) == sparse.tiles
+    assert dense.palette == [None, red, blue]
+    assert (dense.min_x, dense.min_y, dense.max_x, dense.max_y) == (-3, -2, 7, 9)
+    assert dense.get_unit_size() == sparse.get_unit_size()
+    assert dense.generate_surface().get_size() == sparse.generate_surface().get_size()
+
+    del dense.tiles[(7, 9)]
+    assert (dense.max_x, dense.max_y) == (4, -2)
+
+    dense.fill(0, 0, 3, 2, blue)
+    assert len(dense) == 8 + 6
+    dense.fill(-10, -10, 30, 9, None)
+    assert dense.bounds == (0, 0, 2, 1)
+
+    dense.set_region(1, 1, [[1, 0, 2]])
+    assert dense.region_ids(0, 1, 4, 1)[0].tolist() == [2, 1, 0, 2]
+    assert dense.bounds == (0, 0, 3, 1)
+
+
+def test_dense_palette_dedups_equal_tiles():
+    """Equal hashable tiles share a palette id, unhashable ones don't."""
+    dense = DenseTileMap()
+    kinds = ["wall", "floor"]
+    for x in range(4):
+        # Built per call, like a mapper creating a new object for every tile
+        dense.add_to_tile((x, 0), ("tile", kinds[x % 2]))
+        dense.add_to_tile((x, 1), ["tile", kinds[x % 2]])
+
+    tuples = [tile for tile in dense.palette if isinstance(tile, tuple)]
+    assert tuples == [("tile", "wall"), ("tile", "floor")]
+    assert len(dense.palette) == 1 + 2 + 4
+    assert dense.get(2, 0) == ("tile", "wall")
+    assert dense.get(3, 1) == ["tile", "floor"]
+
+
+def test_csv_and_binary_loading(tmp_path):
+    """Bulk CSV loading and the memory-mapped binary format agree.
+
+    - Blank and non-integer cells are skipped, as are ignored values
+    - A CSV converted to binary loads the same tiles, whole or by region
+    - DenseTileMap loads rows of palette ids without clearing skipped cells
+    """
+    csv_path = tmp_path / "level.csv"
+    csv_path.write_text("1,2,0\n\n,x,2,1\n")
+    tiles = {1: "grass", 2: "rock"}
+    expected = {(0, 5): "grass", (1, 5): "rock", (2, 7): "rock", (3, 7): "grass"}
+
+    tilemap = TileMap.from_csv(
+        csv_path, mapper=tiles, start_pos=(0, 5), ignore_values={0}
+    )
+    assert tilemap.tiles == expected
+
+    bin_path = tmp_path / "level.tiles"
+    csv_to_binary(csv_path, bin_path, tilesize=8, start_pos=(0, 5))
+    with TileGridFile(bin_path) as grid:
+        assert (grid.width, grid.height, grid.origin) == (4, 3, (0, 5))
+        assert grid.region(-1, 7, 6, 1)[0].tolist()[1:5] == [
+            grid.nodata,
+            grid.nodata,
+            2,
+            1,
+        ]
+        assert grid.region(-1, 7, 6, 1)[0][0] == grid.nodata
+        loaded = grid.to_tilemap(mapper=tiles, ignore_values={0})
+        assert loaded.tilesize == 8
+        assert loaded.tiles == expected
+        part = grid.to_tilemap(mapper=tiles.get, region=(2, 6, 5, 5))
+        assert part.tiles == {(2, 7): "rock", (3, 7): "grass"}
+
+        dense = DenseTileMap()
+        dense.add_to_tile((1, 7), "keep")
+        dense.add_rows(grid.rows(), grid.origin, tiles, {0, grid.nodata})
+        assert dict(dense.tiles.items()) == {**expected, (1, 7): "keep"}
+        assert dense.palette == [None, "keep", "grass", "rock"]
+        assert len(dense) == 5
+        assert dense.bounds == (0, 5, 3, 7)
+
+
+def test_streaming_tilemap_pages_chunks_around_view(tmp_path):
+    """StreamingTileMap loads chunks near the view in the background.
+
+    - Chunks arrive on a later update (or after wait) and notify listeners
+    - Chunks ahead of a moving view are requested early
+    - Chunks outside the view are dropped over the budget; edits survive
+    """
+    path = tmp_path / "world.tiles"
+    write_tile_grid(
+        path, [[(x + y) % 3 for x in range(64)] for y in range(64)], tilesize=4
+    )
+    tiles = {1: "grass", 2: "rock"}
+    changed = set()
+
+    with (
+        TileGridFile(path) as grid,
+        StreamingTileMap(
+            grid, tiles, {0}, chunk_tiles=8, max_chunks=6, margin=0, prefetch=1
+        ) as world,
+    ):
+        world.tile_changed.add_listener(changed.add)
+        view = pygame.Rect(0, 0, 32, 32)  # exactly chunk (0, 0)
+        world.update(view)
+        assert world.get(1, 0) is None  # not loaded yet
+        world.wait()
+        assert world.is_loaded((0, 0)) and world.loaded_chunks == 1
+        assert world.get(1, 0) == "grass" and world.tiles[(2, 0)] == "rock"
+        assert (1, 0) in changed and (0, 0) not in changed
+
+        world.add_to_tile((1, 0), "flower")
+        view.x += 32
+        world.update(view)
+        world.wait()
+        # (1, 0) is in view and (2, 0) was prefetched in the direction of travel
+        assert world.is_loaded((1, 0)) and world.is_loaded((2, 0))
+
+        for _ in range(6):
+            view.y += 32
+            world.update(view)
+            world.wait()
+        assert world.loaded_chunks <= 6
+        assert not world.is_loaded((0, 0))
+        assert world.get(2, 0) is None and world.get(1, 0) == "flower"
+        assert world.tiles.get((9 + 8, 49)) == tiles.get((17 + 49) % 3)
+
+
+def test_merge_tiles_covers_each_tile_once():
+    tiles = {(x, y) for x in range(10) for y in range(4)} | {(0, 4), (0, 5), (3, 4)}
+    rects = merge_tiles(tiles)
+    assert rects == [(0, 0, 10, 4), (0, 4, 1, 2), (3, 4, 1, 1)]
+    covered = [
+        (x, y)
+        for rx, ry, w, h in rects
+        for x in range(rx, rx + w)
+        for y in range(ry, ry + h)
+    ]
+    assert sorted(covered) == sorted(tiles)
+
+
+def test_tile_colliders_mesh_and_remesh_regions():
+    """TileColliders replaces per-tile colliders with merged static rects.
+
+    - A solid 40x20 floor split over two regions needs two colliders
+    - Changing a tile re-meshes only its region on flush
+    - Dynamic colliders hit the merged rects
+    """
+    tilemap = TileMap(tilesize=8)
+    tilemap.add_to_tiles([(x, y) for x in range(40) for y in range(20)], "wall")
+    tilemap.add_to_tile((50, 0), "grass")
+    colliders = TileColliders(tilemap, solid={"wall"}, tags={"solid"}, region_tiles=32)
+    assert len(colliders) == 2
+
+    rects = sorted(
+        (pos.x, pos.y, c.width, c.height)
+        for _, (pos, c) in esper.get_components(PositionComponent, ColliderComponent)
+    )
+    assert rects == [(0, 0, 256, 160), (256, 0, 64, 160)]
+
+    tilemap.add_to_tile((5, 5), "grass")
+    assert len(colliders) == 2  # nothing happens until flush
+    assert colliders.flush() == 1
+    assert len(colliders) == 5 == len(esper.get_component(ColliderComponent))
+    assert colliders.flush() == 0
+
+    hits = []
+    processor = CollisionProcessor()
+    processor.add_listener(hits.append)
+    player = esper.create_entity(PositionComponent(300, 100), ColliderComponent(4, 4))
+    processor.process(0)
+    assert [{event.entity_a, event.entity_b} & {player} for event in hits] == [{player}]
+
+    colliders.close()
+    assert len(esper.get_component(ColliderComponent)) == 1
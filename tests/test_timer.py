@@ -0,0 +1,90 @@
+import esper
+
+from gamelib.ecs.timer import TimerComponent, TimerProcessor
+
+
+def test_scheduled_timers_repeat_cancel_and_pause():
+    """Timers fire on schedule and honour their handles.
+
+    - One-shot and repeating timers fire at their deadlines
+    - Several timers can belong to one entity and die with it
+    - Cancelled timers never fire; paused ones keep their remaining time
+    """
+    processor = TimerProcessor()
+    fired = []
+    entity = esper.create_entity()
+
+    processor.schedule(1.0, lambda: fired.append("once"), entity=entity)
+    ticker = processor.schedule(0.5, lambda: fired.append("tick"), repeat=True)
+    cancelled = processor.schedule(0.25, lambda: fired.append("cancelled"))
+    paused = processor.schedule(0.75, lambda: fired.append("paused"))
+    processor.schedule(3.0, lambda: fired.append("orphan"), entity=entity)
+    assert len(processor.scheduler.timers_for(entity)) == 2
+
+    cancelled.cancel()
+    processor.process(0.5)
+    paused.pause()
+    processor.process(0.6)
+    assert fired == ["tick", "once", "tick"]
+    assert paused.remaining == 0.25
+
+    paused.resume()
+    processor.process(0.25)
+    assert fired[-1] == "paused"
+
+    esper.delete_entity(entity, immediate=True)
+    ticker.cancel()
+    processor.process(5)
+    assert fired == ["tick", "once", "tick", "paused"]
+    assert processor.scheduler.timers_for(entity) == []
+
+
+def test_timer_component_still_fires_once_and_is_removed():
+    processor = TimerProcessor()
+    fired = []
+    entity = esper.create_entity(TimerComponent(1.0, lambda: fired.append(1)))
+
+    processor.process(0.4)
+    assert esper.component_for_entity(entity, TimerComponent).elapsed_s == 0.4
+    processor.paused = True
+    processor.process(10)
+    assert fired == []
+
+    processor.paused = False
+    processor.process(0.6)
+    processor.process(1)
+    assert fired == [1]
+    assert not esper.has_component(entity, TimerComponent)
+
+
+def test_timer_components_are_tracked_through_esper_process():
+    """Only added and removed TimerComponents are looked at.
+
+    - A timer keeps running across frames instead of being rescheduled
+    - A removed timer never fires and resumes its elapsed time when re-added
+    """
+    processor = TimerProcessor()
+    esper.add_processor(processor)
+    try:
+        fired = []
+        timer = TimerComponent(1.0, lambda: fired.append("timer"))
+        entity = esper.create_entity(timer)
+        esper.process(0.25)
+        handle = timer.handle
+        esper.process(0.25)
+        assert timer.handle is handle
+        assert timer.elapsed_s == 0.5
+
+        esper.remove_component(entity, TimerComponent)
+        esper.process(1)
+        assert fired == []
+        assert handle.finished
+
+        esper.add_component(entity, timer)
+        esper.process(0.25)
+        assert timer.elapsed_s == 0.75
+        esper.process(0.25)
+        assert fired == ["timer"]
+        assert not esper.has_component(entity, TimerComponent)
+    finally:
+        esper.remove_processor(TimerProcessor)
@@ -0,0 +1,61 @@
+import esper
+
+from gamelib.ecs.geometry import PositionComponent
+from gamelib.ecs.utils import get_components_with_subclasses
+
+
+class Base:
+    pass
+
+
+class Child(Base):
+    pass
+
+
+class GrandChild(Child):
+    pass
+
+
+def test_subclass_query_is_cached_until_components_change():
+    """Subclass queries are reused until the world changes.
+
+    - Components of any subclass match, and every requested type must match
+    - Repeated calls return the same cached result
+    - Adding, removing and registering new types invalidates the cache
+    """
+    a = esper.create_entity(Child(), PositionComponent(0, 0))
+    b = esper.create_entity(Base())
+    esper.create_entity(PositionComponent(1, 1))
+
+    query = get_components_with_subclasses(Base)
+    assert {entity for entity, _ in query} == {a, b}
+    assert get_components_with_subclasses(Base) is query
+    assert [e for e, _ in get_components_with_subclasses(Base, PositionComponent)] == [
+        a
+    ]
+
+    c = esper.create_entity(GrandChild())
+    updated = get_components_with_subclasses(Base)
+    assert updated is not query
+    assert {entity for entity, _ in updated} == {a, b, c}
+
+    esper.remove_component(a, Child)
+    assert {e for e, _ in get_components_with_subclasses(Base)} == {b, c}
+    assert get_components_with_subclasses(Base, PositionComponent) == []
+
+
+def test_subclass_query_survives_esper_process():
+    """esper.process() alone doesn't invalidate the cache, unrelated changes
+    don't either, and deferred deletes do once they apply."""
+    a = esper.create_entity(Child())
+    b = esper.create_entity(Base())
+    esper.create_entity(PositionComponent(0, 0))
+    query = get_components_with_subclasses(Base)
+
+    esper.process()
+    esper.create_entity(PositionComponent(1, 1))
+    assert get_components_with_subclasses(Base) is query
+
+    esper.delete_entity(a)
+    esper.process()
+    assert [e for e, _ in get_components_with_subclasses(Base)] == [b]